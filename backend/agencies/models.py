@@ -2,9 +2,16 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from core.projections import CardProjectionMixin, CardQuerySet
 
-class Agency(models.Model):
+
+class Agency(CardProjectionMixin, models.Model):
     """Агентство недвижимости"""
+    CARD_FIELDS = (
+        "name", "slug", "logo", "cover_image", "website", "phone",
+        "address", "rating", "is_verified", "is_active",
+    )
+
     name = models.CharField("Название", max_length=255)
     slug = models.SlugField(unique=True, blank=True)
     
@@ -29,6 +36,8 @@ class Agency(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Агентство"
         verbose_name_plural = "Агентства"
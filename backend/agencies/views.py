@@ -3,7 +3,7 @@ from .models import Agency
 
 
 def agency_list(request):
-    agencies = Agency.objects.filter(is_active=True)
+    agencies = Agency.objects.cards().filter(is_active=True)
     return render(request, 'agencies/agency_list.html', {
         'agencies': agencies,
     })
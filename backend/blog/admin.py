@@ -1,25 +1,33 @@
 from django.contrib import admin
 from django.utils import timezone
+
+from core.fastadmin import FastAdminMixin
+from core.previews import ImagePreview
 from .models import BlogCategory, BlogPost
 
 
 @admin.register(BlogCategory)
-class BlogCategoryAdmin(admin.ModelAdmin):
+class BlogCategoryAdmin(FastAdminMixin, admin.ModelAdmin):
     list_display = ["name", "slug", "posts_count"]
     search_fields = ["name"]
     prepopulated_fields = {"slug": ("name",)}
+    list_counts = {"posts_count": "posts"}
     
+    @admin.display(description="Статей", ordering="posts_count")
     def posts_count(self, obj):
-        return obj.posts.count()
-    posts_count.short_description = "Статей"
+        return obj.posts_count
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ["title", "category", "status", "published_at"]
+class BlogPostAdmin(FastAdminMixin, admin.ModelAdmin):
+    list_display = ["title", "category", "status", "published_at", "image_preview"]
     list_filter = ["status", "category", "created_at"]
     search_fields = ["title", "excerpt", "content"]
     prepopulated_fields = {"slug": ("title",)}
+    readonly_fields = ["image_preview_large"]
+    
+    image_preview = ImagePreview("featured_image", "featured_image_url", description="Изображение")
+    image_preview_large = ImagePreview("featured_image", "featured_image_url", alias="admin_preview")
     date_hierarchy = "created_at"
     
     fieldsets = (
@@ -27,12 +35,17 @@ class BlogPostAdmin(admin.ModelAdmin):
             "fields": ("title", "slug", "category", "status")
         }),
         ("Контент", {
-            "fields": ("excerpt", "featured_image", "featured_image_url", "content")
+            "fields": ("excerpt", "featured_image", "featured_image_url", "image_preview_large", "content")
         }),
         ("SEO", {
             "fields": ("meta_title", "meta_description"),
             "classes": ("collapse",),
         }),
+        ("Перевод (EN)", {
+            "fields": ("title_en", "excerpt_en", "content_en", "meta_title_en", "meta_description_en"),
+            "classes": ("collapse",),
+            "description": "Пустое поле — на английской версии показывается русский текст.",
+        }),
         ("Даты", {
             "fields": ("published_at",),
         }),
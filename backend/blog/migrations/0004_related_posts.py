@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_blogpost_featured_image_url_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedBlogPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Позиция")),
+                ("score", models.FloatField(verbose_name="Близость")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="blog.blogpost",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_of",
+                        to="blog.blogpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожая статья",
+                "verbose_name_plural": "Похожие статьи",
+                "ordering": ["post", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatedblogpost",
+            constraint=models.UniqueConstraint(
+                fields=("post", "rank"), name="relatedblogpost_rank_unique"
+            ),
+        ),
+    ]
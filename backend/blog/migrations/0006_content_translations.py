@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_admin_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_en",
+            field=models.TextField(blank=True, verbose_name="Контент (HTML, EN)"),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="excerpt_en",
+            field=models.TextField(
+                blank=True, max_length=500, verbose_name="Краткое описание (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="meta_description_en",
+            field=models.CharField(
+                blank=True, max_length=160, verbose_name="Meta Description (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="meta_title_en",
+            field=models.CharField(
+                blank=True, max_length=70, verbose_name="Meta Title (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="title_en",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Заголовок (EN)"
+            ),
+        ),
+    ]
@@ -3,6 +3,9 @@ from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from core.projections import CardProjectionMixin, CardQuerySet
+from core.translation import TranslatableMixin
+
 
 class BlogCategory(models.Model):
     """Категории: Новости, Аналитика, Гайды"""
@@ -18,8 +21,17 @@ class BlogCategory(models.Model):
         return self.name
 
 
-class BlogPost(models.Model):
+class BlogPost(TranslatableMixin, CardProjectionMixin, models.Model):
     """Статья/Новость"""
+    CARD_FIELDS = (
+        "title", "slug", "category", "excerpt", "featured_image",
+        "featured_image_url", "status", "published_at",
+    )
+    CARD_RELATED = {"category": ("name", "slug")}
+    # Полнотекстовый поиск в админке (core/search.py, индекс — миграция 0005)
+    SEARCH_FIELDS = ("title", "excerpt", "content")
+    # Поля с переводом в колонках <поле>_en (core/translation.py)
+    TRANSLATED_FIELDS = ("title", "excerpt", "content", "meta_title", "meta_description")
     
     class Status(models.TextChoices):
         DRAFT = "draft", "Черновик"
@@ -60,11 +72,20 @@ class BlogPost(models.Model):
     
     meta_title = models.CharField("Meta Title", max_length=70, blank=True)
     meta_description = models.CharField("Meta Description", max_length=160, blank=True)
+
+    # Перевод (пусто — показывается русский текст)
+    title_en = models.CharField("Заголовок (EN)", max_length=255, blank=True)
+    excerpt_en = models.TextField("Краткое описание (EN)", max_length=500, blank=True)
+    content_en = models.TextField("Контент (HTML, EN)", blank=True)
+    meta_title_en = models.CharField("Meta Title (EN)", max_length=70, blank=True)
+    meta_description_en = models.CharField("Meta Description (EN)", max_length=160, blank=True)
     
     published_at = models.DateTimeField("Дата публикации", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Статья"
         verbose_name_plural = "Статьи"
@@ -79,4 +100,20 @@ class BlogPost(models.Model):
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
-        return reverse("blog:detail", kwargs={"slug": self.slug})
\ No newline at end of file
+        return reverse("blog:detail", kwargs={"slug": self.slug})
+
+
+class RelatedBlogPost(models.Model):
+    """Похожие статьи по TF-IDF (core/related.py)"""
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name="related_of")
+    rank = models.PositiveSmallIntegerField("Позиция")
+    score = models.FloatField("Близость")
+
+    class Meta:
+        verbose_name = "Похожая статья"
+        verbose_name_plural = "Похожие статьи"
+        ordering = ["post", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["post", "rank"], name="relatedblogpost_rank_unique"),
+        ]
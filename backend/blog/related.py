@@ -0,0 +1,10 @@
+# blog/related.py
+from core.related import RelatedIndex, register
+
+from .models import BlogPost, RelatedBlogPost
+
+index = register(RelatedIndex(
+    BlogPost, RelatedBlogPost,
+    text_fields=("excerpt",),
+    tag_fields=("category__name",),
+))
@@ -1,10 +1,15 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
-from .models import BlogPost, BlogCategory
+from django.utils.functional import SimpleLazyObject
+from core import reference
+from core.warmup import fragment_cache
+
+from .models import BlogPost
+from .related import index as related_index
 
 
 def blog_list(request):
-    posts = BlogPost.objects.filter(status='published').select_related('category')
+    posts = BlogPost.objects.cards().filter(status='published')
     
     category_slug = request.GET.get('category')
     if category_slug:
@@ -16,44 +21,53 @@ def blog_list(request):
     return render(request, 'blog/blog_list.html', {
         'posts': page_obj,
         'page_obj': page_obj,
-        'categories': BlogCategory.objects.all(),
+        'categories': reference.blog_categories(),
+        'category_slug': category_slug or '',
+        # Сетка кэшируется в шаблоне до смены контента (core/warmup.py)
+        'fragment_cache': fragment_cache(),
     })
 
 
+def _related_posts(post):
+    """Похожие посты: предрасчитанные по TF-IDF, пока их нет — из той же категории."""
+    related_posts = list(related_index.related(post, 3))
+    if not related_posts and post.category:
+        related_posts = list(BlogPost.objects.cards().filter(
+            category=post.category,
+            status=BlogPost.Status.PUBLISHED
+        ).exclude(id=post.id)[:3])
+    return related_posts
+
+
 def blog_detail(request, slug):
     """Детальная страница поста."""
     post = get_object_or_404(
-        BlogPost.objects.select_related("category"),
+        BlogPost.objects.select_related("category").translated(),
         slug=slug,
         status=BlogPost.Status.PUBLISHED
     )
     
     # Категории для сайдбара
-    categories = BlogCategory.objects.all()
+    categories = reference.blog_categories()
     
     # Последние посты для сайдбара (кроме текущего)
-    recent_posts = BlogPost.objects.filter(
+    recent_posts = BlogPost.objects.cards().filter(
         status=BlogPost.Status.PUBLISHED
     ).exclude(id=post.id).order_by("-published_at")[:5]
     
-    # Похожие посты (из той же категории)
-    related_posts = []
-    if post.category:
-        related_posts = BlogPost.objects.filter(
-            category=post.category,
-            status=BlogPost.Status.PUBLISHED
-        ).exclude(id=post.id)[:3]
+    # Похожие посты и навигация считаются, только когда блок собирается заново
+    related_posts = SimpleLazyObject(lambda: _related_posts(post))
     
     # Навигация (предыдущий/следующий)
-    prev_post = BlogPost.objects.filter(
+    prev_post = SimpleLazyObject(lambda: BlogPost.objects.cards().filter(
         status=BlogPost.Status.PUBLISHED,
         published_at__lt=post.published_at
-    ).order_by("-published_at").first()
+    ).order_by("-published_at").first())
     
-    next_post = BlogPost.objects.filter(
+    next_post = SimpleLazyObject(lambda: BlogPost.objects.cards().filter(
         status=BlogPost.Status.PUBLISHED,
         published_at__gt=post.published_at
-    ).order_by("published_at").first()
+    ).order_by("published_at").first())
     
     return render(request, "blog/blog_detail.html", {
         "post": post,
@@ -62,4 +76,5 @@ def blog_detail(request, slug):
         "related_posts": related_posts,
         "prev_post": prev_post,
         "next_post": next_post,
+        "fragment_cache": fragment_cache(),
     })
\ No newline at end of file
@@ -68,6 +68,54 @@ app.conf.beat_schedule = {
         "task": "core.tasks.cleanup_unverified_accounts",
         "schedule": crontab(minute="*/30"),
     },
+
+    # Ежедневно в 4:00 - сверка рейтингов застройщиков
+    "recompute-developer-ratings": {
+        "task": "developers.tasks.recompute_developer_ratings",
+        "schedule": crontab(minute=0, hour=4),
+    },
+
+    # Ежедневно в 4:30 - пересчёт похожих объектов
+    "rebuild-similar-properties": {
+        "task": "properties.tasks.rebuild_similar_properties",
+        "schedule": crontab(minute=30, hour=4),
+    },
+
+    # Ежедневно в 4:45 - сверка счётчиков объектов по локациям
+    "recount-location-properties": {
+        "task": "properties.tasks.recount_location_properties",
+        "schedule": crontab(minute=45, hour=4),
+    },
+
+    # Ежедневно в 4:50 - сверка сводки юнитов по объектам
+    "refresh-unit-rollups": {
+        "task": "properties.tasks.refresh_unit_rollups",
+        "schedule": crontab(minute=50, hour=4),
+    },
+
+    # Ежедневно в 5:00 - пересчёт похожих статей и новостей
+    "rebuild-related-posts": {
+        "task": "core.tasks.rebuild_related_posts",
+        "schedule": crontab(minute=0, hour=5),
+    },
+
+    # Каждый час - обновление курсов валют
+    "refresh-exchange-rates": {
+        "task": "core.tasks.refresh_exchange_rates",
+        "schedule": crontab(minute=15),
+    },
+
+    # Ежедневно в 3:30 - удаление старых выгрузок из админки
+    "cleanup-exports": {
+        "task": "core.tasks.cleanup_exports",
+        "schedule": crontab(minute=30, hour=3),
+    },
+
+    # Ежедневно в 5:30 - данные видео с YouTube
+    "sync-video-metadata": {
+        "task": "core.tasks.sync_video_metadata",
+        "schedule": crontab(minute=30, hour=5),
+    },
 }
 
 app.conf.timezone = "Europe/Berlin"
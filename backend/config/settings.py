@@ -111,6 +111,8 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.CurrencyMiddleware",
+    "core.ratelimit.RateLimitMiddleware",
 ]
 
 if DEBUG:
@@ -138,6 +140,7 @@ TEMPLATES = [
                 "django.template.context_processors.static",
                 "django.template.context_processors.tz",
                 "core.context_processors.site_settings",
+                "core.context_processors.currency",
             ],
         },
     },
@@ -365,6 +368,148 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+# Локально без Redis задачи можно выполнять синхронно: CELERY_TASK_ALWAYS_EAGER=1
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "0") == "1"
+
+# ===========================================
+# РЕЙТИНГ ЗАСТРОЙЩИКОВ (developers/rating.py)
+# ===========================================
+DEVELOPER_RATING = {
+    "PRIOR_MEAN": 4.0,        # Априорная оценка застройщика без отзывов
+    "PRIOR_WEIGHT": 5.0,      # Сколько «виртуальных» отзывов весит априор
+    "VERIFIED_WEIGHT": 1.0,   # Вес отзыва зарегистрированного пользователя
+    "ANONYMOUS_WEIGHT": 0.5,  # Вес анонимного отзыва
+}
+
+# ===========================================
+# ПОХОЖИЕ ОБЪЕКТЫ (properties/similarity.py)
+# ===========================================
+SIMILAR_PROPERTIES = {
+    "K": 8,               # Сколько соседей хранить на объект
+    "CHUNK_SIZE": 256,    # Строк матрицы расстояний за один шаг
+    "WEIGHTS": {          # Вклад признаков в расстояние
+        "price": 2.0,
+        "area": 1.0,
+        "rooms": 1.0,
+        "roi": 0.5,
+        "location": 1.5,
+        "construction_status": 0.5,
+    },
+}
+
+# ===========================================
+# ПРОГНОЗ ДОХОДНОСТИ (properties/investment.py)
+# ===========================================
+INVESTMENT = {
+    "EXPENSE_RATIO": 0.3,     # Доля аренды на управление, налоги и обслуживание
+    "BASE_OCCUPANCY": 0.7,    # Заполняемость, при которой застройщик считает roi_percent
+    "DEFAULT_ROI": 8.0,       # Доходность для объектов без roi_percent, %
+    "MAX_SCENARIOS": 1000,    # Потолок сетки сценариев в одном запросе
+}
+
+# ===========================================
+# ВАЛЮТЫ (core/currency.py)
+# ===========================================
+CURRENCY = {
+    "CHOICES": ["USD", "IDR", "EUR", "RUB"],  # USD — валюта хранения цен
+    # Локально и в тестах курсы читаются из файла; на проде — из API:
+    # CURRENCY_PROVIDER=core.currency.HttpRateProvider CURRENCY_RATES_URL=https://open.er-api.com/v6/latest/USD
+    "PROVIDER": os.getenv("CURRENCY_PROVIDER", "core.currency.FileRateProvider"),
+    "OPTIONS": (
+        {"url": os.getenv("CURRENCY_RATES_URL")}
+        if os.getenv("CURRENCY_RATES_URL")
+        else {"path": str(BASE_DIR / "core" / "data" / "exchange_rates.json")}
+    ),
+}
+
+# ===========================================
+# ЛИМИТЫ ЗАПРОСОВ К ФОРМАМ (core/ratelimit.py)
+# ===========================================
+RATELIMIT = {
+    "ENABLED": os.getenv("RATELIMIT_ENABLED", "1") == "1",
+    "REDIS_URL": os.getenv("REDIS_URL"),  # Без Redis — вёдра в памяти каждого процесса
+    # Сколько прокси перед gunicorn дописывают X-Forwarded-For (gateway — 1;
+    # если внешний nginx тоже передаёт заголовок — 2). 0 — брать REMOTE_ADDR.
+    "PROXY_COUNT": int(os.getenv("RATELIMIT_PROXY_COUNT", "1")),
+    # Ведро токенов: rate — ёмкость / время полного восстановления; keys — по чему считать
+    "RULES": {
+        "contact": {"rate": "5/10m", "keys": ["ip"]},
+        "login": {"rate": "10/5m", "keys": ["ip", "post:login"]},
+        "signup": {"rate": "5/h", "keys": ["ip", "post:email"]},
+        "password_reset": {"rate": "5/h", "keys": ["ip", "post:email"]},
+        "email": {"rate": "5/h", "keys": ["ip"]},  # Повторная отправка письма подтверждения
+    },
+    # Маршруты allauth → правило (для своих вьюх — декоратор @ratelimit)
+    "ROUTES": {
+        "account_login": "login",
+        "account_signup": "signup",
+        "account_reset_password": "password_reset",
+        "account_email": "email",
+    },
+}
+
+# ===========================================
+# ВИДЕО YOUTUBE (core/youtube.py)
+# ===========================================
+YOUTUBE = {
+    # Локально метаданные читаются из файла; на проде — из YouTube Data API:
+    # YOUTUBE_CLIENT=core.youtube.DataApiClient YOUTUBE_API_KEY=...
+    "CLIENT": os.getenv("YOUTUBE_CLIENT", "core.youtube.FileVideoClient"),
+    "OPTIONS": (
+        {"api_key": os.getenv("YOUTUBE_API_KEY")}
+        if os.getenv("YOUTUBE_API_KEY")
+        else {"path": str(BASE_DIR / "core" / "data" / "youtube_videos.json")}
+    ),
+    "CACHE_TIMEOUT": 24 * 3600,  # Сколько не спрашивать API о том же ролике
+}
+
+# ===========================================
+# КЭШ БЕЗ «СТАДА» (core/caching.py)
+# ===========================================
+CACHING = {
+    "STALE": 5 * 60,      # Сколько после срока отдавать старое значение, пока его пересчитывают
+    "BETA": 1.0,          # Раннее обновление: больше — раньше, 0 — выключено
+    "LOCK_TIMEOUT": 30,
+    "WAIT": 3.0,          # Сколько ждать чужого расчёта, если значения ещё нет
+}
+
+# ===========================================
+# ДВУХУРОВНЕВЫЙ КЭШ СПРАВОЧНИКОВ (core/tiered.py, core/reference.py)
+# ===========================================
+TIERED_CACHE = {
+    "REDIS_URL": os.getenv("REDIS_URL"),  # Канал сброса LRU во всех процессах; без Redis — только свой процесс
+    "LRU_SIZE": 256,            # Ключей в памяти процесса
+    "LOCAL_TIMEOUT": 5 * 60,    # Страховка, если сообщение о сбросе потерялось
+    "TIMEOUT": 24 * 3600,       # В Redis (сбрасывается при изменении)
+}
+
+# ===========================================
+# ПРОГРЕВ КЭША (core/warmup.py)
+# ===========================================
+WARMUP = {
+    # Host для запросов прогрева — должен быть в ALLOWED_HOSTS
+    "HOST": os.getenv("WARMUP_HOST", next((host for host in ALLOWED_HOSTS if host != "*"), "localhost")),
+    "CONCURRENCY": 2,          # Потоков рендера: прогрев не должен отнимать CPU у живых запросов
+    "PAUSE": 0.2,              # Секунд между страницами в потоке
+    "FRAGMENT_TIMEOUT": 15 * 60,
+}
+
+# ===========================================
+# КАРТОЧНЫЕ ПРОЕКЦИИ (core/projections.py)
+# ===========================================
+# Догрузка поля вне CARD_FIELDS у карточки: "1" — исключение (разработка),
+# иначе предупреждение в лог. DEBUG для этого не годится — он включён и на проде
+CARD_PROJECTION_STRICT = os.getenv("CARD_PROJECTION_STRICT", "0") == "1"
+
+# ===========================================
+# ВЫГРУЗКИ ИЗ АДМИНКИ (core/exports.py)
+# ===========================================
+EXPORT = {
+    "ASYNC_THRESHOLD": 50_000,        # Больше строк — выгрузка в Celery, файл в ROOT
+    "CHUNK_SIZE": 2000,               # Строк за одно чтение курсора
+    "ROOT": BASE_DIR / "exports",     # Закрыто: отдаётся только через админку
+    "KEEP_DAYS": 7,
+}
 
 # ===========================================
 # THUMBNAILS (Filer)
@@ -648,6 +793,10 @@ THUMBNAIL_ALIASES = {
         
         # Миниатюры для виджетов
         "widget_thumb": {"size": (80, 80), "crop": "smart", "quality": 80, "format": "WEBP"},
+
+        # Превью в админке (core/previews.py); размеры совпадают с previews.SIZES
+        "admin_list": {"size": (80, 60), "crop": "smart", "quality": 70, "format": "WEBP"},
+        "admin_preview": {"size": (320, 240), "quality": 80, "format": "WEBP"},
         
         # OG Image для соцсетей
         "og_image": {"size": (1200, 630), "crop": "smart", "quality": 90, "format": "JPEG"},
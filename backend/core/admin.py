@@ -1,13 +1,24 @@
 from django.contrib import admin
-from .models import Video, ContactRequest, FAQ, SiteSettings
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .exports import ExportMixin, export_storage
+from .fastadmin import FastAdminMixin
+from .previews import ImagePreview
+from .models import Video, ContactRequest, FAQ, SiteSettings, ExchangeRate, ExportJob
 
 
 @admin.register(Video)
 class VideoAdmin(admin.ModelAdmin):
-    list_display = ["title", "developer", "is_active", "created_at", "preview"]
+    list_display = ["__str__", "developer", "duration_display", "is_active", "synced_at", "preview"]
+    list_select_related = ["developer"]
     list_filter = ["is_active", "developer"]
-    search_fields = ["title"]
+    search_fields = ["title", "youtube_title", "youtube_id"]
     raw_id_fields = ["developer"]
+    readonly_fields = ["youtube_title", "duration_display", "published_at", "synced_at"]
+    actions = ["sync_from_youtube"]
     
     fieldsets = (
         (None, {
@@ -17,17 +28,40 @@ class VideoAdmin(admin.ModelAdmin):
             "fields": ("thumbnail", "thumbnail_url_external"),
             "description": "Загрузите файл ИЛИ вставьте ссылку. Если оба пустые — возьмётся автоматически с YouTube."
         }),
+        ("Данные YouTube", {
+            "fields": ("youtube_title", "duration_display", "published_at", "synced_at"),
+            "description": "Обновляются задачей раз в сутки и после смены YouTube ID.",
+        }),
+    )
+
+    preview = ImagePreview(
+        "thumbnail", "thumbnail_url_external", "cached_thumbnail",
+        lambda obj: f"https://i.ytimg.com/vi/{obj.youtube_id}/mqdefault.jpg",
     )
-    
-    def preview(self, obj):
-        from django.utils.html import format_html
-        return format_html('<img src="{}" width="80" height="45" style="object-fit: cover; border-radius: 4px;"/>', obj.thumbnail_url)
-    preview.short_description = "Превью"
+
+    @admin.display(description="Длительность")
+    def duration_display(self, obj):
+        return obj.duration_display or "—"
+
+    def save_model(self, request, obj, form, change):
+        if "youtube_id" in form.changed_data:
+            # Данные и превью другого ролика — синхронизация после сохранения (core/signals.py)
+            obj.youtube_title, obj.duration, obj.published_at, obj.synced_at = "", None, None, None
+            obj.cached_thumbnail = ""
+        super().save_model(request, obj, form, change)
+
+    @admin.action(description="Обновить данные с YouTube")
+    def sync_from_youtube(self, request, queryset):
+        from .tasks import sync_video_metadata
+
+        sync_video_metadata.delay(list(queryset.values_list("pk", flat=True)), force=True)
+        self.message_user(request, f"Обновление {queryset.count()} видео запущено.")
 
 
 @admin.register(ContactRequest)
-class ContactRequestAdmin(admin.ModelAdmin):
+class ContactRequestAdmin(FastAdminMixin, ExportMixin, admin.ModelAdmin):
     list_display = ["name", "phone", "email", "source", "is_processed", "created_at"]
+    export_fields = ["name", "phone", "email", "telegram", "message", "source", "is_processed", "created_at"]
     list_filter = ["is_processed", "source", "created_at"]
     search_fields = ["name", "phone", "email"]
     readonly_fields = ["created_at"]
@@ -64,4 +98,53 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         return not SiteSettings.objects.exists()
     
     def has_delete_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ["currency", "rate", "source", "updated_at"]
+    readonly_fields = ["source", "updated_at"]
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "user", "status", "rows", "download", "finished_at"]
+    list_filter = ["status", "model"]
+    list_select_related = ["user"]
+    fields = ["user", "model", "format", "fields", "status", "rows", "download", "error", "created_at", "finished_at"]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).defer("query")
+        return queryset if request.user.is_superuser else queryset.filter(user=request.user)
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="core_exportjob_download",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Файл")
+    def download(self, obj):
+        if obj.status != ExportJob.Status.DONE or not obj.file:
+            return "—"
+        return format_html('<a href="{}">Скачать</a>', reverse("admin:core_exportjob_download", args=[obj.pk]))
+
+    def download_view(self, request, pk):
+        """Файл выгрузки — только автору или суперпользователю."""
+        job = self.get_queryset(request).filter(pk=pk).first()
+        if job is None or not self.has_view_permission(request, job):
+            raise PermissionDenied
+        if not job.file or not export_storage.exists(job.file):
+            raise Http404("Файл выгрузки не найден")
+        return FileResponse(export_storage.open(job.file, "rb"), as_attachment=True, filename=job.file.split("-", 1)[1])
@@ -0,0 +1,248 @@
+# core/caching.py
+"""
+Кэш без «стада»: популярный ключ истекает — пересчитывает один процесс.
+
+Обычный get → set под нагрузкой ломается в момент истечения: все воркеры
+gunicorn одновременно видят промах и все считают одно и то же (блок
+рейтинга на главной — категории с застройщиками, кластеры карты). Здесь:
+
+- single-flight: пересчитывает тот, кто взял блокировку <ключ>:lock
+  (cache.add — SET NX в Redis); остальные ждут готового значения до WAIT
+  секунд, а если старое значение есть — сразу отдают его;
+- stale-while-revalidate: значение хранится на timeout + STALE секунд;
+  после timeout оно «несвежее», но отдаётся, пока один процесс (или
+  задача Celery, background=True) считает новое;
+- раннее обновление (XFetch): незадолго до timeout ключ с вероятностью,
+  растущей к концу срока и пропорциональной времени расчёта, обновляется
+  заранее — до истечения обычно не доходит.
+
+В кэше лежит конверт (значение, момент истечения, время расчёта), поэтому
+читать ключи, записанные здесь, нужно тоже через этот модуль.
+
+    items = get_or_build(f"compare:{ids}", build, 300, args=(ids,))
+    tiles = get_or_build_many({key: tile, ...}, build_tiles, 600)
+
+Здесь же версии (get_version/bump_version) — ключ без срока, смена которого
+делает недействительными все ключи, куда версия входит.
+"""
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "STALE": 5 * 60,        # Сколько секунд после timeout отдавать старое значение
+    "BETA": 1.0,            # >1 — обновлять раньше, 0 — без раннего обновления
+    "LOCK_TIMEOUT": 30,     # Блокировка пересчёта, если процесс упал не отпустив её
+    "WAIT": 3.0,            # Сколько ждать чужого расчёта при пустом кэше
+    "POLL": 0.05,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "CACHING", {})}
+
+
+# --- Блокировки ---
+
+def acquire(key, timeout):
+    """Взять блокировку key: токен для release() или None, если она занята."""
+    token = uuid.uuid4().hex
+    return token if cache.add(key, token, timeout) else None
+
+
+def release(key, token):
+    if token and cache.get(key) == token:
+        cache.delete(key)
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+# --- Конверт ---
+
+def _envelope(value, timeout, delta):
+    return (value, time.time() + timeout, delta)
+
+
+def _store(key, value, timeout, stale, delta):
+    if callable(timeout):
+        timeout = timeout(value)
+    cache.set(key, _envelope(value, timeout, delta), timeout + stale)
+
+
+def _needs_refresh(envelope, now, beta):
+    """Истёк или выпал на раннее обновление (XFetch: delta·beta·−ln(rand) до срока)."""
+    _, expires_at, delta = envelope
+    return now - delta * beta * math.log(1 - random.random()) >= expires_at
+
+
+def store(key, value, timeout, stale=None):
+    """Записать значение, посчитанное в другом месте (например, в задаче)."""
+    _store(key, value, timeout, get_config()["STALE"] if stale is None else stale, 0)
+
+
+def peek(key, default=None):
+    """Значение без расчёта — свежее или несвежее."""
+    envelope = cache.get(key)
+    return default if envelope is None else envelope[0]
+
+
+def invalidate(*keys):
+    """Удалить значения: следующий читатель считает заново."""
+    cache.delete_many(list(keys))
+
+
+def expire(*keys):
+    """Пометить значения несвежими: их ещё отдают, пока один процесс пересчитывает."""
+    stale = get_config()["STALE"]
+    for key, (value, _, delta) in cache.get_many(list(keys)).items():
+        cache.set(key, (value, 0, delta), stale)
+
+
+# --- Чтение с расчётом ---
+
+def _build(key, builder, args, timeout, stale):
+    started = time.monotonic()
+    value = builder(*args)
+    _store(key, value, timeout, stale, time.monotonic() - started)
+    return value
+
+
+def _wait_for(keys, wait, poll):
+    """Дождаться, пока другой процесс запишет ключи; вернуть появившиеся конверты."""
+    found = {}
+    deadline = time.monotonic() + wait
+    while len(found) < len(keys) and time.monotonic() < deadline:
+        time.sleep(poll)
+        found.update(cache.get_many([key for key in keys if key not in found]))
+    return found
+
+
+def get_or_build(key, builder, timeout, *, args=(), stale=None, background=False):
+    """
+    Значение key; при промахе — builder(*args) в одном процессе.
+
+    timeout — секунды или функция от значения (например, короче для пустого).
+    background — несвежее значение обновляет задача core.tasks.refresh_cached;
+    builder тогда должен быть функцией уровня модуля, args — JSON.
+    """
+    config = get_config()
+    stale = config["STALE"] if stale is None else stale
+    envelope = cache.get(key)
+
+    if envelope is not None:
+        if not _needs_refresh(envelope, time.time(), config["BETA"]):
+            return envelope[0]
+        token = acquire(_lock_key(key), config["LOCK_TIMEOUT"])
+        if token is None:
+            # Уже пересчитывает другой процесс
+            return envelope[0]
+        if background and not callable(timeout):
+            from .tasks import dispatch, refresh_cached
+
+            queued = dispatch(
+                refresh_cached, key, f"{builder.__module__}.{builder.__qualname__}", list(args),
+                timeout, stale, translation.get_language(), token,
+            )
+            if not queued:
+                # Без брокера отдаём старое; пересчёт попробует следующий запрос
+                release(_lock_key(key), token)
+            return envelope[0]
+        try:
+            return _build(key, builder, args, timeout, stale)
+        finally:
+            release(_lock_key(key), token)
+
+    token = acquire(_lock_key(key), config["LOCK_TIMEOUT"])
+    if token is None:
+        found = _wait_for([key], config["WAIT"], config["POLL"])
+        if key in found:
+            return found[key][0]
+        logger.warning(f"Cache key {key} not built by lock holder in {config['WAIT']}s, building")
+    try:
+        return _build(key, builder, args, timeout, stale)
+    finally:
+        release(_lock_key(key), token)
+
+
+def get_or_build_many(items, builder, timeout, *, stale=None):
+    """
+    Значения для {ключ: аргумент}; промахи и устаревшие считаются одним
+    вызовом builder({ключ: аргумент}) → {ключ: значение}.
+
+    Ключ, который уже считает другой процесс, не пересчитывается: отдаётся
+    старое значение или (если его нет) ожидается чужое до WAIT секунд.
+    """
+    config = get_config()
+    stale = config["STALE"] if stale is None else stale
+    envelopes = cache.get_many(list(items))
+    now = time.time()
+
+    result, missing, outdated = {}, [], []
+    for key in items:
+        envelope = envelopes.get(key)
+        if envelope is None:
+            missing.append(key)
+            continue
+        result[key] = envelope[0]
+        if _needs_refresh(envelope, now, config["BETA"]):
+            outdated.append(key)
+
+    tokens = {}
+    for key in missing + outdated:
+        token = acquire(_lock_key(key), config["LOCK_TIMEOUT"])
+        if token:
+            tokens[key] = token
+    waiting = [key for key in missing if key not in tokens]
+    if waiting:
+        found = _wait_for(waiting, config["WAIT"], config["POLL"])
+        result.update((key, envelope[0]) for key, envelope in found.items())
+        # Не дождались — считаем сами вместе со своими
+        tokens.update((key, None) for key in waiting if key not in found)
+
+    if tokens:
+        try:
+            started = time.monotonic()
+            built = builder({key: items[key] for key in tokens})
+            delta = (time.monotonic() - started) / len(tokens)
+            cache.set_many({key: _envelope(value, timeout, delta) for key, value in built.items()}, timeout + stale)
+            result.update(built)
+        finally:
+            for key, token in tokens.items():
+                release(_lock_key(key), token)
+    return result
+
+
+def refresh(key, builder_path, args, timeout, stale, language, token):
+    """Фоновый пересчёт из get_or_build(background=True): язык запроса, затем снять блокировку."""
+    from django.utils.module_loading import import_string
+
+    try:
+        with translation.override(language):
+            _build(key, import_string(builder_path), args, timeout, stale)
+    finally:
+        release(_lock_key(key), token)
+
+
+# --- Версии ---
+
+def get_version(key):
+    """Текущая версия (создаётся при первом обращении), без срока."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex[:12], None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    cache.set(key, uuid.uuid4().hex[:12], None)
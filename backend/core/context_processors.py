@@ -1,7 +1,17 @@
-from .models import SiteSettings
+from . import reference
 
 
 def site_settings(request):
     return {
-        'site_settings': SiteSettings.get()
-    }
\ No newline at end of file
+        'site_settings': reference.site_settings()
+    }
+
+def currency(request):
+    from .currency import SYMBOLS, currencies
+
+    code = getattr(request, 'currency', 'USD')
+    return {
+        'currency': code,
+        'currency_symbol': SYMBOLS.get(code, code),
+        'currencies': currencies(),
+    }
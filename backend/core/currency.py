@@ -0,0 +1,227 @@
+# core/currency.py
+"""
+Цены в нескольких валютах.
+
+В базе цены хранятся в USD (Property.price_from, price_per_m2). Курсы —
+таблица core.ExchangeRate (единиц валюты за 1 USD); её раз в час
+обновляет задача core.tasks.refresh_exchange_rates из провайдера,
+указанного в settings.CURRENCY["PROVIDER"].
+
+Таблица из нескольких строк, поэтому каждый процесс держит её в памяти
+(get_rates). Свежесть сверяется по версии в общем кэше: любое изменение
+ExchangeRate меняет версию (bump_version из сигнала), и процессы
+перечитывают курсы при следующем обращении — один cache.get на запрос
+вместо SELECT.
+
+Пересчёт делается пачкой на страницу (attach_prices), а не фильтром
+шаблона на каждую цену. Фильтр по цене в выбранной валюте переводит
+границы обратно в USD (usd_bounds), и запрос идёт по индексу price_from.
+"""
+import json
+import logging
+import math
+import time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from . import caching
+
+logger = logging.getLogger(__name__)
+
+BASE = "USD"
+VERSION_KEY = "currency:rates:version"
+# Даже без смены версии курсы перечитываются не реже этого (LocMemCache у каждого процесса свой)
+LOCAL_TTL = 5 * 60
+
+SYMBOLS = {"USD": "$", "IDR": "Rp", "EUR": "€", "RUB": "₽"}
+
+# Больше не вмещает price_from (DecimalField(max_digits=12)) — потолок границ фильтра
+MAX_PRICE = Decimal("1e12")
+
+# (версия, время загрузки, курсы) — заменяется целиком, без блокировок
+_loaded = (None, 0.0, None)
+
+
+def currencies():
+    return settings.CURRENCY["CHOICES"]
+
+
+def normalize(code):
+    """Код валюты из запроса или BASE, если такой валюты на сайте нет."""
+    code = (code or "").upper()
+    return code if code in currencies() else BASE
+
+
+# --- Провайдеры курсов ---
+
+class RateProvider:
+    """Источник курсов: fetch() → {"IDR": Decimal, ...} — единиц валюты за 1 USD."""
+    name = ""
+
+    def fetch(self):
+        raise NotImplementedError
+
+    def parse(self, data):
+        """Курсы нужных валют из ответа вида {"rates": {"IDR": 16250, ...}}."""
+        rates = data.get("rates", data)
+        parsed = {}
+        for code in currencies():
+            if code == BASE:
+                continue
+            try:
+                rate = Decimal(str(rates[code]))
+            except (KeyError, InvalidOperation):
+                raise ValueError(f"{self.name}: нет курса {code}")
+            if not rate > 0:
+                raise ValueError(f"{self.name}: некорректный курс {code}={rate}")
+            parsed[code] = rate
+        return parsed
+
+
+class FileRateProvider(RateProvider):
+    """Курсы из JSON-файла — для локальной разработки и тестов."""
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, encoding="utf-8") as f:
+            return self.parse(json.load(f))
+
+
+class HttpRateProvider(RateProvider):
+    """Курсы из JSON API с полем rates относительно USD (open.er-api.com и совместимые)."""
+    name = "http"
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return self.parse(response.json())
+
+
+def get_provider():
+    config = settings.CURRENCY
+    return import_string(config["PROVIDER"])(**config.get("OPTIONS", {}))
+
+
+def refresh_rates(provider=None):
+    """
+    Загрузить курсы из провайдера в ExchangeRate.
+
+    Returns:
+        int: число обновлённых валют.
+    """
+    from .models import ExchangeRate
+
+    provider = provider or get_provider()
+    rates = provider.fetch()
+    with transaction.atomic():
+        for code, rate in rates.items():
+            ExchangeRate.objects.update_or_create(
+                currency=code, defaults={"rate": rate, "source": provider.name}
+            )
+    return len(rates)
+
+
+# --- Курсы в памяти процесса ---
+
+def _version():
+    return caching.get_version(VERSION_KEY)
+
+
+def rates_version():
+    """Версия курсов — для ключей кэша, где цены уже пересчитаны."""
+    return _version()
+
+
+def bump_version():
+    """Сообщить всем процессам, что курсы изменились."""
+    caching.bump_version(VERSION_KEY)
+
+
+def get_rates():
+    """Курсы {код: Decimal} за 1 USD, включая сам USD."""
+    global _loaded
+    from .models import ExchangeRate
+
+    version, loaded_at, rates = _loaded
+    current = _version()
+    now = time.monotonic()
+    if rates is None or version != current or now - loaded_at > LOCAL_TTL:
+        rates = {BASE: Decimal(1)}
+        rates.update(ExchangeRate.objects.values_list("currency", "rate"))
+        _loaded = (current, now, rates)
+    return rates
+
+
+def rate_for(currency):
+    """Курс валюты; если курса ещё нет — None (цены показываются в USD)."""
+    return get_rates().get(normalize(currency))
+
+
+# --- Пересчёт ---
+
+def convert_many(amounts, currency):
+    """Список сумм в USD → список сумм в валюте, округлённых до целых (None остаётся None)."""
+    rate = rate_for(currency)
+    if rate is None:
+        return list(amounts)
+    return [
+        None if amount is None else (Decimal(amount) * rate).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        for amount in amounts
+    ]
+
+
+def attach_prices(objects, currency, fields=("price_from", "price_per_m2")):
+    """
+    Проставить объектам <поле>_local — цену в валюте, — currency и currency_symbol.
+
+    Одна выборка курса на весь список; objects — страница Paginator,
+    список или уже вычисленный queryset.
+    """
+    objects = list(objects)
+    code = normalize(currency) if rate_for(currency) is not None else BASE
+    for field in fields:
+        converted = convert_many([getattr(obj, field) for obj in objects], code)
+        for obj, value in zip(objects, converted):
+            setattr(obj, f"{field}_local", value)
+    for obj in objects:
+        obj.currency = code
+        obj.currency_symbol = SYMBOLS.get(code, code)
+    return objects
+
+
+def usd_bounds(low, high, currency):
+    """
+    Границы фильтра цены из валюты в USD.
+
+    Границы расширяются до целого доллара наружу, чтобы объект,
+    показанный с ценой внутри диапазона, в выборку попал.
+    Нечисловые и отрицательные границы отбрасываются (None),
+    слишком большие сводятся к MAX_PRICE.
+    """
+    rate = rate_for(currency) or Decimal(1)
+
+    def to_usd(value, rounding):
+        try:
+            value = Decimal(str(value).replace(" ", ""))
+        except InvalidOperation:
+            return None
+        if not value.is_finite() or value < 0:
+            return None
+        if value >= MAX_PRICE * rate:
+            return MAX_PRICE
+        return Decimal(rounding(value / rate))
+
+    low = to_usd(low, math.floor) if low not in (None, "") else None
+    high = to_usd(high, math.ceil) if high not in (None, "") else None
+    return low, high
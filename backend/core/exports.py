@@ -0,0 +1,323 @@
+# core/exports.py
+"""
+Выгрузка списков из админки в CSV и XLSX.
+
+Строки читаются values_list(...).iterator(chunk_size) и сразу уходят
+в ответ StreamingHttpResponse: память воркера не зависит от числа строк,
+первый байт уходит клиенту сразу, и nginx не рвёт соединение по
+proxy_read_timeout, пока строки идут.
+
+XLSX пишется без сторонних библиотек: это zip, лист — XML, строки
+дописываются в открытый элемент архива (zipfile умеет писать
+в поток без seek), готовые куски отдаются по мере накопления.
+
+Выгрузки больше settings.EXPORT["ASYNC_THRESHOLD"] строк идут в Celery
+(core.tasks.run_export): тот же генератор пишет файл в закрытое
+хранилище (EXPORT["ROOT"], не MEDIA), скачать его можно из карточки
+ExportJob в админке.
+
+Админка подключает выгрузку миксином:
+
+    class ContactRequestAdmin(ExportMixin, admin.ModelAdmin):
+        export_fields = ["name", "phone", "email", "source", "created_at"]
+"""
+import csv
+import pickle
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import LazyObject
+from django.utils.html import format_html
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+DEFAULTS = {
+    "ASYNC_THRESHOLD": 50_000,
+    "CHUNK_SIZE": 2000,
+    "ROOT": settings.BASE_DIR / "exports",
+    "KEEP_DAYS": 7,
+}
+
+# Сколько байт копить перед отдачей очередного куска
+FLUSH_SIZE = 64 * 1024
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "EXPORT", {})}
+
+
+class ExportStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = FileSystemStorage(location=get_config()["ROOT"])
+
+
+export_storage = ExportStorage()
+
+
+# --- Колонки ---
+
+def columns(model, paths):
+    """
+    Заголовки и преобразователи значений для путей полей ("developer__name").
+
+    Поля с choices выводятся подписью, а не кодом.
+    """
+    headers, converters = [], []
+    for path in paths:
+        field, opts = None, model._meta
+        for part in path.split("__"):
+            field = opts.get_field(part)
+            if field.is_relation and field.related_model is not None:
+                opts = field.related_model._meta
+        header = str(field.verbose_name)
+        if "__" in path:
+            header = f"{field.model._meta.verbose_name}: {header}"
+        headers.append(header)
+        choices = dict(field.flatchoices) if getattr(field, "choices", None) else None
+        converters.append((lambda value, c=choices: c.get(value, value)) if choices else None)
+    return headers, converters
+
+
+def iter_rows(queryset, paths, chunk_size=None):
+    """Строки выгрузки: кортежи значений, без загрузки объектов моделей."""
+    _, converters = columns(queryset.model, paths)
+    chunk_size = chunk_size or get_config()["CHUNK_SIZE"]
+    for row in queryset.values_list(*paths).iterator(chunk_size=chunk_size):
+        yield [convert(value) if convert else value for convert, value in zip(converters, row)]
+
+
+# --- CSV ---
+
+class _Echo:
+    """Файлоподобный объект для csv.writer: write возвращает строку, а не пишет её."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime("%Y-%m-%d %H:%M") if timezone.is_aware(value) else value.isoformat(" ")
+    if value is None:
+        return ""
+    return value
+
+
+def csv_stream(headers, rows):
+    """Кусочки CSV (str); BOM — чтобы Excel узнал UTF-8 с кириллицей."""
+    writer = csv.writer(_Echo())
+    buffer = ["﻿", writer.writerow(headers)]
+    size = 0
+    for row in rows:
+        line = writer.writerow([_csv_value(value) for value in row])
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    yield "".join(buffer)
+
+
+# --- XLSX ---
+
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Pipe:
+    """Приёмник для zipfile без seek: байты копятся до drain()."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks, self.size = [], 0
+        return data
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime):
+        value = _csv_value(value)
+    elif isinstance(value, date):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def xlsx_stream(headers, rows):
+    """Кусочки XLSX (bytes): архив пишется в память порциями и сразу отдаётся."""
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD.encode())
+            sheet.write(("<row>" + "".join(_xlsx_cell(v) for v in headers) + "</row>").encode())
+            for row in rows:
+                sheet.write(("<row>" + "".join(_xlsx_cell(v) for v in row) + "</row>").encode())
+                if pipe.size >= FLUSH_SIZE:
+                    yield pipe.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield pipe.drain()
+
+
+def stream(fmt, headers, rows):
+    return csv_stream(headers, rows) if fmt == "csv" else xlsx_stream(headers, rows)
+
+
+def filename(model, fmt):
+    return f"{model._meta.model_name}-{timezone.localtime():%Y%m%d-%H%M}.{fmt}"
+
+
+# --- Фоновая выгрузка ---
+
+def write_file(job):
+    """Выгрузка ExportJob в файл закрытого хранилища. Returns: число строк."""
+    from django.apps import apps
+
+    model = apps.get_model(job.model)
+    queryset = model._default_manager.all()
+    queryset.query = pickle.loads(job.query)
+    headers, _ = columns(model, job.fields)
+
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    name = f"{job.pk}-{filename(model, job.format)}"
+    path = Path(export_storage.path(name))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        for chunk in stream(job.format, headers, counted(iter_rows(queryset, job.fields))):
+            f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+    job.file = name
+    return count
+
+
+# --- Админка ---
+
+def _export(modeladmin, request, queryset, fmt):
+    paths = list(modeladmin.export_fields)
+    threshold = get_config()["ASYNC_THRESHOLD"]
+    if queryset.count() > threshold:
+        from .models import ExportJob
+        from .tasks import run_export
+
+        job = ExportJob.objects.create(
+            user=request.user,
+            model=queryset.model._meta.label,
+            format=fmt,
+            fields=paths,
+            query=pickle.dumps(queryset.query),
+        )
+        transaction.on_commit(lambda: run_export.delay(job.pk))
+        url = reverse("admin:core_exportjob_change", args=[job.pk])
+        modeladmin.message_user(
+            request,
+            format_html('Выгрузка больше {} строк готовится в фоне: <a href="{}">{}</a>', threshold, url, job),
+            messages.INFO,
+        )
+        return None
+
+    headers, _ = columns(queryset.model, paths)
+    response = StreamingHttpResponse(stream(fmt, headers, iter_rows(queryset, paths)), content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename(queryset.model, fmt)}"'
+    return response
+
+
+@admin.action(description="Выгрузить в CSV")
+def export_csv(modeladmin, request, queryset):
+    return _export(modeladmin, request, queryset, "csv")
+
+
+@admin.action(description="Выгрузить в Excel (XLSX)")
+def export_xlsx(modeladmin, request, queryset):
+    return _export(modeladmin, request, queryset, "xlsx")
+
+
+class ExportMixin:
+    """Действия «Выгрузить в CSV/XLSX» для колонок export_fields."""
+    export_fields = ()
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if self.export_fields:
+            for action in (export_csv, export_xlsx):
+                actions[action.__name__] = self.get_action(action)
+        return actions
@@ -0,0 +1,136 @@
+# core/fastadmin.py
+"""
+Списки админки, которые не тормозят на больших таблицах.
+
+FastAdminMixin:
+    * list_select_related выводится из list_display — все ForeignKey
+      и OneToOne колонки списка читаются одним JOIN, а не запросом на строку
+      (Django по умолчанию идёт только по NOT NULL ключам);
+    * list_counts = {"posts_count": "posts"} — число связанных строк
+      аннотируется коррелированным подзапросом; он считается только
+      для строк текущей страницы и доступен для сортировки;
+    * paginator = EstimatedCountPaginator и show_full_result_count = False —
+      без полных COUNT(*) по таблице на каждый показ списка;
+    * если у модели есть SEARCH_FIELDS, поиск на PostgreSQL идёт по
+      индексированному полнотекстовому вектору (core/search.py).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from . import search
+
+# Таблицы меньше этого размера считаются точно
+ESTIMATE_THRESHOLD = 100_000
+
+# Потолок подсчёта отфильтрованного списка на большой таблице
+COUNT_LIMIT = 10_000
+
+# Сколько связанных объектов подставлять в поиск по "developer__name"
+RELATED_SEARCH_LIMIT = 500
+
+
+def estimate_count(model, using="default"):
+    """
+    Примерное число строк таблицы из статистики СУБД, без чтения таблицы.
+
+    PostgreSQL — pg_class.reltuples (обновляет autovacuum/ANALYZE),
+    SQLite — MAX(rowid) по B-дереву. Returns: int или None, если оценки нет.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "sqlite":
+            cursor.execute(f"SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}")
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator без полного COUNT(*) на больших таблицах.
+
+    Маленькие таблицы считаются точно. На большой таблице список без
+    фильтров берёт оценку из статистики, отфильтрованный — считается
+    не дальше COUNT_LIMIT строк (страницы после этого порога не показываются).
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = estimate_count(queryset.model, queryset.db)
+        if estimate is None or estimate < ESTIMATE_THRESHOLD:
+            return queryset.count()
+        if not queryset.query.has_filters():
+            return estimate
+        return queryset.order_by()[:COUNT_LIMIT].count()
+
+
+def related_count(model, relation):
+    """Подзапрос COUNT строк обратной связи relation ("posts") для OuterRef("pk")."""
+    field = model._meta.get_field(relation)
+    related = field.related_model._default_manager.filter(**{field.field.name: OuterRef("pk")})
+    return Coalesce(
+        Subquery(
+            related.order_by().values(field.field.name).annotate(n=Count("pk")).values("n"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+class FastAdminMixin:
+    """Быстрые списки админки: см. описание модуля."""
+    list_counts = {}
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_list_select_related(self, request):
+        if self.list_select_related is not False:
+            return self.list_select_related
+        related = []
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and (field.many_to_one or field.one_to_one):
+                related.append(name)
+        return related
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.list_counts:
+            queryset = queryset.annotate(**{
+                name: related_count(self.model, relation) for name, relation in self.list_counts.items()
+            })
+        return queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        fields = getattr(self.model, "SEARCH_FIELDS", None)
+        if not (fields and search_term and search.is_supported(queryset.db)):
+            return super().get_search_results(request, queryset, search_term)
+
+        # Поля модели ищутся по индексу; поля связанных моделей ("developer__name")
+        # сводятся к списку ключей по их (маленькой) таблице — условие остаётся индексным
+        condition = Q(**{search.ANNOTATION: search.query(search_term)})
+        for name in self.get_search_fields(request):
+            if "__" not in name:
+                continue
+            relation, lookup = name.split("__", 1)
+            related_model = self.model._meta.get_field(relation).related_model
+            pks = related_model._default_manager.filter(**{f"{lookup}__icontains": search_term})
+            pks = list(pks.values_list("pk", flat=True)[:RELATED_SEARCH_LIMIT])
+            if pks:
+                condition |= Q(**{f"{relation}__in": pks})
+        queryset = queryset.annotate(**{search.ANNOTATION: search.vector(fields)}).filter(condition)
+        return queryset, False
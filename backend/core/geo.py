@@ -0,0 +1,221 @@
+# core/geo.py
+"""
+Географический поиск без PostGIS (обычный Postgres и SQLite).
+
+Точка хранится как latitude/longitude плюс geo_cell — номер ячейки
+равномерной сетки с шагом CELL_SIZE градусов (0.01° ≈ 1.1 км):
+
+    geo_cell = row * COLUMNS + col,
+    row = floor((lat + 90) / CELL_SIZE), col = floor((lon + 180) / CELL_SIZE)
+
+Ячейки одной строки сетки идут подряд, поэтому bounding box — это
+несколько диапазонов geo_cell BETWEEN a AND b (по одному на строку),
+каждый читается из B-tree индекса. Точная граница и сортировка по
+расстоянию считаются уже по малому набору кандидатов.
+
+Ближайшие точки ищутся расширяющимся окном (nearest), так что
+сортируется только окрестность центра, а не весь видимый bbox.
+
+Расстояние — равнопромежуточная проекция вокруг центра запроса
+(dx = Δlon · cos(lat0), dy = Δlat): только арифметика в SQL,
+на масштабе острова ошибка меньше процента.
+
+Модели подключают GeoPointMixin (Property, Event); bulk_create в обход
+save() должен заполнять geo_cell сам через cell_for().
+"""
+import math
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+
+CELL_SIZE = 0.01
+COLUMNS = int(round(360 / CELL_SIZE))
+KM_PER_DEGREE = 111.32
+
+# Если bbox выше — диапазонов по строкам слишком много, берём полосу широт целиком
+MAX_GRID_ROWS = 64
+
+# Начальная полуширина окна поиска ближайших, в градусах широты (~2 км)
+INITIAL_STEP = 0.02
+
+
+def cell_for(latitude, longitude):
+    """Номер ячейки сетки для точки (None, если координат нет)."""
+    if latitude is None or longitude is None:
+        return None
+    row = math.floor((float(latitude) + 90) / CELL_SIZE)
+    col = math.floor((float(longitude) + 180) / CELL_SIZE)
+    return row * COLUMNS + min(col, COLUMNS - 1)
+
+
+class GeoPointMixin(models.Model):
+    """Координаты точки и её ячейка сетки для индексного поиска."""
+    latitude = models.DecimalField("Широта", max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField("Долгота", max_digits=9, decimal_places=6, null=True, blank=True)
+    geo_cell = models.BigIntegerField("Ячейка сетки", null=True, blank=True, editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = cell_for(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geo_cell"}
+        super().save(*args, **kwargs)
+
+    @property
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+
+
+class BBox:
+    """Прямоугольник south/west/north/east в градусах."""
+
+    def __init__(self, south, west, north, east):
+        if not all(map(math.isfinite, (south, west, north, east))):
+            raise ValueError("bbox: координаты должны быть числами")
+        if south > north or west > east:
+            raise ValueError("south/west должны быть меньше north/east")
+        self.south, self.west, self.north, self.east = south, west, north, east
+
+    @classmethod
+    def parse(cls, value):
+        """Из строки "west,south,east,north" (порядок как в Leaflet toBBoxString)."""
+        try:
+            west, south, east, north = (float(part) for part in value.split(","))
+        except (AttributeError, ValueError):
+            raise ValueError("bbox: ожидается west,south,east,north")
+        return cls(max(south, -90.0), max(west, -180.0), min(north, 90.0), min(east, 180.0))
+
+    @classmethod
+    def around(cls, latitude, longitude, radius_km):
+        if not (math.isfinite(latitude) and math.isfinite(longitude)):
+            raise ValueError("lat/lon должны быть числами")
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+        return cls(max(latitude - dlat, -90.0), max(longitude - dlon, -180.0),
+                   min(latitude + dlat, 90.0), min(longitude + dlon, 180.0))
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def cell_ranges(self, per_row=True):
+        """
+        Диапазоны geo_cell: по одному на строку сетки.
+
+        Если строк больше MAX_GRID_ROWS или per_row=False — один диапазон
+        на всю полосу широт: он тоже читается по индексу, а долготу
+        отсекает точная граница.
+        """
+        row_min = math.floor((self.south + 90) / CELL_SIZE)
+        row_max = math.floor((self.north + 90) / CELL_SIZE)
+        if not per_row or row_max - row_min + 1 > MAX_GRID_ROWS:
+            return [(row_min * COLUMNS, row_max * COLUMNS + COLUMNS - 1)]
+        col_min = math.floor((self.west + 180) / CELL_SIZE)
+        col_max = min(math.floor((self.east + 180) / CELL_SIZE), COLUMNS - 1)
+        return [
+            (row * COLUMNS + col_min, row * COLUMNS + col_max)
+            for row in range(row_min, row_max + 1)
+        ]
+
+    def filter(self, queryset, half_open=False, per_row=True):
+        """
+        Точки внутри прямоугольника: диапазоны ячеек по индексу + точная граница.
+
+        half_open=True не включает северную и восточную границы — так точка
+        на стыке соседних тайлов попадает ровно в один из них.
+        per_row=False — сплошной скан полосы широт вместо десятков диапазонов;
+        выгоднее, когда нужен весь прямоугольник (агрегаты по тайлу).
+        """
+        cells = Q()
+        for low, high in self.cell_ranges(per_row):
+            cells |= Q(geo_cell__range=(low, high))
+        queryset = queryset.filter(cells, latitude__gte=_decimal(self.south), longitude__gte=_decimal(self.west))
+        if half_open:
+            return queryset.filter(latitude__lt=_decimal(self.north), longitude__lt=_decimal(self.east))
+        return queryset.filter(latitude__lte=_decimal(self.north), longitude__lte=_decimal(self.east))
+
+
+def _decimal(value):
+    return Decimal(str(round(value, 6)))
+
+
+def with_distance(queryset, latitude, longitude):
+    """
+    Аннотирует distance_sq (квадрат расстояния в градусах широты) и сортирует по нему.
+
+    Километры: math.sqrt(distance_sq) * KM_PER_DEGREE (см. distance_km).
+    """
+    scale = math.cos(math.radians(latitude))
+    dlat = ExpressionWrapper(F("latitude") - Value(_decimal(latitude)), output_field=FloatField())
+    dlon = ExpressionWrapper(
+        (F("longitude") - Value(_decimal(longitude))) * Value(scale), output_field=FloatField()
+    )
+    return queryset.annotate(
+        distance_sq=ExpressionWrapper(dlat * dlat + dlon * dlon, output_field=FloatField())
+    ).order_by("distance_sq")
+
+
+def distance_km(distance_sq):
+    return math.sqrt(max(float(distance_sq), 0.0)) * KM_PER_DEGREE
+
+
+def intersection(first, second):
+    """Пересечение двух прямоугольников или None."""
+    south, west = max(first.south, second.south), max(first.west, second.west)
+    north, east = min(first.north, second.north), min(first.east, second.east)
+    if south > north or west > east:
+        return None
+    return BBox(south, west, north, east)
+
+
+def contains(outer, inner):
+    return (outer.south <= inner.south and outer.west <= inner.west
+            and outer.north >= inner.north and outer.east >= inner.east)
+
+
+def nearest(queryset, fields, limit, bbox=None, center=None, radius_km=None):
+    """
+    limit ближайших точек в bbox или в радиусе от center=(lat, lon).
+
+    Поиск расширяющимся окном: квадрат со стороной 2h вокруг центра,
+    внутри него — круг радиуса h. Если в круге набралось limit точек,
+    они заведомо ближайшие (всё вне квадрата дальше h); иначе h растёт
+    пропорционально недостающей плотности (в 1.5–4 раза). В плотном центре хватает одного-двух запросов по нескольким
+    ячейкам сетки, а сортировка по расстоянию идёт по сотням строк,
+    а не по всем точкам видимой области.
+
+    Returns:
+        list[dict] — значения fields плюс latitude, longitude, distance_sq.
+    """
+    if center is not None and radius_km is not None:
+        bbox = BBox.around(center[0], center[1], radius_km)
+        max_step = radius_km / KM_PER_DEGREE
+    else:
+        center = bbox.center
+        max_step = None
+    latitude, longitude = center
+    scale = max(math.cos(math.radians(latitude)), 0.01)
+    values = (*fields, "latitude", "longitude", "distance_sq")
+
+    step = INITIAL_STEP
+    while True:
+        if max_step is not None:
+            step = min(step, max_step)
+        square = BBox(max(latitude - step, -90.0), max(longitude - step / scale, -180.0),
+                      min(latitude + step, 90.0), min(longitude + step / scale, 180.0))
+        window = intersection(square, bbox)
+        if window is None:
+            return []
+        last = contains(square, bbox) or step == max_step
+        rows = with_distance(window.filter(queryset), latitude, longitude)
+        if not last or max_step is not None:
+            rows = rows.filter(distance_sq__lte=step ** 2)
+        rows = list(rows.values(*values)[:limit])
+        if last or len(rows) >= limit:
+            return rows
+        # Точек в круге ~ h², поэтому следующий радиус — по плотности найденного
+        step *= min(4.0, max(1.5, 1.25 * math.sqrt(limit / max(len(rows), 1))))
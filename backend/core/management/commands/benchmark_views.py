@@ -0,0 +1,100 @@
+# core/management/commands/benchmark_views.py
+"""
+Замер латентности страниц через WSGI-хендлер внутри процесса.
+
+Пример:
+    python manage.py benchmark_views --repeat 50 --output bench.json
+    python manage.py benchmark_views --output after.json --baseline bench.json
+
+Для каждого URL выводятся p50/p95/p99 (мс) и число SQL-запросов.
+Результат сохраняется в JSON и может сравниваться с базовым прогоном.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import BlogPost
+from core.services.benchmark import UrlStats, WSGIRunner, compare_results, write_results
+from developers.models import Developer
+from events.models import Event
+from news.models import NewsPost
+from properties.models import Property
+
+
+class Command(BaseCommand):
+    help = "Замеряет p50/p95/p99 и число SQL-запросов по основным страницам"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Замеров на URL")
+        parser.add_argument("--warmup", type=int, default=2, help="Прогревочных запросов на URL")
+        parser.add_argument("--details", type=int, default=3, help="Сколько детальных страниц брать на модель")
+        parser.add_argument("--language", default=None, help="Accept-Language для запросов")
+        parser.add_argument("--url", action="append", default=[], help="Дополнительный URL (можно несколько)")
+        parser.add_argument("--output", default=None, help="Куда сохранить JSON с результатами")
+        parser.add_argument("--baseline", default=None, help="JSON предыдущего прогона для сравнения")
+
+    def handle(self, *args, **options):
+        if options["verbosity"] < 2:
+            # Трейсбеки 500-х ответов забивают отчёт; статусы и так видны в таблице
+            logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+        runner = WSGIRunner(language=options["language"])
+        urls = self.collect_urls(options["details"]) + options["url"]
+
+        results = {}
+        for url in urls:
+            for _ in range(options["warmup"]):
+                runner.get(url)
+            stats = UrlStats()
+            for _ in range(options["repeat"]):
+                stats.add(runner.get(url))
+            results[url] = stats.summary()
+            self.print_row(url, results[url])
+
+        if options["output"]:
+            write_results(options["output"], results, meta={
+                "repeat": options["repeat"],
+                "language": options["language"],
+                "created_at": timezone.now().isoformat(),
+            })
+            self.stdout.write(self.style.SUCCESS(f"Результаты сохранены в {options['output']}"))
+
+        if options["baseline"]:
+            self.print_diff(compare_results(options["baseline"], results))
+
+    def collect_urls(self, details):
+        """Список страниц: списки + первые N детальных страниц каждой модели."""
+        urls = [
+            reverse("index"),
+            reverse("developers:list"),
+            reverse("properties:list"),
+            reverse("blog:list"),
+            reverse("news:list"),
+            reverse("events:list"),
+        ]
+        samples = [
+            Developer.objects.filter(is_active=True),
+            Property.objects.filter(is_active=True),
+            BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED),
+            NewsPost.objects.filter(status=NewsPost.Status.PUBLISHED),
+            Event.objects.all(),
+        ]
+        for queryset in samples:
+            for obj in queryset.order_by("pk").only("pk", "slug")[:details]:
+                urls.append(obj.get_absolute_url())
+        return urls
+
+    def print_row(self, url, row):
+        statuses = ",".join(f"{code}x{n}" for code, n in sorted(row["statuses"].items()))
+        self.stdout.write(
+            f"{url:<60} p50={row['p50_ms']:>8.2f} p95={row['p95_ms']:>8.2f} "
+            f"p99={row['p99_ms']:>8.2f} ms  queries={row['queries_p50']:<4} [{statuses}]"
+        )
+
+    def print_diff(self, diff):
+        self.stdout.write("\nСравнение с базовым прогоном (было → стало, %):")
+        for url, row in diff.items():
+            parts = [f"{key}: {old} → {new} ({change:+.1f}%)" for key, (old, new, change) in row.items()]
+            self.stdout.write(f"{url}\n    " + "; ".join(parts))
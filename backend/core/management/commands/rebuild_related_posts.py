@@ -0,0 +1,21 @@
+# core/management/commands/rebuild_related_posts.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.related import INDEXES
+
+
+class Command(BaseCommand):
+    help = "Полный пересчёт похожих публикаций (TF-IDF) для блога и новостей"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", default=None, help=f"Только один индекс: {', '.join(INDEXES)}")
+
+    def handle(self, *args, **options):
+        label = options["model"]
+        if label and label not in INDEXES:
+            raise CommandError(f"Неизвестный индекс {label}; доступны: {', '.join(INDEXES)}")
+        for index in INDEXES.values():
+            if label and index.label != label:
+                continue
+            links = index.rebuild_all()
+            self.stdout.write(self.style.SUCCESS(f"{index.label}: сохранено связей {links}"))
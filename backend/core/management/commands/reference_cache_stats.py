@@ -0,0 +1,24 @@
+# core/management/commands/reference_cache_stats.py
+from django.core.management.base import BaseCommand
+
+from core.tiered import tiered_cache
+
+
+class Command(BaseCommand):
+    help = "Попадания двухуровневого кэша справочников: LRU процессов и Redis"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Обнулить счётчики")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            tiered_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Счётчики обнулены"))
+            return
+        stats = tiered_cache.stats()
+        for tier, title in (("local", "Память процесса"), ("shared", "Redis")):
+            ratio = stats[f"{tier}_hit_ratio"]
+            self.stdout.write(
+                f"{title}: попаданий {stats[f'{tier}_hits']}, промахов {stats[f'{tier}_misses']}, "
+                f"доля {'—' if ratio is None else f'{ratio:.1%}'}"
+            )
@@ -0,0 +1,12 @@
+# core/management/commands/refresh_exchange_rates.py
+from django.core.management.base import BaseCommand
+
+from core.currency import refresh_rates
+
+
+class Command(BaseCommand):
+    help = "Загрузка курсов валют из провайдера settings.CURRENCY"
+
+    def handle(self, *args, **options):
+        updated = refresh_rates()
+        self.stdout.write(self.style.SUCCESS(f"Обновлено курсов: {updated}"))
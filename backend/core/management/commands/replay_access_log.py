@@ -0,0 +1,97 @@
+# core/management/commands/replay_access_log.py
+"""
+Нагрузочный прогон по реальному трафику из access-лога gunicorn.
+
+Пример:
+    docker compose logs backend --no-log-prefix > access.log
+    python manage.py replay_access_log access.log --speed 5 --concurrency 8
+    python manage.py replay_access_log access.log --target http://127.0.0.1:8000 --output replay.json
+
+Без --target запросы выполняются внутри процесса через WSGIHandler.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services.benchmark import compare_results, write_results
+from core.services.loadreplay import (
+    HttpTarget,
+    InProcessTarget,
+    Replayer,
+    build_stream,
+    parse_access_log,
+)
+
+
+class Command(BaseCommand):
+    help = "Воспроизводит запросы из access-лога и считает латентность по URL-шаблонам"
+
+    def add_arguments(self, parser):
+        parser.add_argument("logfile", help="Файл access-лога gunicorn ('-' — stdin)")
+        parser.add_argument("--speed", type=float, default=1.0, help="Множитель темпа (0 — без пауз)")
+        parser.add_argument("--concurrency", type=int, default=4, help="Параллельных запросов")
+        parser.add_argument("--limit", type=int, default=None, help="Ограничить число запросов")
+        parser.add_argument("--target", default=None, help="Базовый URL gunicorn; по умолчанию — внутри процесса")
+        parser.add_argument("--language", default=None, help="Accept-Language для in-process режима")
+        parser.add_argument("--output", default=None, help="Куда сохранить JSON с результатами")
+        parser.add_argument("--baseline", default=None, help="JSON предыдущего прогона для сравнения")
+
+    def handle(self, *args, **options):
+        if options["speed"] < 0 or options["concurrency"] < 1:
+            raise CommandError("--speed должен быть >= 0, --concurrency >= 1")
+        if options["verbosity"] < 2:
+            logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+        stream = self.load_stream(options["logfile"], options["limit"])
+        if not stream:
+            raise CommandError("В логе не найдено запросов для воспроизведения")
+        self.stdout.write(
+            f"Запросов: {len(stream)}, длительность по логу: {stream[-1].offset:.0f} с"
+        )
+
+        if options["target"]:
+            target = HttpTarget(options["target"])
+        else:
+            target = InProcessTarget(language=options["language"])
+
+        replayer = Replayer(target, speed=options["speed"], concurrency=options["concurrency"])
+        try:
+            totals = replayer.run(stream)
+        finally:
+            if hasattr(target, "close"):
+                target.close()
+        results = replayer.summary()
+
+        for pattern, row in results.items():
+            self.stdout.write(
+                f"{pattern:<40} n={row['count']:<6} p50={row['p50_ms']:>8.2f} "
+                f"p95={row['p95_ms']:>8.2f} p99={row['p99_ms']:>8.2f} ms  queries={row['queries_p50']}"
+            )
+        self.stdout.write(
+            f"Итого: {totals['requests']} запросов за {totals['elapsed_s']} с "
+            f"({totals['rps']} rps), отставание от расписания p95={totals['lag']['p95_ms']} мс"
+        )
+
+        if options["output"]:
+            write_results(options["output"], results, meta={
+                "logfile": options["logfile"],
+                "speed": options["speed"],
+                "concurrency": options["concurrency"],
+                "target": options["target"] or "in-process",
+                "totals": totals,
+                "created_at": timezone.now().isoformat(),
+            })
+            self.stdout.write(self.style.SUCCESS(f"Результаты сохранены в {options['output']}"))
+
+        if options["baseline"]:
+            for pattern, row in compare_results(options["baseline"], results).items():
+                parts = [f"{key}: {old} → {new} ({change:+.1f}%)" for key, (old, new, change) in row.items()]
+                self.stdout.write(f"{pattern}\n    " + "; ".join(parts))
+
+    def load_stream(self, path, limit):
+        if path == "-":
+            import sys
+            return build_stream(parse_access_log(sys.stdin), limit=limit)
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            return build_stream(parse_access_log(fh), limit=limit)
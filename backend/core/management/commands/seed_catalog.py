@@ -0,0 +1,305 @@
+# core/management/commands/seed_catalog.py
+"""
+Генерация синтетического каталога для нагрузочных замеров.
+
+Пример:
+    python manage.py seed_catalog --seed 42
+    python manage.py seed_catalog --scale 0.01   # 1% объёма для быстрой проверки
+
+Все данные создаются через bulk_create пачками. При одинаковых --seed
+и --base-date содержимое (названия, цены, рейтинги, даты публикации)
+совпадает: даты отсчитываются от --base-date, а не от текущего момента.
+Команда рассчитана на пустую базу: slug-и генерируются по номеру строки.
+"""
+import random
+from itertools import islice
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import BlogCategory, BlogPost
+from core.geo import cell_for
+from developers.models import Developer, DeveloperCategory, DeveloperReview
+from developers.rating import recompute_all
+from events.models import Event
+from news.models import NewsCategory, NewsPost
+from properties.locations import recount_all as recount_locations
+from properties.models import Location, Property, PropertyImage, PropertyType, price_per_m2
+
+DEFAULT_VOLUMES = {
+    "developers": 10_000,
+    "properties": 200_000,
+    "images_per_property": 4,
+    "reviews": 100_000,
+    "news": 50_000,
+    "blog": 50_000,
+    "events": 5_000,
+}
+
+DEVELOPER_CATEGORIES = [("Премиум", "premium"), ("Бизнес+", "business-plus"), ("Средний", "middle")]
+PROPERTY_TYPES = [("Вилла", "villa"), ("Апартаменты", "apartments"), ("Таунхаус", "townhouse")]
+LOCATIONS = [
+    ("Чангу", "canggu"), ("Убуд", "ubud"), ("Семиньяк", "seminyak"), ("Улувату", "uluwatu"),
+    ("Санур", "sanur"), ("Нуса Дуа", "nusa-dua"), ("Джимбаран", "jimbaran"), ("Кута", "kuta"),
+    ("Переренан", "pererenan"), ("Табанан", "tabanan"),
+]
+# Дерево локаций: регион > округ > районы из LOCATIONS
+LOCATION_TREE = (("Бали", "bali"), [
+    (("Бадунг", "badung"), ["canggu", "seminyak", "uluwatu", "nusa-dua", "jimbaran", "kuta", "pererenan"]),
+    (("Гианьяр", "gianyar"), ["ubud"]),
+    (("Денпасар", "denpasar"), ["sanur"]),
+    (("Округ Табанан", "tabanan-regency"), ["tabanan"]),
+])
+BLOG_CATEGORIES = [("Аналитика", "analytics"), ("Гайды", "guides"), ("Инвестиции", "investments")]
+NEWS_CATEGORIES = [("Рынок", "market"), ("Законы", "law"), ("Застройщики", "developers")]
+
+WORDS = (
+    "вилла апартаменты океан рисовые террасы инвестиции доходность аренда бассейн "
+    "вид закат пляж серфинг джунгли лизхолд фрихолд застройщик проект сдача этап "
+    "комплекс резиденция бутик отель управление налог виза рынок спрос цена"
+).split()
+
+# От неё отсчитываются даты публикаций (назад) и мероприятий (±год)
+BASE_DATE = date(2025, 1, 1)
+
+# Балийский bounding box: координаты объектов и мероприятий
+BALI_LAT = (-8.85, -8.06)
+BALI_LNG = (114.43, 115.71)
+
+
+class Command(BaseCommand):
+    help = "Генерирует синтетический каталог (застройщики, объекты, отзывы, статьи, события)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42, help="Seed генератора")
+        parser.add_argument("--scale", type=float, default=1.0, help="Множитель объёмов")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--base-date", type=date.fromisoformat, default=BASE_DATE,
+                            help=f"Опорная дата ГГГГ-ММ-ДД (по умолчанию {BASE_DATE})")
+        for name, value in DEFAULT_VOLUMES.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=None,
+                                help=f"Количество (по умолчанию {value})")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        base = options["base_date"]
+        self.base_date = datetime(base.year, base.month, base.day, 12, tzinfo=timezone.utc)
+
+        volumes = {}
+        for name, value in DEFAULT_VOLUMES.items():
+            explicit = options[name]
+            if explicit is not None:
+                volumes[name] = explicit
+            elif name == "images_per_property":
+                volumes[name] = value
+            else:
+                volumes[name] = max(1, int(value * options["scale"]))
+
+        with transaction.atomic():
+            dev_categories = self._reference(DeveloperCategory, DEVELOPER_CATEGORIES, with_order=True)
+            types = self._reference(PropertyType, PROPERTY_TYPES)
+            locations = self._locations()
+            blog_categories = self._reference(BlogCategory, BLOG_CATEGORIES)
+            news_categories = self._reference(NewsCategory, NEWS_CATEGORIES)
+
+        developer_ids = self._developers(volumes["developers"], dev_categories)
+        property_ids = self._properties(volumes["properties"], developer_ids, types, locations)
+        self._images(property_ids, volumes["images_per_property"])
+        self._reviews(volumes["reviews"], developer_ids)
+        # bulk_create не вызывает сигналы — рейтинги считаем одним проходом
+        recompute_all()
+        self._posts(BlogPost, volumes["blog"], blog_categories, "blog")
+        self._posts(NewsPost, volumes["news"], news_categories, "news")
+        self._events(volumes["events"], developer_ids)
+        recount_locations()
+
+        self.stdout.write(self.style.SUCCESS(
+            "Готово: " + ", ".join(f"{k}={v}" for k, v in volumes.items())
+        ))
+
+    # ------------------------------------------------------------------
+    # Справочники
+    # ------------------------------------------------------------------
+    def _reference(self, model, items, with_order=False):
+        objects = []
+        for index, (name, slug) in enumerate(items):
+            defaults = {"name": name}
+            if with_order:
+                defaults["order"] = index
+            obj, _ = model.objects.get_or_create(slug=slug, defaults=defaults)
+            objects.append(obj)
+        return objects
+
+    def _locations(self):
+        """Районы из LOCATIONS, разложенные по дереву LOCATION_TREE; возвращает районы."""
+        (region_name, region_slug), regencies = LOCATION_TREE
+        region, _ = Location.objects.get_or_create(
+            slug=region_slug, defaults={"name": region_name, "kind": Location.Kind.REGION}
+        )
+        names = dict((slug, name) for name, slug in LOCATIONS)
+        areas = {}
+        for (regency_name, regency_slug), area_slugs in regencies:
+            regency, _ = Location.objects.get_or_create(
+                slug=regency_slug,
+                defaults={"name": regency_name, "kind": Location.Kind.REGENCY, "parent": region},
+            )
+            for slug in area_slugs:
+                areas[slug], _ = Location.objects.get_or_create(
+                    slug=slug, defaults={"name": names[slug], "parent": regency}
+                )
+        return [areas[slug] for _, slug in LOCATIONS]
+
+    # ------------------------------------------------------------------
+    # Генераторы
+    # ------------------------------------------------------------------
+    def _text(self, words):
+        return " ".join(self.rng.choice(WORDS) for _ in range(words))
+
+    def _html(self, paragraphs):
+        return "".join(f"<p>{self._text(60)}</p>" for _ in range(paragraphs))
+
+    def _point(self):
+        return (
+            Decimal(str(round(self.rng.uniform(*BALI_LAT), 6))),
+            Decimal(str(round(self.rng.uniform(*BALI_LNG), 6))),
+        )
+
+    def _bulk(self, model, rows, label):
+        """
+        bulk_create пачками из генератора строк.
+
+        Строки создаются лениво, поэтому в памяти одновременно живёт
+        только одна пачка. Возвращает список pk в порядке вставки.
+        """
+        ids = []
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                break
+            ids.extend(obj.pk for obj in model.objects.bulk_create(chunk))
+        self.stdout.write(f"  {label}: {len(ids)}")
+        return ids
+
+    def _developers(self, count, categories):
+        def rows():
+            for i in range(count):
+                yield Developer(
+                    name=f"{self._text(2).title()} Development {i}",
+                    slug=f"seed-developer-{i}",
+                    category=self.rng.choice(categories),
+                    logo="developers/logos/seed.png",
+                    short_description=self._text(30),
+                    description=self._html(8),
+                    completed_count=self.rng.randint(0, 40),
+                    in_progress_count=self.rng.randint(0, 15),
+                    rating=Decimal(self.rng.randint(25, 50)) / 10,
+                    premium_rating=self.rng.randint(1, 5),
+                    support_rating=self.rng.randint(1, 5),
+                    quality_rating=self.rng.randint(1, 5),
+                    website=f"https://developer{i}.example.com",
+                    is_verified=self.rng.random() < 0.3,
+                    is_active=self.rng.random() < 0.95,
+                )
+        return self._bulk(Developer, rows(), "developers")
+
+    def _properties(self, count, developer_ids, types, locations):
+        statuses = [c for c, _ in Property.Status.choices]
+        construction = [c for c, _ in Property.ConstructionStatus.choices]
+
+        def rows():
+            for i in range(count):
+                area = self.rng.randint(35, 600)
+                price = Decimal(area * self.rng.randint(1500, 6000))
+                latitude, longitude = self._point()
+                yield Property(
+                    name=f"{self._text(2).title()} Residence {i}",
+                    slug=f"seed-property-{i}",
+                    developer_id=self.rng.choice(developer_ids),
+                    property_type=self.rng.choice(types),
+                    location=self.rng.choice(locations),
+                    main_image="properties/seed.jpg",
+                    price_from=price,
+                    area=area,
+                    price_per_m2=price_per_m2(price, area),
+                    rooms=self.rng.randint(1, 6),
+                    status=self.rng.choice(statuses),
+                    construction_status=self.rng.choice(construction),
+                    completion_date=f"{self.rng.randint(1, 4)} квартал {self.rng.randint(2024, 2029)}",
+                    short_description=self._text(40),
+                    description=self._html(12),
+                    roi_percent=Decimal(self.rng.randint(40, 180)) / 10,
+                    is_featured=self.rng.random() < 0.02,
+                    is_active=self.rng.random() < 0.9,
+                    latitude=latitude,
+                    longitude=longitude,
+                    geo_cell=cell_for(latitude, longitude),
+                )
+        return self._bulk(Property, rows(), "properties")
+
+    def _images(self, property_ids, per_property):
+        rows = (
+            PropertyImage(property_id=pk, image=f"properties/gallery/seed-{n}.jpg", order=n)
+            for pk in property_ids
+            for n in range(per_property)
+        )
+        self._bulk(PropertyImage, rows, "property images")
+
+    def _reviews(self, count, developer_ids):
+        def rows():
+            for i in range(count):
+                yield DeveloperReview(
+                    developer_id=self.rng.choice(developer_ids),
+                    user_name=f"Инвестор {i}",
+                    rating=self.rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 9])[0],
+                    text=self._text(50),
+                    is_approved=self.rng.random() < 0.8,
+                )
+        self._bulk(DeveloperReview, rows(), "reviews")
+
+    def _posts(self, model, count, categories, prefix):
+        def rows():
+            for i in range(count):
+                published = self.rng.random() < 0.9
+                minutes_ago = self.rng.randint(0, 60 * 24 * 1500)
+                extra = {"tags": ", ".join(self.rng.sample(WORDS, 3))} if model is NewsPost else {}
+                yield model(
+                    title=f"{self._text(6).capitalize()} {i}",
+                    slug=f"seed-{prefix}-{i}",
+                    category=self.rng.choice(categories),
+                    excerpt=self._text(40),
+                    featured_image_url=f"https://picsum.photos/seed/{prefix}{i}/850/478",
+                    content=self._html(20),
+                    status=model.Status.PUBLISHED if published else model.Status.DRAFT,
+                    published_at=self.base_date - timedelta(minutes=minutes_ago) if published else None,
+                    **extra,
+                )
+        self._bulk(model, rows(), f"{prefix} posts")
+
+    def _events(self, count, developer_ids):
+        statuses = [c for c, _ in Event.Status.choices]
+
+        def rows():
+            for i in range(count):
+                start = self.base_date + timedelta(hours=self.rng.randint(-24 * 365, 24 * 365))
+                latitude, longitude = self._point()
+                yield Event(
+                    title=f"{self._text(4).capitalize()} {i}",
+                    slug=f"seed-event-{i}",
+                    image="events/seed.jpg",
+                    short_description=self._text(25),
+                    description=self._html(6),
+                    event_date=start,
+                    end_date=start + timedelta(hours=self.rng.randint(1, 8)),
+                    location_name=self.rng.choice(LOCATIONS)[0],
+                    latitude=latitude,
+                    longitude=longitude,
+                    geo_cell=cell_for(latitude, longitude),
+                    organizer_id=self.rng.choice(developer_ids) if self.rng.random() < 0.5 else None,
+                    status=self.rng.choice(statuses),
+                    is_featured=self.rng.random() < 0.05,
+                )
+        self._bulk(Event, rows(), "events")
@@ -0,0 +1,15 @@
+# core/management/commands/sync_youtube_videos.py
+from django.core.management.base import BaseCommand
+
+from core.youtube import sync_videos
+
+
+class Command(BaseCommand):
+    help = "Загрузка названий, длительности и превью видео из клиента settings.YOUTUBE"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Не брать данные из кэша")
+
+    def handle(self, *args, **options):
+        updated = sync_videos(force=options["force"])
+        self.stdout.write(self.style.SUCCESS(f"Обновлено видео: {updated}"))
@@ -0,0 +1,27 @@
+# core/management/commands/warm_cache.py
+from django.core.management.base import BaseCommand
+
+from core.warmup import bump_version, warm
+
+
+class Command(BaseCommand):
+    help = "Прогрев кэша после деплоя: новая версия блоков и рендер страниц, которые их кэшируют"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--async", action="store_true", dest="run_async", help="Поставить задачу в Celery")
+        parser.add_argument("--keep-version", action="store_true", help="Не сбрасывать закэшированные блоки")
+
+    def handle(self, *args, **options):
+        if not options["keep_version"]:
+            # После деплоя могли измениться шаблоны — старые фрагменты не годятся
+            bump_version()
+        if options["run_async"]:
+            from core.tasks import warm_cache
+
+            warm_cache.delay()
+            self.stdout.write(self.style.SUCCESS("Прогрев поставлен в очередь"))
+            return
+        result = warm()
+        self.stdout.write(self.style.SUCCESS(
+            f"Прогрето страниц: {result['pages']}, ошибок: {result['errors']}, {result['seconds']} с"
+        ))
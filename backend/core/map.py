@@ -0,0 +1,206 @@
+# core/map.py
+"""
+Точки для карты: объекты недвижимости и мероприятия.
+
+Оба источника используют GeoPointMixin, поэтому ищутся одной функцией
+core.geo.nearest; здесь описано, какие строки попадают на карту
+и какие колонки отдаются в JSON.
+
+Для мелкого масштаба — кластеры (clusters_for_bbox): карта режется
+на тайлы, тайл — на CELLS_PER_TILE × CELLS_PER_TILE ячеек, по каждой
+ячейке база отдаёт число точек и их центроид (GROUP BY floor(...)).
+Тайлы равны в градусах (не web-mercator: у экватора разница
+несущественна), поэтому ячейки кластеров не пересекают границы тайлов
+и каждый тайл кэшируется отдельно: ключ — тип точек, zoom, x, y.
+При смене координат или видимости точки сигналы (core/signals.py)
+удаляют только тайлы её старого и нового положения на всех zoom;
+после массовых изменений мимо сигналов (импорт фида) меняется версия
+в ключах всех тайлов типа (invalidate_all_tiles).
+"""
+import math
+from collections import namedtuple
+
+from django.db.models import Avg, Count, ExpressionWrapper, F, FloatField, Min, Value
+from django.db.models.functions import Floor
+from django.urls import reverse
+
+from events.models import Event
+from properties.models import Property
+
+from . import geo
+from .caching import bump_version, get_or_build_many, get_version, invalidate
+from .translation import SUFFIX
+
+# Ограничение выдачи: больше точек карта показывает кластерами
+MAX_POINTS = 2000
+
+
+def property_points():
+    return Property.objects.filter(is_active=True, geo_cell__isnull=False)
+
+
+def event_points():
+    return Event.objects.filter(geo_cell__isnull=False).exclude(status=Event.Status.COMPLETED)
+
+
+# Кластеры: сетка ячеек внутри тайла, максимальный zoom и время жизни кэша
+CELLS_PER_TILE = 4
+MAX_CLUSTER_ZOOM = 17
+MAX_TILES = 64
+CLUSTER_CACHE_TIMEOUT = 60 * 60
+
+# queryset — точки на карте; visible_field/is_visible — то же условие для одного объекта
+MapSource = namedtuple("MapSource", "queryset fields url_name model visible_field is_visible")
+
+SOURCES = {
+    "properties": MapSource(
+        property_points, ("pk", "name", "slug", "price_from"), "properties:detail",
+        Property, "is_active", bool,
+    ),
+    "events": MapSource(
+        event_points, ("pk", "title", "slug", "event_date"), "events:detail",
+        Event, "status", lambda status: status != Event.Status.COMPLETED,
+    ),
+}
+
+
+def find_points(types, bbox=None, center=None, radius_km=None, limit=200):
+    """
+    Точки выбранных типов в bbox или радиусе, общим списком по расстоянию.
+
+    Из каждого источника берётся не больше limit ближайших (geo.nearest),
+    потом списки сливаются.
+    """
+    items = []
+    for point_type in types:
+        queryset, fields, url_name = SOURCES[point_type][:3]
+        # reverse() на каждую из сотен точек заметно дороже запроса — один раз по шаблону
+        url_template = reverse(url_name, kwargs={"slug": "__slug__"})
+        # Название на активном языке — аннотацией name_i18n/title_i18n в том же запросе
+        title = "name" if "name" in fields else "title"
+        points = queryset().translated(fields=[title])
+        translated = tuple(name for name in points.query.annotations if name.endswith(SUFFIX))
+        rows = geo.nearest(points, fields + translated, limit, bbox=bbox, center=center, radius_km=radius_km)
+        for row in rows:
+            items.append({
+                "type": point_type,
+                "id": row["pk"],
+                "title": row.get(f"{title}{SUFFIX}", row[title]),
+                "url": url_template.replace("__slug__", row["slug"]),
+                "lat": float(row["latitude"]),
+                "lon": float(row["longitude"]),
+                "distance_km": round(geo.distance_km(row["distance_sq"]), 3),
+                **_extra(point_type, row),
+            })
+    items.sort(key=lambda item: item["distance_km"])
+    return items[:limit]
+
+
+def _extra(point_type, row):
+    if point_type == "properties":
+        return {"price_from": int(row["price_from"]) if row["price_from"] is not None else None}
+    return {"event_date": row["event_date"].isoformat()}
+
+
+# --- Кластеры ---
+
+def tile_size(zoom):
+    """Сторона тайла в градусах."""
+    return 360.0 / (2 ** zoom)
+
+
+def tile_of(latitude, longitude, zoom):
+    size = tile_size(zoom)
+    return math.floor((float(longitude) + 180) / size), math.floor((float(latitude) + 90) / size)
+
+
+def tiles_for_bbox(bbox, zoom):
+    """Тайлы (x, y), покрывающие bbox."""
+    x_min, y_min = tile_of(bbox.south, bbox.west, zoom)
+    x_max, y_max = tile_of(bbox.north, bbox.east, zoom)
+    return [(x, y) for x in range(x_min, x_max + 1) for y in range(y_min, y_max + 1)]
+
+
+def _tiles_version_key(point_type):
+    return f"map:clusters:{point_type}:version"
+
+
+def tiles_version(point_type):
+    return get_version(_tiles_version_key(point_type))
+
+
+def tile_cache_key(point_type, version, zoom, x, y):
+    return f"map:clusters:{point_type}:{version}:{zoom}:{x}:{y}"
+
+
+def cluster_tile(point_type, zoom, x, y):
+    """Кластеры одного тайла: GROUP BY по ячейкам с числом точек и центроидом."""
+    size = tile_size(zoom)
+    cell = size / CELLS_PER_TILE
+    west, south = x * size - 180, y * size - 90
+    bbox = geo.BBox(max(south, -90.0), max(west, -180.0), min(south + size, 90.0), min(west + size, 180.0))
+
+    def cell_index(field, offset):
+        return Floor(ExpressionWrapper((F(field) + Value(offset)) / Value(cell), output_field=FloatField()))
+
+    rows = (
+        bbox.filter(SOURCES[point_type].queryset(), half_open=True, per_row=False)
+        .annotate(cell_x=cell_index("longitude", 180), cell_y=cell_index("latitude", 90))
+        .values("cell_x", "cell_y")
+        .annotate(count=Count("pk"), lat=Avg("latitude"), lon=Avg("longitude"), first_id=Min("pk"))
+        .order_by()
+    )
+    clusters = []
+    for row in rows:
+        cluster = {
+            "type": point_type,
+            "lat": round(float(row["lat"]), 6),
+            "lon": round(float(row["lon"]), 6),
+            "count": row["count"],
+        }
+        if row["count"] == 1:
+            cluster["id"] = row["first_id"]
+        clusters.append(cluster)
+    return clusters
+
+
+def clusters_for_bbox(types, bbox, zoom):
+    """
+    Кластеры видимой области: тайлы берутся из кэша одним get_many,
+    недостающие считаются и кладутся обратно.
+    """
+    tiles = tiles_for_bbox(bbox, zoom)
+    if len(tiles) > MAX_TILES:
+        raise ValueError("Слишком большая область для этого zoom")
+    versions = {point_type: tiles_version(point_type) for point_type in types}
+    keys = {
+        tile_cache_key(point_type, versions[point_type], zoom, x, y): (point_type, zoom, x, y)
+        for point_type in types for x, y in tiles
+    }
+    cached = get_or_build_many(
+        keys,
+        lambda missing: {key: cluster_tile(*tile) for key, tile in missing.items()},
+        CLUSTER_CACHE_TIMEOUT,
+    )
+    clusters = []
+    for key in keys:
+        clusters.extend(cached.get(key, []))
+    return clusters
+
+
+def invalidate_tiles(point_type, *positions):
+    """Сбросить тайлы кластеров, в которые попадают позиции (lat, lon), на всех zoom."""
+    version = tiles_version(point_type)
+    keys = {
+        tile_cache_key(point_type, version, zoom, *tile_of(latitude, longitude, zoom))
+        for latitude, longitude in positions
+        if latitude is not None and longitude is not None
+        for zoom in range(MAX_CLUSTER_ZOOM + 1)
+    }
+    if keys:
+        invalidate(*keys)
+
+
+def invalidate_all_tiles(point_type):
+    """Сбросить все тайлы типа сменой версии в ключе — после массовых изменений (импорт фида)."""
+    bump_version(_tiles_version_key(point_type))
@@ -24,3 +24,25 @@ class StrictLanguageMiddleware:
 
         # Продолжаем выполнение запроса
         return self.get_response(request)
+
+
+class CurrencyMiddleware:
+    """
+    Валюта отображения цен: ?currency=IDR или кука, иначе USD.
+
+    Выбор из GET запоминается в куке, request.currency доступен во вьюхах.
+    """
+    COOKIE_NAME = "currency"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from .currency import normalize
+
+        chosen = request.GET.get("currency")
+        request.currency = normalize(chosen or request.COOKIES.get(self.COOKIE_NAME))
+        response = self.get_response(request)
+        if chosen and request.COOKIES.get(self.COOKIE_NAME) != request.currency:
+            response.set_cookie(self.COOKIE_NAME, request.currency, max_age=365 * 24 * 60 * 60, samesite="Lax")
+        return response
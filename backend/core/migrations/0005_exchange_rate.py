@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_video_thumbnail_url_external_alter_video_thumbnail_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "currency",
+                    models.CharField(max_length=3, unique=True, verbose_name="Валюта"),
+                ),
+                (
+                    "rate",
+                    models.DecimalField(
+                        decimal_places=6, max_digits=18, verbose_name="Курс за 1 USD"
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        blank=True, max_length=50, verbose_name="Источник"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Обновлён"),
+                ),
+            ],
+            options={
+                "verbose_name": "Курс валюты",
+                "verbose_name_plural": "Курсы валют",
+                "ordering": ["currency"],
+            },
+        ),
+    ]
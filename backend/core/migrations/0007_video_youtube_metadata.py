@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_export_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="video",
+            name="cached_thumbnail",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                upload_to="videos/youtube/",
+                verbose_name="Превью с YouTube",
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="duration",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Длительность, сек"
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="published_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Опубликовано на YouTube",
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="synced_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Синхронизировано"
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="youtube_title",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=255,
+                verbose_name="Название на YouTube",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="video",
+            name="title",
+            field=models.CharField(
+                blank=True,
+                help_text="Пусто — название с YouTube",
+                max_length=255,
+                verbose_name="Название",
+            ),
+        ),
+    ]
@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.db import models
 
 
 class Video(models.Model):
     """Видео от застройщиков"""
-    title = models.CharField("Название", max_length=255)
+    title = models.CharField(
+        "Название", max_length=255, blank=True,
+        help_text="Пусто — название с YouTube"
+    )
     youtube_id = models.CharField(
         "YouTube ID", 
         max_length=20,
@@ -24,6 +28,13 @@ class Video(models.Model):
         help_text="Или вставьте ссылку на изображение. Пример: https://img.youtube.com/vi/W7uANluGQSY/maxresdefault.jpg"
     )
     
+    # Данные с YouTube — заполняет задача sync_video_metadata (core/youtube.py)
+    youtube_title = models.CharField("Название на YouTube", max_length=255, blank=True, editable=False)
+    duration = models.PositiveIntegerField("Длительность, сек", null=True, blank=True, editable=False)
+    published_at = models.DateTimeField("Опубликовано на YouTube", null=True, blank=True, editable=False)
+    cached_thumbnail = models.ImageField("Превью с YouTube", upload_to="videos/youtube/", blank=True, editable=False)
+    synced_at = models.DateTimeField("Синхронизировано", null=True, blank=True, editable=False)
+
     views = models.PositiveIntegerField("Просмотры", default=0)
     is_active = models.BooleanField("Активно", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -34,7 +45,17 @@ class Video(models.Model):
         ordering = ["-created_at"]
 
     def __str__(self):
-        return self.title
+        return self.display_title
+
+    @property
+    def display_title(self):
+        return self.title or self.youtube_title or self.youtube_id
+
+    @property
+    def duration_display(self):
+        from .youtube import format_duration
+
+        return format_duration(self.duration)
 
     @property
     def youtube_url(self):
@@ -42,12 +63,14 @@ class Video(models.Model):
 
     @property
     def thumbnail_url(self):
-        # Приоритет: загруженный файл > внешняя ссылка > автоматическая от YouTube
+        # Приоритет: загруженный файл > внешняя ссылка > сохранённая с YouTube > с YouTube напрямую
         if self.thumbnail:
             return self.thumbnail.url
         if self.thumbnail_url_external:
             return self.thumbnail_url_external
-        return f"https://img.youtube.com/vi/{self.youtube_id}/maxresdefault.jpg"
+        if self.cached_thumbnail:
+            return self.cached_thumbnail.url
+        return f"https://i.ytimg.com/vi/{self.youtube_id}/hqdefault.jpg"
 
 
 class ContactRequest(models.Model):
@@ -129,4 +152,54 @@ class SiteSettings(models.Model):
     @classmethod
     def get(cls):
         obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
\ No newline at end of file
+        return obj
+
+class ExchangeRate(models.Model):
+    """Курс валюты к доллару: сколько единиц валюты за 1 USD (см. core/currency.py)"""
+    currency = models.CharField("Валюта", max_length=3, unique=True)
+    rate = models.DecimalField("Курс за 1 USD", max_digits=18, decimal_places=6)
+    source = models.CharField("Источник", max_length=50, blank=True)
+    updated_at = models.DateTimeField("Обновлён", auto_now=True)
+
+    class Meta:
+        verbose_name = "Курс валюты"
+        verbose_name_plural = "Курсы валют"
+        ordering = ["currency"]
+
+    def __str__(self):
+        return f"{self.currency}: {self.rate}"
+
+
+class ExportJob(models.Model):
+    """Фоновая выгрузка большого списка из админки (core/exports.py)"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Готово"
+        FAILED = "failed", "Ошибка"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name="export_jobs", verbose_name="Пользователь"
+    )
+    model = models.CharField("Модель", max_length=100)
+    format = models.CharField("Формат", max_length=10)
+    fields = models.JSONField("Колонки", default=list)
+    query = models.BinaryField("Запрос", editable=False)
+    # Путь в закрытом хранилище settings.EXPORT["ROOT"], не в MEDIA
+    file = models.CharField("Файл", max_length=255, blank=True, editable=False)
+    status = models.CharField("Статус", max_length=20, choices=Status.choices, default=Status.PENDING, editable=False)
+    rows = models.PositiveIntegerField("Строк", default=0, editable=False)
+    error = models.TextField("Ошибка", blank=True, editable=False)
+
+    created_at = models.DateTimeField("Создана", auto_now_add=True)
+    finished_at = models.DateTimeField("Завершена", null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = "Выгрузка"
+        verbose_name_plural = "Выгрузки"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.model} ({self.format.upper()}) — {self.created_at:%d.%m.%Y %H:%M}"
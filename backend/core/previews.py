@@ -0,0 +1,165 @@
+# core/previews.py
+"""
+Превью картинок в админке: маленькие производные вместо оригиналов.
+
+Оригинал (загрузка до 15 МБ или внешняя ссылка) в <img> списка админки —
+это сотня полноразмерных картинок на страницу. Здесь картинка заменяется
+миниатюрой easy_thumbnails по алиасу из THUMBNAIL_ALIASES ("admin_list",
+"admin_preview"): миниатюра создаётся один раз, её URL кешируется,
+<img> грузится лениво (loading="lazy").
+
+Внешние ссылки скачиваются задачей core.tasks.make_remote_thumbnail;
+пока миниатюры нет, показывается заглушка со ссылкой на оригинал.
+
+Использование — колонка списка, readonly-поле или инлайн:
+
+    class NewsPostAdmin(admin.ModelAdmin):
+        image_preview = ImagePreview("featured_image", "featured_image_url")
+        list_display = ["title", "image_preview"]
+"""
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.utils.html import format_html
+
+from .caching import acquire, get_or_build, peek, store
+
+logger = logging.getLogger(__name__)
+
+# Сколько хранить URL готовой миниатюры
+URL_TTL = 30 * 24 * 3600
+
+# Пока задача качает внешнюю картинку, повторно её не ставим
+PENDING_TTL = 10 * 60
+
+# Внешняя картинка: сколько ждать и сколько качать (как загрузка в админке)
+DOWNLOAD_TIMEOUT = 15
+MAX_IMAGE_SIZE = 15 * 1024 * 1024
+
+# Размер <img> и object-fit для алиасов из THUMBNAIL_ALIASES
+SIZES = {
+    "admin_list": (80, 60, "cover"),
+    "admin_preview": (320, 240, "contain"),
+}
+
+
+def _key(alias, source):
+    return f"admin-thumb:{alias}:{hashlib.md5(source.encode()).hexdigest()}"
+
+
+def _make_local(field_file, alias):
+    from easy_thumbnails.files import get_thumbnailer
+
+    try:
+        return get_thumbnailer(field_file)[alias].url
+    except Exception as e:
+        # Битый или пропавший файл не пытаемся открывать на каждом показе списка
+        logger.warning(f"Thumbnail {alias} for {field_file.name} failed: {e}")
+        return ""
+
+
+def local_thumbnail(field_file, alias):
+    """URL миниатюры загруженного файла; создаётся при первом обращении."""
+    url = get_or_build(
+        _key(alias, field_file.name), _make_local, lambda url: URL_TTL if url else PENDING_TTL,
+        args=(field_file, alias),
+    )
+    return url or None
+
+
+def remote_thumbnail(url, alias):
+    """URL миниатюры внешней картинки или None, пока задача её не сделала."""
+    key = _key(alias, url)
+    thumbnail = peek(key)
+    if thumbnail is None and acquire(f"{key}:pending", PENDING_TTL):
+        from .tasks import dispatch, make_remote_thumbnail
+
+        # Без брокера — заглушка; метка pending остаётся, и следующая попытка
+        # будет через PENDING_TTL, а не на каждой строке каждого списка
+        dispatch(make_remote_thumbnail, url, alias)
+    return thumbnail
+
+
+def download_image(url):
+    """
+    Скачать внешнюю картинку потоком, не больше MAX_IMAGE_SIZE.
+
+    Returns:
+        tuple: (bytes, Content-Type).
+
+    Raises:
+        requests.RequestException: сеть или HTTP-ошибка.
+        ValueError: ответ не картинка или больше MAX_IMAGE_SIZE.
+    """
+    import requests
+
+    with requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.startswith("image/"):
+            raise ValueError(f"не картинка ({content_type or 'без Content-Type'})")
+        data = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            data.extend(chunk)
+            if len(data) > MAX_IMAGE_SIZE:
+                raise ValueError("файл больше 15 МБ")
+    return bytes(data), content_type
+
+
+def build_remote_thumbnail(url, alias, data):
+    """Сохранить миниатюру скачанной картинки data (bytes) и запомнить её URL."""
+    from easy_thumbnails.files import get_thumbnailer
+
+    name = f"remote/{hashlib.md5(url.encode()).hexdigest()}.jpg"
+    thumbnail = get_thumbnailer(ContentFile(data), relative_name=name)[alias].url
+    store(_key(alias, url), thumbnail, URL_TTL)
+    cache.delete(f"{_key(alias, url)}:pending")
+    return thumbnail
+
+
+def preview_html(source, alias="admin_list"):
+    """<img> миниатюры для FieldFile или внешнего URL; "—", если картинки нет."""
+    width, height, fit = SIZES[alias]
+    if not source:
+        return "—"
+    if isinstance(source, str):
+        url = remote_thumbnail(source, alias)
+        if url is None:
+            return format_html(
+                '<a href="{}" target="_blank" rel="noopener" title="Миниатюра готовится" '
+                'style="display:inline-block;width:{}px;height:{}px;background:#eee;border-radius:4px;"></a>',
+                source, width, height,
+            )
+    else:
+        url = local_thumbnail(source, alias)
+        if url is None:
+            return "—"
+    return format_html(
+        '<img src="{}" width="{}" height="{}" loading="lazy" decoding="async" alt="" '
+        'style="object-fit: {}; border-radius: 4px;"/>',
+        url, width, height, fit,
+    )
+
+
+class ImagePreview:
+    """
+    Колонка/readonly-поле админки с превью первой заполненной картинки.
+
+    sources — имена атрибутов (ImageField, URLField, свойство) или
+    функции obj -> FieldFile | str. Экземпляр, а не функция: атрибутом
+    класса ModelAdmin он не превращается в метод.
+    """
+
+    def __init__(self, *sources, alias="admin_list", description="Превью"):
+        self.sources = sources
+        self.alias = alias
+        self.short_description = description
+
+    def __call__(self, obj):
+        for source in self.sources:
+            value = source(obj) if callable(source) else getattr(obj, source, None)
+            if value:
+                return preview_html(value, self.alias)
+        return "—"
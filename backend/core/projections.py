@@ -0,0 +1,90 @@
+# core/projections.py
+"""
+Карточные проекции моделей для списков и виджетов.
+
+Модель объявляет, какие колонки нужны карточке:
+
+    class Property(CardProjectionMixin, models.Model):
+        CARD_FIELDS = ("name", "slug", "developer", "price_from", ...)
+        CARD_RELATED = {"developer": ("name", "slug")}
+
+        objects = CardQuerySet.as_manager()
+
+а списки берут строки через Property.objects.cards(): в SELECT попадают
+только эти колонки (плюс колонки связанных моделей из CARD_RELATED
+через select_related), без тяжёлых HTML-полей description/content.
+
+Если шаблон карточки обратится к неподгруженному полю, Django молча
+сделает по запросу на каждую строку. Такие обращения пишутся в лог,
+а с settings.CARD_PROJECTION_STRICT (для разработки) бросается
+DeferredFieldAccessError, чтобы их нельзя было не заметить.
+"""
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldError
+from django.db import models
+
+from .translation import TranslatedModelIterable, TranslatedQuerySetMixin
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredFieldAccessError(FieldError):
+    """
+    Обращение к полю, не входящему в карточную проекцию.
+
+    Наследуется от FieldError, а не AttributeError: AttributeError
+    шаблонизатор проглатывает и выводит пустую строку.
+    """
+
+
+class CardModelIterable(TranslatedModelIterable):
+    """ModelIterable, помечающий объекты (и связанные из CARD_RELATED) как карточки."""
+
+    def __iter__(self):
+        related = tuple(getattr(self.queryset.model, "CARD_RELATED", {}))
+        for obj in super().__iter__():
+            obj._card_projection = True
+            for name in related:
+                rel_obj = obj._state.fields_cache.get(name)
+                if rel_obj is not None:
+                    rel_obj._card_projection = True
+            yield obj
+
+
+class CardQuerySet(TranslatedQuerySetMixin, models.QuerySet):
+    def cards(self):
+        """
+        Только колонки карточки (CARD_FIELDS) и связанные объекты из CARD_RELATED;
+        переводимые поля карточки — на активном языке (core/translation.py).
+        """
+        model = self.model
+        related = getattr(model, "CARD_RELATED", {})
+        fields = list(model.CARD_FIELDS)
+        for name, rel_fields in related.items():
+            fields.extend(f"{name}__{field}" for field in rel_fields)
+
+        queryset = self
+        if related:
+            queryset = queryset.select_related(*related)
+        queryset = queryset.only(*fields)
+        translated = [field for field in getattr(model, "TRANSLATED_FIELDS", ()) if field in model.CARD_FIELDS]
+        queryset = queryset.translated(fields=translated)
+        queryset._iterable_class = CardModelIterable
+        return queryset
+
+
+class CardProjectionMixin:
+    """Ловит ленивую догрузку полей у объектов, полученных через cards()."""
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        if fields and getattr(self, "_card_projection", False):
+            message = (
+                f"{type(self).__name__}.{', '.join(fields)} не входит в CARD_FIELDS: "
+                f"добавьте поле в проекцию или не используйте его в карточке"
+            )
+            if getattr(settings, "CARD_PROJECTION_STRICT", False):
+                raise DeferredFieldAccessError(message)
+            logger.warning(message)
+        return super().refresh_from_db(using=using, fields=fields, **kwargs)
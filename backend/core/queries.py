@@ -0,0 +1,50 @@
+# core/queries.py
+"""
+Общие хелперы для запросов к каталогу.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def top_n_per_group(queryset, group_by, n, order_by, fields=None):
+    """
+    Первые n строк в каждой группе одним запросом (ROW_NUMBER() OVER PARTITION BY).
+
+    Вместо выборки всей таблицы и нарезки в Python база возвращает
+    только нужные строки: объём памяти и время не растут вместе
+    с каталогом, пока n фиксировано.
+
+    Args:
+        queryset: исходный QuerySet (фильтры вроде is_active уже применены)
+        group_by: поле группировки, например "category" или "location"
+        n: сколько строк оставить в каждой группе
+        order_by: порядок внутри группы, например ["category_rank"] или ["-rating", "name"]
+        fields: если задано — загружаются только эти колонки (.only())
+
+    Примеры:
+        top_n_per_group(Developer.objects.filter(is_active=True), "category", 10, ["category_rank"])
+        top_n_per_group(Property.objects.filter(is_active=True), "location", 4, ["-is_featured", "-created_at"])
+        top_n_per_group(Agency.objects.filter(is_active=True), "is_verified", 5, ["-rating", "name"])
+
+    Подходит и для Prefetch(): related-фильтр добавится к внутреннему запросу.
+    """
+    if isinstance(order_by, str):
+        order_by = [order_by]
+    group_field = queryset.model._meta.get_field(group_by)
+    queryset = queryset.annotate(
+        group_row_number=Window(
+            expression=RowNumber(),
+            partition_by=[F(group_field.attname)],
+            order_by=[_order_expression(name) for name in order_by],
+        )
+    ).filter(group_row_number__lte=n)
+    if fields:
+        # Поле группировки нужно для раскладки по группам (в т.ч. в Prefetch)
+        queryset = queryset.only(*fields, group_field.name)
+    return queryset.order_by(group_field.attname, *order_by)
+
+
+def _order_expression(name):
+    if name.startswith("-"):
+        return F(name[1:]).desc(nulls_last=True)
+    return F(name).asc(nulls_last=True)
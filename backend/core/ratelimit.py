@@ -0,0 +1,225 @@
+# core/ratelimit.py
+"""
+Ограничение частоты запросов к формам: заявка, вход, регистрация, сброс пароля.
+
+Правило из settings.RATELIMIT["RULES"] — это ведро токенов: rate "5/10m"
+значит ёмкость 5 запросов, которые восстанавливаются равномерно за 10 минут.
+Каждый запрос тратит токен из вёдер всех ключей правила ("ip" — адрес
+клиента, "post:<поле>" — значение поля формы, например email при входе).
+Пустое ведро — ответ 429 с Retry-After, до вьюхи, ORM и отправки писем.
+
+Вёдра лежат в Redis (REDIS_URL) и обновляются одним Lua-скриптом, так что
+лимит общий для всех воркеров gunicorn. Без Redis или при его ошибке
+используются вёдра в памяти процесса: лимит становится на процесс, но
+не отключается.
+
+Подключение — декоратором к своей вьюхе:
+
+    @ratelimit("contact")
+    def contact_request(request): ...
+
+или через RateLimitMiddleware по имени маршрута (RATELIMIT["ROUTES"]) —
+для вьюх allauth, которые не наши.
+"""
+import functools
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:"
+# После ошибки Redis столько секунд работаем на вёдрах в памяти, не дёргая его
+REDIS_RETRY = 30
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+# Вызов: KEYS[1] — ведро, ARGV — ёмкость, токенов в секунду, текущее время.
+# Ответ: {1|0, секунд до следующего токена}.
+_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_rate(rate):
+    """"5/10m" → (ёмкость 5, токенов в секунду 5/600)."""
+    match = _RATE_RE.match(rate.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Некорректный лимит {rate!r}, нужно вида 5/m или 5/10m")
+    count, multiplier, unit = match.groups()
+    period = int(multiplier or 1) * _PERIODS[unit]
+    return int(count), int(count) / period
+
+
+# --- Хранилища вёдер ---
+
+class LocalBuckets:
+    """Вёдра в памяти процесса; старые вытесняются после MAX_KEYS."""
+    MAX_KEYS = 10_000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.MAX_KEYS:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class RedisBuckets:
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self.script = self.client.register_script(_BUCKET_SCRIPT)
+
+    def take(self, key, capacity, rate):
+        allowed, wait = self.script(keys=[key], args=[capacity, rate, time.time()])
+        return bool(allowed), float(wait)
+
+
+_local = LocalBuckets()
+_redis = None
+_redis_down_until = 0.0
+
+
+def take(key, capacity, rate):
+    """Взять токен из ведра key: (разрешено, секунд до следующего токена)."""
+    global _redis, _redis_down_until
+
+    url = settings.RATELIMIT.get("REDIS_URL")
+    if url and time.monotonic() >= _redis_down_until:
+        try:
+            if _redis is None:
+                _redis = RedisBuckets(url)
+            return _redis.take(key, capacity, rate)
+        except Exception as e:
+            logger.warning(f"Rate limit Redis unavailable, using local buckets: {e}")
+            _redis_down_until = time.monotonic() + REDIS_RETRY
+    return _local.take(key, capacity, rate)
+
+
+# --- Ключи клиента ---
+
+def client_ip(request):
+    """
+    Адрес клиента. За PROXY_COUNT прокси он стоит в X-Forwarded-For на этом
+    месте с конца — левее может быть что угодно, присланное самим клиентом.
+    """
+    proxies = settings.RATELIMIT.get("PROXY_COUNT", 0)
+    forwarded = [ip.strip() for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def client_keys(request, keys):
+    """Значения ключей правила; пустые (нет поля в форме) пропускаются."""
+    values = []
+    for key in keys:
+        if key == "ip":
+            value = client_ip(request)
+        elif key.startswith("post:"):
+            value = request.POST.get(key[5:], "").strip().lower()
+        else:
+            raise ValueError(f"Неизвестный ключ лимита {key!r}")
+        if value:
+            values.append(f"{key}:{hashlib.md5(value.encode()).hexdigest()}")
+    return values
+
+
+# --- Проверка ---
+
+def check(request, rule_name):
+    """
+    Потратить токены запроса по правилу rule_name.
+
+    Returns:
+        float | None: секунд до повтора, если лимит исчерпан, иначе None.
+    """
+    config = settings.RATELIMIT
+    rule = config["RULES"][rule_name]
+    if not config.get("ENABLED", True) or request.method not in rule.get("methods", ("POST",)):
+        return None
+    capacity, rate = parse_rate(rule["rate"])
+    retry_after = None
+    for value in client_keys(request, rule.get("keys", ("ip",))):
+        allowed, wait = take(f"{KEY_PREFIX}{rule_name}:{value}", capacity, rate)
+        if not allowed:
+            retry_after = max(retry_after or 0, wait)
+    if retry_after is not None:
+        logger.warning(f"Rate limit {rule_name} exceeded by {client_ip(request)}")
+    return retry_after
+
+
+def limited_response(retry_after):
+    response = HttpResponse(
+        "Слишком много запросов. Попробуйте позже.", status=429, content_type="text/plain; charset=utf-8"
+    )
+    response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def ratelimit(rule_name):
+    """Декоратор вьюхи: 429 вместо вызова, если лимит rule_name исчерпан."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            retry_after = check(request, rule_name)
+            if retry_after is not None:
+                return limited_response(retry_after)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RateLimitMiddleware:
+    """Лимиты для маршрутов из RATELIMIT["ROUTES"] (имя маршрута → правило)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        rule_name = settings.RATELIMIT.get("ROUTES", {}).get(match.url_name if match else None)
+        if rule_name is None:
+            return None
+        retry_after = check(request, rule_name)
+        return limited_response(retry_after) if retry_after is not None else None
@@ -0,0 +1,106 @@
+# core/reference.py
+"""
+Справочники, которые читаются почти на каждом запросе: настройки сайта,
+категории застройщиков, блога и новостей, типы недвижимости, локации, FAQ.
+
+Хранятся в двухуровневом кэше (core/tiered.py): обычно это чтение из
+памяти процесса без запроса к базе и к Redis. Сохранение и удаление
+записей сбрасывает ключ во всех процессах (сигналы в core/signals.py,
+счётчики локаций — properties/locations.py).
+
+Возвращаются общие для всех запросов объекты — только для чтения.
+"""
+from .tiered import tiered_cache
+
+
+def _site_settings():
+    from .models import SiteSettings
+
+    return SiteSettings.get()
+
+
+def _faqs():
+    from .models import FAQ
+
+    return list(FAQ.objects.filter(is_active=True))
+
+
+def _developer_categories():
+    from developers.models import DeveloperCategory
+
+    return list(DeveloperCategory.objects.all())
+
+
+def _property_types():
+    from properties.models import PropertyType
+
+    return list(PropertyType.objects.all())
+
+
+def _locations():
+    from properties.models import Location
+
+    # Дерево для фильтра: узлы в порядке обхода (отступ по level)
+    return list(Location.objects.only(
+        "name", "slug", "kind", "properties_count", "tree_id", "lft", "rght", "level", "parent"
+    ))
+
+
+def _blog_categories():
+    from blog.models import BlogCategory
+
+    return list(BlogCategory.objects.all())
+
+
+def _news_categories():
+    from news.models import NewsCategory
+
+    return list(NewsCategory.objects.all())
+
+
+# ключ → (функция построения, модели, изменение которых сбрасывает ключ)
+SOURCES = {
+    "site-settings": (_site_settings, ("core.SiteSettings",)),
+    "faqs": (_faqs, ("core.FAQ",)),
+    "developer-categories": (_developer_categories, ("developers.DeveloperCategory",)),
+    "property-types": (_property_types, ("properties.PropertyType",)),
+    "locations": (_locations, ("properties.Location",)),
+    "blog-categories": (_blog_categories, ("blog.BlogCategory",)),
+    "news-categories": (_news_categories, ("news.NewsCategory",)),
+}
+
+
+def get(name):
+    return tiered_cache.get(name, SOURCES[name][0])
+
+
+def invalidate(*names):
+    tiered_cache.invalidate(*names)
+
+
+def site_settings():
+    return get("site-settings")
+
+
+def faqs():
+    return get("faqs")
+
+
+def developer_categories():
+    return get("developer-categories")
+
+
+def property_types():
+    return get("property-types")
+
+
+def locations():
+    return get("locations")
+
+
+def blog_categories():
+    return get("blog-categories")
+
+
+def news_categories():
+    return get("news-categories")
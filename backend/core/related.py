@@ -0,0 +1,353 @@
+# core/related.py
+"""
+Похожие публикации (блог, новости) по TF-IDF.
+
+Текст публикации — заголовок (вес 2), краткое описание и теги (вес 3,
+тег целиком — один термин). Слова приводятся к нижнему регистру
+и обрезаются до STEM_LENGTH символов: грубая, но дешёвая замена
+стеммингу для русских окончаний («застройщик», «застройщики»,
+«застройщиков» → «застро»).
+
+Векторы строятся разреженной матрицей SciPy (CSR): tf = 1 + log(count),
+idf = log((1 + N) / (1 + df)) + 1, строки нормированы — скалярное
+произведение равно косинусной близости. Top-k считается кусками
+по CHUNK_SIZE строк и хранится в модели связей приложения
+(blog.RelatedBlogPost, news.RelatedNewsPost): страница статьи читает
+k публикаций по первичным ключам.
+
+Приложение регистрирует индекс в related.py:
+
+    index = register(RelatedIndex(
+        BlogPost, RelatedBlogPost,
+        text_fields=("excerpt",), tag_fields=("category__name",),
+    ))
+
+После этого изменения публикаций (публикация, правка текста, снятие,
+удаление) попадают в очередь в кэше, и через DEBOUNCE секунд задача
+core.tasks.refresh_related_posts пересчитывает всё накопленное одной
+загрузкой корпуса (TF-IDF зависит от всех документов, так что корпус
+грузится целиком). Ночная core.tasks.rebuild_related_posts
+пересчитывает всё заново.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from scipy import sparse
+
+from .caching import acquire, release
+
+K = 6
+CHUNK_SIZE = 256
+STEM_LENGTH = 6
+TITLE_WEIGHT = 2
+TAG_WEIGHT = 3
+DEBOUNCE = 60                  # Секунд копить правки перед пересчётом
+QUEUE_TIMEOUT = 24 * 60 * 60   # Сколько событие ждёт в очереди
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+
+STOP_WORDS = frozenset("""
+    как так что это для при или его она они оно был была были быть будет
+    также только уже еще ещё над под без про все всё чем где когда если
+    который которая которые которых этот эта эти того тем том более
+    and the for with from that this are was were will have has you your
+""".split())
+
+# Зарегистрированные индексы: "app_label.model" → RelatedIndex
+INDEXES = {}
+
+
+def tokenize(text):
+    return [
+        word[:STEM_LENGTH]
+        for word in TOKEN_RE.findall(text.lower())
+        if word not in STOP_WORDS
+    ]
+
+
+def split_tags(value):
+    return [tag.strip().lower() for tag in (value or "").split(",") if tag.strip()]
+
+
+@dataclass
+class Corpus:
+    ids: np.ndarray          # pk публикаций, по возрастанию
+    matrix: sparse.csr_matrix
+
+    def position(self, pk):
+        pos = int(np.searchsorted(self.ids, pk))
+        if pos < len(self.ids) and self.ids[pos] == pk:
+            return pos
+        return None
+
+
+def tfidf_matrix(documents):
+    """Список документов (списков терминов) → нормированная CSR-матрица TF-IDF."""
+    vocabulary = {}
+    indptr, indices, data = [0], [], []
+    for terms in documents:
+        for term, count in Counter(terms).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(1.0 + np.log(count))
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1.0 + matrix.shape[0]) / (1.0 + df)) + 1.0
+    matrix.data *= idf[matrix.indices].astype(np.float32)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+
+class RelatedIndex:
+    """Индекс похожих публикаций одной модели."""
+
+    def __init__(self, model, link_model, title_field="title", text_fields=("excerpt",),
+                 tag_fields=(), published=None, k=K):
+        self.model = model
+        self.link_model = link_model
+        self.title_field = title_field
+        self.text_fields = tuple(text_fields)
+        self.tag_fields = tuple(tag_fields)
+        self.published = published or {"status": "published"}
+        self.k = k
+
+    @property
+    def label(self):
+        return self.model._meta.label_lower
+
+    @property
+    def trigger_fields(self):
+        """Поля, при изменении которых нужен пересчёт."""
+        fields = [*self.published, self.title_field, *self.text_fields]
+        for name in self.tag_fields:
+            # category__name → category_id: переименование категории подхватит ночной пересчёт
+            fields.append(name.split("__")[0] + "_id" if "__" in name else name)
+        return tuple(fields)
+
+    # --- Чтение ---
+
+    def related(self, post, limit=3):
+        """Похожие публикации: чтение связей по индексу (post, rank)."""
+        return (
+            self.model.objects.cards()
+            .filter(related_of__post=post, **self.published)
+            .order_by("related_of__rank")[:limit]
+        )
+
+    # --- Расчёт ---
+
+    def document(self, row):
+        title, *rest = row
+        texts, tags = rest[:len(self.text_fields)], rest[len(self.text_fields):]
+        terms = tokenize(title or "") * TITLE_WEIGHT
+        for text in texts:
+            terms.extend(tokenize(text or ""))
+        for value in tags:
+            terms.extend([f"#{tag}" for tag in split_tags(value)] * TAG_WEIGHT)
+        return terms
+
+    def load(self):
+        """Один SELECT по заголовкам/описаниям/тегам опубликованного → Corpus."""
+        fields = (self.title_field, *self.text_fields, *self.tag_fields)
+        rows = list(
+            self.model.objects.filter(**self.published).order_by("pk")
+            .values_list("pk", *fields).iterator(chunk_size=10_000)
+        )
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        return Corpus(ids=ids, matrix=tfidf_matrix([self.document(row[1:]) for row in rows]))
+
+    def nearest(self, corpus, positions):
+        """
+        Top-k по косинусной близости для строк positions.
+
+        Returns:
+            list[(post_id, related_id, rank, score)]
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        k = min(self.k, len(corpus.ids) - 1)
+        links = []
+        if k <= 0:
+            return links
+        transposed = corpus.matrix.T.tocsc()
+        for start in range(0, len(positions), CHUNK_SIZE):
+            query = positions[start:start + CHUNK_SIZE]
+            scores = (corpus.matrix[query] @ transposed).toarray()
+            scores[np.arange(len(query)), query] = 0.0
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row, pos in enumerate(query):
+                post_id = int(corpus.ids[pos])
+                rank = 0
+                for col, score in zip(top[row], top_scores[row]):
+                    if score <= 0:
+                        break
+                    rank += 1
+                    links.append((post_id, int(corpus.ids[col]), rank, float(score)))
+        return links
+
+    def write(self, links, post_ids=None, batch_size=5000):
+        """Заменить связи: все (post_ids=None) или только указанных публикаций."""
+        objs = (
+            self.link_model(post_id=p, related_id=r, rank=rank, score=score)
+            for p, r, rank, score in links
+        )
+        with transaction.atomic():
+            if post_ids is None:
+                self.link_model.objects.all().delete()
+            else:
+                self.link_model.objects.filter(post_id__in=post_ids).delete()
+            self.link_model.objects.bulk_create(objs, batch_size=batch_size)
+
+    def rebuild_all(self):
+        """Полный пересчёт. Returns: число сохранённых связей."""
+        corpus = self.load()
+        links = self.nearest(corpus, np.arange(len(corpus.ids)))
+        self.write(links)
+        return len(links)
+
+    def refresh_for(self, post_ids, affected_ids=()):
+        """
+        Инкрементальный пересчёт после публикации/правки/снятия записей.
+
+        Пересчитываются их собственные списки, списки, где они уже есть,
+        и списки, в которые они теперь проходят (близость выше k-й).
+        Корпус загружается один раз на все записи. Idf остальных
+        документов при этом слегка сдвигается — это выравнивает ночной
+        rebuild_all.
+
+        Returns:
+            int: число пересчитанных публикаций.
+        """
+        corpus = self.load()
+        post_ids = set(post_ids)
+        affected = set(affected_ids) | post_ids
+        affected.update(
+            self.link_model.objects.filter(related_id__in=post_ids).values_list("post_id", flat=True)
+        )
+
+        changed = [p for p in (corpus.position(i) for i in post_ids) if p is not None]
+        if changed:
+            scores = (corpus.matrix @ corpus.matrix[changed].T).toarray()
+            scores[changed, np.arange(len(changed))] = 0.0
+            # Порог — близость k-го соседа; у кого соседей меньше k, порог 0
+            threshold = np.zeros(len(corpus.ids), dtype=np.float32)
+            kth = list(self.link_model.objects.filter(rank=self.k).values_list("post_id", "score"))
+            if kth:
+                known = np.array([row[0] for row in kth], dtype=np.int64)
+                slots = np.searchsorted(corpus.ids, known).clip(max=len(corpus.ids) - 1)
+                hit = corpus.ids[slots] == known
+                threshold[slots[hit]] = np.array([row[1] for row in kth], dtype=np.float32)[hit]
+            passes = ((scores > threshold[:, None]) & (scores > 0)).any(axis=1)
+            affected.update(int(i) for i in corpus.ids[passes])
+
+        positions = [p for p in (corpus.position(i) for i in affected) if p is not None]
+        self.write(self.nearest(corpus, positions) if positions else [], post_ids=affected)
+        return len(affected)
+
+    # --- Сигналы ---
+
+    def connect(self):
+        uid = f"related-posts-{self.label}"
+        pre_save.connect(self._remember, sender=self.model, dispatch_uid=f"{uid}-pre-save")
+        post_save.connect(self._schedule, sender=self.model, dispatch_uid=f"{uid}-post-save")
+        pre_delete.connect(self._remember_related_of, sender=self.model, dispatch_uid=f"{uid}-pre-delete")
+        post_delete.connect(self._schedule_on_delete, sender=self.model, dispatch_uid=f"{uid}-post-delete")
+
+    def _values(self, instance):
+        return tuple(getattr(instance, field) for field in self.trigger_fields)
+
+    def _is_published(self, instance):
+        return all(getattr(instance, field) == value for field, value in self.published.items())
+
+    def _remember(self, sender, instance, raw=False, **kwargs):
+        instance._related_before = None
+        if not raw and instance.pk:
+            instance._related_before = (
+                self.model.objects.filter(pk=instance.pk).values_list(*self.trigger_fields).first()
+            )
+
+    def _schedule(self, sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        before = getattr(instance, "_related_before", None)
+        if before == self._values(instance):
+            return
+        if before is None and not self._is_published(instance):
+            return  # новый черновик
+        self._delay(instance.pk)
+
+    def _remember_related_of(self, sender, instance, **kwargs):
+        """Чьи списки ссылались на запись — их строки удалятся каскадом."""
+        instance._related_of = list(
+            self.link_model.objects.filter(related_id=instance.pk).values_list("post_id", flat=True)
+        )
+
+    def _schedule_on_delete(self, sender, instance, **kwargs):
+        affected = getattr(instance, "_related_of", [])
+        if affected:
+            self._delay(instance.pk, affected)
+
+    # --- Очередь изменений ---
+
+    def _queue_key(self, name):
+        return f"related-posts:{self.label}:{name}"
+
+    def _delay(self, pk, affected_ids=()):
+        affected_ids = list(affected_ids)
+        transaction.on_commit(lambda: self.enqueue(pk, affected_ids))
+
+    def enqueue(self, pk, affected_ids=()):
+        """
+        Записать изменение в очередь и поставить пересчёт через DEBOUNCE секунд,
+        если он ещё не стоит: правки подряд пересчитываются одной загрузкой корпуса.
+        """
+        from .tasks import dispatch, refresh_related_posts
+
+        sequence = self._queue_key("seq")
+        cache.add(sequence, 0, None)
+        number = cache.incr(sequence)
+        cache.set(self._queue_key(number), (pk, list(affected_ids)), QUEUE_TIMEOUT)
+        token = acquire(self._queue_key("scheduled"), DEBOUNCE)
+        if token and not dispatch(refresh_related_posts, self.label, countdown=DEBOUNCE):
+            # Событие остаётся в очереди: его заберёт следующий пересчёт
+            release(self._queue_key("scheduled"), token)
+
+    def refresh_pending(self):
+        """
+        Пересчитать всё, что накопилось в очереди.
+
+        Returns:
+            int: число пересчитанных публикаций.
+        """
+        done = cache.get(self._queue_key("done"), 0)
+        last = cache.get(self._queue_key("seq"), 0)
+        if last <= done:
+            return 0
+        events = cache.get_many([self._queue_key(number) for number in range(done + 1, last + 1)])
+        cache.set(self._queue_key("done"), last, None)
+        post_ids, affected = set(), set()
+        for pk, affected_ids in events.values():
+            post_ids.add(pk)
+            affected.update(affected_ids)
+        return self.refresh_for(post_ids, affected) if post_ids else 0
+
+
+def register(index):
+    """Зарегистрировать индекс и подключить сигналы модели."""
+    INDEXES[index.label] = index
+    index.connect()
+    return index
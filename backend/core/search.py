@@ -0,0 +1,62 @@
+# core/search.py
+"""
+Полнотекстовый поиск по текстовым полям модели (админка, core/fastadmin.py).
+
+Поля задаются на модели в SEARCH_FIELDS. На PostgreSQL поиск идёт
+по to_tsvector(...) @@ websearch_to_tsquery(...), и это выражение
+покрыто GIN-индексом по тому же to_tsvector — поиск по HTML статей
+не читает таблицу целиком. Индекс создаётся миграцией search_index_operation
+только на PostgreSQL: в SQLite (локальная разработка) нет ни to_tsvector,
+ни GIN, там админка ищет обычным icontains.
+
+Конфигурация "simple" — без стемминга: тексты на русском и английском
+вперемешку, а в индексе и в запросе она должна совпадать.
+"""
+from django.db import connections, migrations
+
+CONFIG = "simple"
+
+# Имя аннотации с вектором в queryset
+ANNOTATION = "search_document"
+
+
+def is_supported(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def vector(fields):
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(*fields, config=CONFIG)
+
+
+def query(term):
+    from django.contrib.postgres.search import SearchQuery
+
+    return SearchQuery(term, config=CONFIG, search_type="websearch")
+
+
+def search_index(name, fields):
+    from django.contrib.postgres.indexes import GinIndex
+
+    return GinIndex(vector(fields), name=name)
+
+
+def search_index_operation(app_label, model_name, name, fields):
+    """
+    Операция миграции: GIN-индекс по to_tsvector(fields) на PostgreSQL,
+    на остальных СУБД — ничего.
+
+    Индекс не объявляется в Meta.indexes: иначе миграция
+    с GinIndex не применится к SQLite.
+    """
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(apps.get_model(app_label, model_name), search_index(name, fields))
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.remove_index(apps.get_model(app_label, model_name), search_index(name, fields))
+
+    return migrations.RunPython(forwards, backwards)
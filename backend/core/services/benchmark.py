@@ -0,0 +1,164 @@
+# core/services/benchmark.py
+"""
+Прогон запросов через WSGI-хендлер Django внутри процесса.
+
+Используется командами benchmark_views и replay_access_log:
+запрос проходит весь стек (middleware, URL-резолвер, view, шаблоны),
+но без сети и gunicorn, поэтому замеры показывают стоимость самого
+приложения — время ответа и число SQL-запросов.
+"""
+import io
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+
+@dataclass
+class Sample:
+    """Один замер: статус, время (мс) и число SQL-запросов."""
+    status: int
+    duration_ms: float
+    queries: int
+
+
+@dataclass
+class UrlStats:
+    """Накопленные замеры по одному URL или URL-шаблону."""
+    samples: list = field(default_factory=list)
+
+    def add(self, sample):
+        self.samples.append(sample)
+
+    def summary(self):
+        durations = sorted(s.duration_ms for s in self.samples)
+        queries = sorted(s.queries for s in self.samples)
+        statuses = {}
+        for s in self.samples:
+            statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+        return {
+            "count": len(durations),
+            "p50_ms": round(percentile(durations, 50), 2),
+            "p95_ms": round(percentile(durations, 95), 2),
+            "p99_ms": round(percentile(durations, 99), 2),
+            "max_ms": round(durations[-1], 2) if durations else 0.0,
+            "queries_p50": percentile(queries, 50),
+            "queries_max": queries[-1] if queries else 0,
+            "statuses": statuses,
+        }
+
+
+def percentile(sorted_values, pct):
+    """Перцентиль по методу nearest-rank для уже отсортированного списка."""
+    if not sorted_values:
+        return 0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def url_pattern(path):
+    """Имя маршрута (или шаблон) для группировки URL в отчёте."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return "<404>"
+    if match.view_name:
+        return match.view_name
+    return match.route or path
+
+
+class WSGIRunner:
+    """Выполняет запросы через WSGIHandler в текущем процессе."""
+
+    def __init__(self, host="localhost", language=None, headers=None):
+        self.handler = WSGIHandler()
+        self.host = host
+        self.language = language
+        self.headers = headers or {}
+
+    def build_environ(self, method, path, query_string="", body=b"", headers=None):
+        environ = {
+            "REQUEST_METHOD": method.upper(),
+            "PATH_INFO": path,
+            "QUERY_STRING": query_string,
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": self.host,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        if self.language:
+            environ["HTTP_ACCEPT_LANGUAGE"] = self.language
+        for name, value in {**self.headers, **(headers or {})}.items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        return environ
+
+    def request(self, method, path, query_string="", body=b"", headers=None):
+        """Выполнить запрос и вернуть Sample."""
+        environ = self.build_environ(method, path, query_string, body, headers)
+        status_holder = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            status_holder["status"] = int(status.split(" ", 1)[0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = self.handler(environ, start_response)
+            try:
+                for _chunk in response:
+                    pass
+            finally:
+                if hasattr(response, "close"):
+                    response.close()
+            duration = (time.perf_counter() - started) * 1000
+        return Sample(status_holder.get("status", 0), duration, len(ctx.captured_queries))
+
+    def get(self, url, headers=None):
+        path, _, query_string = url.partition("?")
+        return self.request("GET", path, query_string, headers=headers)
+
+
+def write_results(path, results, meta=None):
+    """Сохранить результаты прогона в JSON."""
+    payload = {"meta": meta or {}, "results": results}
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def compare_results(baseline_path, results):
+    """
+    Сравнить текущий прогон с базовым.
+
+    Returns:
+        dict: {url: {"p50_ms": (было, стало, %), ...}} для общих URL.
+    """
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh).get("results", {})
+
+    diff = {}
+    for url, current in results.items():
+        before = baseline.get(url)
+        if not before:
+            continue
+        row = {}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "queries_p50"):
+            old, new = before.get(key, 0), current.get(key, 0)
+            change = ((new - old) / old * 100) if old else 0.0
+            row[key] = (old, new, round(change, 1))
+        diff[url] = row
+    return diff
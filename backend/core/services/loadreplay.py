@@ -0,0 +1,178 @@
+# core/services/loadreplay.py
+"""
+Воспроизведение продакшн-трафика из access-лога gunicorn.
+
+Лог пишется форматом gunicorn по умолчанию (``--access-logfile -``):
+    %(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"
+
+Строки парсятся в поток запросов с относительным временем,
+который затем проигрывается либо внутри процесса через WSGIRunner,
+либо по HTTP против локального gunicorn — с заданной скоростью
+и параллельностью. Латентность группируется по URL-шаблону.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from .benchmark import Sample, UrlStats, WSGIRunner, url_pattern
+
+# Префикс docker compose ("backend-1  | ") и прочий мусор перед адресом допускаются
+ACCESS_LOG_RE = re.compile(
+    r'(?P<host>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<url>\S+) [^"]*" '
+    r'(?P<status>\d{3}) (?P<size>\S+)'
+    r'(?: "(?P<referer>[^"]*)" "(?P<agent>[^"]*)")?'
+)
+ACCESS_LOG_TIME_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
+
+DEFAULT_METHODS = ("GET", "HEAD")
+DEFAULT_EXCLUDE = ("/static/", "/media/", "/admin/", "/__reload__/", "/__debug__/")
+
+
+@dataclass
+class LogEntry:
+    """Одна строка access-лога."""
+    timestamp: datetime
+    method: str
+    url: str
+    status: int
+    user_agent: str = ""
+
+
+@dataclass
+class ReplayRequest:
+    """Запрос в потоке воспроизведения: смещение от начала (сек), метод, URL."""
+    offset: float
+    method: str
+    url: str
+
+
+def parse_access_log(lines):
+    """Генератор LogEntry; нераспознанные строки (логи приложения и т.п.) пропускаются."""
+    for line in lines:
+        match = ACCESS_LOG_RE.search(line)
+        if not match:
+            continue
+        try:
+            timestamp = datetime.strptime(match["time"], ACCESS_LOG_TIME_FORMAT)
+        except ValueError:
+            continue
+        yield LogEntry(
+            timestamp=timestamp,
+            method=match["method"],
+            url=match["url"],
+            status=int(match["status"]),
+            user_agent=match["agent"] or "",
+        )
+
+
+def build_stream(entries, methods=DEFAULT_METHODS, exclude=DEFAULT_EXCLUDE, limit=None):
+    """
+    Превратить записи лога в воспроизводимый поток.
+
+    Оставляет только безопасные методы (POST без тела и CSRF не повторить),
+    выкидывает статику/админку и пересчитывает время в смещения от первой записи.
+    """
+    stream = []
+    started = None
+    for entry in entries:
+        if entry.method not in methods:
+            continue
+        if entry.url.startswith(exclude):
+            continue
+        if started is None:
+            started = entry.timestamp
+        offset = max(0.0, (entry.timestamp - started).total_seconds())
+        stream.append(ReplayRequest(offset, entry.method, entry.url))
+        if limit and len(stream) >= limit:
+            break
+    stream.sort(key=lambda r: r.offset)
+    return stream
+
+
+class InProcessTarget:
+    """Выполняет запросы через WSGIHandler; у каждого потока свой runner."""
+
+    def __init__(self, host="localhost", language=None):
+        self.host = host
+        self.language = language
+        self._local = threading.local()
+
+    def __call__(self, request):
+        runner = getattr(self._local, "runner", None)
+        if runner is None:
+            runner = self._local.runner = WSGIRunner(host=self.host, language=self.language)
+        path, _, query_string = request.url.partition("?")
+        return runner.request(request.method, path, query_string)
+
+
+class HttpTarget:
+    """Выполняет запросы по HTTP (например, против локального gunicorn)."""
+
+    def __init__(self, base_url, timeout=30.0):
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.Client(timeout=timeout, follow_redirects=False)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        try:
+            response = self.client.request(request.method, self.base_url + request.url)
+            status = response.status_code
+        except Exception:
+            status = 0
+        duration = (time.perf_counter() - started) * 1000
+        # Число SQL-запросов снаружи процесса недоступно
+        return Sample(status, duration, 0)
+
+    def close(self):
+        self.client.close()
+
+
+class Replayer:
+    """
+    Проигрывает поток запросов с заданной скоростью и параллельностью.
+
+    speed=1 — реальный темп лога, speed=10 — в 10 раз быстрее,
+    speed=0 — без пауз, насколько позволяет concurrency.
+    """
+
+    def __init__(self, target, speed=1.0, concurrency=4):
+        self.target = target
+        self.speed = speed
+        self.concurrency = concurrency
+        self.stats = {}
+        self.lag_ms = UrlStats()
+        self._lock = threading.Lock()
+
+    def _run_one(self, request, scheduled_at):
+        lag = max(0.0, (time.perf_counter() - scheduled_at) * 1000)
+        sample = self.target(request)
+        pattern = url_pattern(request.url.partition("?")[0])
+        with self._lock:
+            self.stats.setdefault(pattern, UrlStats()).add(sample)
+            self.lag_ms.add(Sample(0, lag, 0))
+
+    def run(self, stream):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for request in stream:
+                scheduled_at = started + (request.offset / self.speed if self.speed else 0)
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._run_one, request, max(scheduled_at, started))
+        elapsed = time.perf_counter() - started
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": len(stream),
+            "rps": round(len(stream) / elapsed, 1) if elapsed else 0.0,
+            "lag": self.lag_ms.summary(),
+        }
+
+    def summary(self):
+        return {pattern: stats.summary() for pattern, stats in sorted(self.stats.items())}
@@ -0,0 +1,100 @@
+# core/signals.py
+"""
+Сброс кэша кластеров карты при смене координат или видимости точки и версии курсов валют;
+синхронизация данных нового видео с YouTube; новая версия блоков страниц и прогрев при смене контента;
+сброс справочников в двухуровневом кэше.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .currency import bump_version
+from .map import SOURCES, invalidate_tiles
+from . import reference
+from .models import ExchangeRate, Video
+from .warmup import CONTENT_MODELS, content_changed
+
+
+def _map_state(source, latitude, longitude, visible_value):
+    return (latitude, longitude, source.is_visible(visible_value))
+
+
+def _connect(point_type, source):
+    def remember_map_state(sender, instance, raw=False, **kwargs):
+        previous = None
+        if not raw and instance.pk:
+            previous = source.model.objects.filter(pk=instance.pk).values_list(
+                "latitude", "longitude", source.visible_field
+            ).first()
+        instance._map_before = _map_state(source, *previous) if previous else None
+
+    def invalidate_on_save(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        before = getattr(instance, "_map_before", None)
+        after = _map_state(
+            source, instance.latitude, instance.longitude, getattr(instance, source.visible_field)
+        )
+        if before == after:
+            return
+        positions = [after[:2]] + ([before[:2]] if before else [])
+        transaction.on_commit(lambda: invalidate_tiles(point_type, *positions))
+
+    def invalidate_on_delete(sender, instance, **kwargs):
+        position = (instance.latitude, instance.longitude)
+        transaction.on_commit(lambda: invalidate_tiles(point_type, position))
+
+    uid = f"map-clusters-{point_type}"
+    pre_save.connect(remember_map_state, sender=source.model, weak=False, dispatch_uid=f"{uid}-pre-save")
+    post_save.connect(invalidate_on_save, sender=source.model, weak=False, dispatch_uid=f"{uid}-post-save")
+    post_delete.connect(invalidate_on_delete, sender=source.model, weak=False, dispatch_uid=f"{uid}-post-delete")
+
+
+for _point_type, _source in SOURCES.items():
+    _connect(_point_type, _source)
+
+
+def invalidate_exchange_rates(sender, **kwargs):
+    transaction.on_commit(bump_version)
+
+
+post_save.connect(invalidate_exchange_rates, sender=ExchangeRate, dispatch_uid="exchange-rates-post-save")
+post_delete.connect(invalidate_exchange_rates, sender=ExchangeRate, dispatch_uid="exchange-rates-post-delete")
+
+
+def sync_new_video(sender, instance, raw=False, **kwargs):
+    if raw or instance.synced_at:
+        return
+    from .tasks import dispatch, sync_video_metadata
+
+    transaction.on_commit(lambda: dispatch(sync_video_metadata, [instance.pk]))
+
+
+post_save.connect(sync_new_video, sender=Video, dispatch_uid="video-sync-post-save")
+
+
+def invalidate_pages(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(content_changed)
+
+
+for _label in CONTENT_MODELS:
+    _model = apps.get_model(_label)
+    post_save.connect(invalidate_pages, sender=_model, dispatch_uid=f"pages-{_label}-post-save")
+    post_delete.connect(invalidate_pages, sender=_model, dispatch_uid=f"pages-{_label}-post-delete")
+
+
+def _connect_reference(name, label):
+    def invalidate_reference(sender, raw=False, **kwargs):
+        if not raw:
+            transaction.on_commit(lambda: reference.invalidate(name))
+
+    model = apps.get_model(label)
+    uid = f"reference-{name}-{label}"
+    post_save.connect(invalidate_reference, sender=model, weak=False, dispatch_uid=f"{uid}-post-save")
+    post_delete.connect(invalidate_reference, sender=model, weak=False, dispatch_uid=f"{uid}-post-delete")
+
+
+for _name, (_, _labels) in reference.SOURCES.items():
+    for _label in _labels:
+        _connect_reference(_name, _label)
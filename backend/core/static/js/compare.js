@@ -0,0 +1,176 @@
+/**
+ * Сравнение объектов: выбор хранится в localStorage, сервер только отдаёт данные.
+ *
+ * Разметка:
+ *   <button data-compare-toggle="42">Сравнить</button>   — добавить/убрать объект
+ *   <span data-compare-count></span>                      — число выбранных
+ *   <a data-compare-clear>Очистить</a>                    — убрать все
+ *   <div data-compare-table>…</div>                       — таблица сравнения
+ *                                                           (страница /properties/compare/)
+ *
+ * API:
+ *   Compare.ids(), Compare.toggle(id), Compare.remove(id), Compare.clear()
+ *   Compare.load(currency) → Promise с ответом /properties/compare/data/?ids=...
+ *
+ * При каждом изменении на document отправляется событие "compare:change".
+ */
+(function () {
+    "use strict";
+
+    const STORAGE_KEY = "balirate:compare";
+    const MAX_ITEMS = 6;
+    const ENDPOINT = "/properties/compare/data/";
+
+    const read = () => {
+        try {
+            const ids = JSON.parse(localStorage.getItem(STORAGE_KEY) || "[]");
+            return Array.isArray(ids) ? ids.filter(Number.isInteger).slice(0, MAX_ITEMS) : [];
+        } catch (e) {
+            return [];
+        }
+    };
+
+    const write = (ids) => {
+        localStorage.setItem(STORAGE_KEY, JSON.stringify(ids));
+        render();
+        document.dispatchEvent(new CustomEvent("compare:change", { detail: { ids: ids } }));
+    };
+
+    const Compare = {
+        MAX_ITEMS: MAX_ITEMS,
+
+        ids: read,
+
+        has(id) {
+            return read().includes(Number(id));
+        },
+
+        /* false — если список уже полон */
+        add(id) {
+            const ids = read();
+            id = Number(id);
+            if (ids.includes(id)) return true;
+            if (ids.length >= MAX_ITEMS) return false;
+            write([...ids, id]);
+            return true;
+        },
+
+        remove(id) {
+            write(read().filter((item) => item !== Number(id)));
+        },
+
+        toggle(id) {
+            return this.has(id) ? (this.remove(id), true) : this.add(id);
+        },
+
+        clear() {
+            write([]);
+        },
+
+        load(currency) {
+            const ids = read();
+            if (!ids.length) return Promise.resolve({ count: 0, items: [] });
+            const params = new URLSearchParams({ ids: ids.join(",") });
+            if (currency) params.set("currency", currency);
+            return fetch(`${ENDPOINT}?${params}`, { credentials: "same-origin" }).then((response) =>
+                response.ok ? response.json() : Promise.reject(response)
+            );
+        },
+    };
+
+    const render = () => {
+        const ids = read();
+        document.querySelectorAll("[data-compare-count]").forEach((el) => {
+            el.textContent = ids.length || "";
+        });
+        document.querySelectorAll("[data-compare-toggle]").forEach((el) => {
+            el.classList.toggle("active", ids.includes(Number(el.dataset.compareToggle)));
+        });
+    };
+
+    // --- Таблица сравнения ---
+
+    const escape = (value) =>
+        String(value).replace(/[&<>"']/g, (c) => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" })[c]);
+
+    const money = (value, currency) =>
+        value == null ? "—" : new Intl.NumberFormat(document.documentElement.lang || "ru", {
+            style: "currency", currency: currency, maximumFractionDigits: 0,
+        }).format(value);
+
+    const ROWS = [
+        ["Цена от", (item) => money(item.price, item.currency)],
+        ["Цена за м²", (item) => money(item.price_per_m2, item.currency)],
+        ["Площадь", (item) => (item.area ? `${escape(item.area)} м²` : "—")],
+        ["Комнат", (item) => escape(item.rooms ?? "—")],
+        ["Доходность", (item) => (item.roi_percent == null ? "—" : `${item.roi_percent}%`)],
+        ["Тип", (item) => escape(item.type ?? "—")],
+        ["Локация", (item) => escape(item.location ?? "—")],
+        ["Застройщик", (item) =>
+            `${escape(item.developer.name)}${item.developer.rating == null ? "" : ` · ${item.developer.rating}`}`],
+        ["Статус", (item) => escape(item.status || "—")],
+        ["Строительство", (item) => escape(item.construction_status_display || "—")],
+        ["Сдача", (item) => escape(item.completion_date ?? "—")],
+    ];
+
+    const head = (item) => {
+        const image = item.image || item.main_image;
+        return `<th>
+            ${image ? `<img loading="lazy" src="${escape(image)}" width="240" height="180" alt="${escape(item.name)}">` : ""}
+            <a href="${escape(item.url)}" class="link h6 d-block">${escape(item.name)}</a>
+            <a href="#" data-compare-toggle="${item.id}" class="text-caption-1 text_secondary-color">Убрать</a>
+        </th>`;
+    };
+
+    const renderTable = (table) => {
+        const empty = table.querySelector("[data-compare-empty]");
+        Compare.load()
+            .then((data) => {
+                table.querySelectorAll("table").forEach((el) => el.remove());
+                if (empty) empty.hidden = data.items.length > 0;
+                if (!data.items.length) return;
+                const rows = ROWS.map(([label, cell]) =>
+                    `<tr><th scope="row">${label}</th>${data.items.map((item) => `<td>${cell(item)}</td>`).join("")}</tr>`
+                ).join("");
+                table.insertAdjacentHTML("beforeend",
+                    `<table class="table"><thead><tr><th></th>${data.items.map(head).join("")}</tr></thead><tbody>${rows}</tbody></table>`
+                );
+                render();
+            })
+            .catch(() => {
+                if (empty) empty.hidden = false;
+            });
+    };
+
+    const renderTables = () => document.querySelectorAll("[data-compare-table]").forEach(renderTable);
+
+    document.addEventListener("click", (e) => {
+        if (e.target.closest("[data-compare-clear]")) {
+            e.preventDefault();
+            Compare.clear();
+            return;
+        }
+        const button = e.target.closest("[data-compare-toggle]");
+        if (!button) return;
+        e.preventDefault();
+        if (!Compare.toggle(button.dataset.compareToggle)) {
+            alert(`Сравнить можно не больше ${MAX_ITEMS} объектов`);
+        }
+    });
+
+    document.addEventListener("compare:change", renderTables);
+
+    // Выбор в другой вкладке
+    window.addEventListener("storage", (e) => {
+        if (e.key !== STORAGE_KEY) return;
+        render();
+        renderTables();
+    });
+
+    document.addEventListener("DOMContentLoaded", () => {
+        render();
+        renderTables();
+    });
+
+    window.Compare = Compare;
+})();
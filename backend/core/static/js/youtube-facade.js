@@ -0,0 +1,51 @@
+/**
+ * Фасад YouTube: вместо iframe на странице — превью и кнопка, плеер
+ * (около 1 МБ скриптов YouTube) загружается только по клику.
+ *
+ * Разметка:
+ *   <a href="https://www.youtube.com/watch?v=ID" data-youtube-id="ID">…</a>
+ *
+ * Без JS ссылка просто открывает ролик на YouTube. При наведении
+ * заранее открывается соединение с youtube-nocookie.com.
+ */
+(function () {
+    "use strict";
+
+    const EMBED = "https://www.youtube-nocookie.com/embed/";
+    const ORIGINS = ["https://www.youtube-nocookie.com", "https://www.google.com"];
+    let warmed = false;
+
+    const warm = () => {
+        if (warmed) return;
+        warmed = true;
+        ORIGINS.forEach((origin) => {
+            const link = document.createElement("link");
+            link.rel = "preconnect";
+            link.href = origin;
+            document.head.appendChild(link);
+        });
+    };
+
+    const play = (facade) => {
+        const id = encodeURIComponent(facade.dataset.youtubeId);
+        const iframe = document.createElement("iframe");
+        iframe.className = "video-frame";
+        iframe.src = `${EMBED}${id}?autoplay=1&rel=0`;
+        iframe.title = facade.getAttribute("aria-label") || "YouTube";
+        iframe.allow = "accelerometer; autoplay; encrypted-media; gyroscope; picture-in-picture";
+        iframe.allowFullscreen = true;
+        facade.replaceWith(iframe);
+    };
+
+    document.addEventListener("pointerover", (event) => {
+        if (event.target.closest("[data-youtube-id]")) warm();
+    }, { passive: true });
+
+    document.addEventListener("click", (event) => {
+        const facade = event.target.closest("[data-youtube-id]");
+        if (!facade || event.ctrlKey || event.metaKey || event.shiftKey) return;
+        event.preventDefault();
+        warm();
+        play(facade);
+    });
+})();
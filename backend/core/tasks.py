@@ -0,0 +1,165 @@
+# core/tasks.py
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch(task, *args, countdown=None):
+    """
+    Поставить задачу в очередь, не роняя вызывающий код.
+
+    Постановка идёт из on_commit и путей чтения: недоступный брокер должен
+    давать предупреждение в логе, а не исключение после сохранения или 500.
+
+    Returns:
+        bool: задача поставлена.
+    """
+    try:
+        task.apply_async(args, countdown=countdown)
+        return True
+    except Exception as e:
+        logger.warning(f"Task {task.name} not queued: {e}")
+        return False
+
+
+@shared_task(ignore_result=True)
+def refresh_related_posts(label):
+    """Пересчёт похожих публикаций по накопленным изменениям (label — "blog.blogpost")."""
+    from .related import INDEXES
+
+    refreshed = INDEXES[label].refresh_pending()
+    logger.info(f"Related posts refreshed for {label}, {refreshed} lists updated")
+    return refreshed
+
+
+@shared_task(ignore_result=True)
+def rebuild_related_posts(label=None):
+    """Ночной полный пересчёт похожих публикаций (всех индексов или одного)."""
+    from .related import INDEXES
+
+    total = 0
+    for index in INDEXES.values():
+        if label and index.label != label:
+            continue
+        links = index.rebuild_all()
+        logger.info(f"Related posts rebuilt for {index.label}, {links} links stored")
+        total += links
+    return total
+
+
+@shared_task(ignore_result=True)
+def refresh_exchange_rates():
+    """Обновление курсов валют из провайдера settings.CURRENCY; при ошибке остаются прежние."""
+    from .currency import refresh_rates
+
+    try:
+        updated = refresh_rates()
+    except Exception as e:
+        logger.error(f"Exchange rates refresh failed: {e}")
+        return 0
+    logger.info(f"Exchange rates refreshed, {updated} currencies")
+    return updated
+
+
+@shared_task(ignore_result=True)
+def sync_video_metadata(video_ids=None, force=False):
+    """Название, длительность, дата и превью видео с YouTube (core/youtube.py)."""
+    from .models import Video
+    from .youtube import sync_videos
+
+    queryset = Video.objects.filter(pk__in=video_ids) if video_ids else None
+    try:
+        updated = sync_videos(queryset, force=force)
+    except Exception as e:
+        logger.error(f"YouTube metadata sync failed: {e}")
+        return 0
+    logger.info(f"YouTube metadata synced, {updated} videos")
+    return updated
+
+
+@shared_task(ignore_result=True)
+def refresh_cached(key, builder_path, args, timeout, stale, language, token):
+    """Фоновый пересчёт несвежего значения кэша (core/caching.py)."""
+    from .caching import refresh
+
+    try:
+        refresh(key, builder_path, args, timeout, stale, language, token)
+    except Exception as e:
+        logger.error(f"Cache refresh {key} failed: {e}")
+
+
+@shared_task(ignore_result=True)
+def warm_cache():
+    """Прогрев закэшированных блоков страниц после деплоя или публикации (core/warmup.py)."""
+    from .caching import acquire, release
+    from .warmup import LOCK_KEY, warm
+
+    # Один прогрев за раз: следующий и так начнётся после публикации
+    token = acquire(LOCK_KEY, 30 * 60)
+    if token is None:
+        logger.info("Cache warmup already running, skipped")
+        return None
+    try:
+        result = warm()
+    finally:
+        release(LOCK_KEY, token)
+    logger.info(f"Cache warmed: {result['pages']} pages, {result['errors']} errors in {result['seconds']}s")
+    return result
+
+
+@shared_task(ignore_result=True)
+def run_export(job_id):
+    """Большая выгрузка из админки (ExportJob) в файл закрытого хранилища."""
+    from django.utils import timezone
+
+    from .exports import write_file
+    from .models import ExportJob
+
+    job = ExportJob.objects.get(pk=job_id)
+    job.status = ExportJob.Status.RUNNING
+    job.save(update_fields=["status"])
+
+    try:
+        job.rows = write_file(job)
+    except Exception as e:
+        logger.error(f"Export {job.pk} failed: {e}")
+        job.status = ExportJob.Status.FAILED
+        job.error = str(e)
+    else:
+        job.status = ExportJob.Status.DONE
+        logger.info(f"Export {job.pk} done, {job.rows} rows")
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "rows", "file", "error", "finished_at"])
+
+
+@shared_task(ignore_result=True)
+def cleanup_exports():
+    """Удаление выгрузок старше settings.EXPORT["KEEP_DAYS"] вместе с файлами."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from .exports import export_storage, get_config
+    from .models import ExportJob
+
+    cutoff = timezone.now() - timedelta(days=get_config()["KEEP_DAYS"])
+    old = ExportJob.objects.filter(created_at__lt=cutoff)
+    for name in old.exclude(file="").values_list("file", flat=True):
+        export_storage.delete(name)
+    deleted, _ = old.delete()
+    logger.info(f"Old exports removed: {deleted}")
+    return deleted
+
+
+@shared_task(ignore_result=True)
+def make_remote_thumbnail(url, alias):
+    """Миниатюра внешней картинки для превью в админке (core/previews.py)."""
+    from .previews import build_remote_thumbnail, download_image
+
+    try:
+        data, _ = download_image(url)
+        build_remote_thumbnail(url, alias, data)
+    except Exception as e:
+        logger.warning(f"Remote thumbnail {url} failed: {e}")
@@ -0,0 +1,44 @@
+# core/templatetags/caching.py
+"""
+{% cached %} — как встроенный {% cache %}, но через core/caching.py:
+истёкший фрагмент собирает один процесс, остальные отдают прежний.
+
+    {% load caching %}
+    {% cached 900 "index-top" version LANGUAGE_CODE %} ... {% endcached %}
+"""
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+
+from core.caching import get_or_build
+
+register = template.Library()
+
+
+class CachedNode(template.Node):
+    def __init__(self, nodelist, timeout, name, vary_on):
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = self.timeout.resolve(context)
+        try:
+            timeout = int(timeout)
+        except (TypeError, ValueError):
+            raise template.TemplateSyntaxError(f"{{% cached %}}: некорректный timeout {timeout!r}")
+        key = make_template_fragment_key(self.name, [var.resolve(context) for var in self.vary_on])
+        return get_or_build(key, self.nodelist.render, timeout, args=(context,))
+
+
+@register.tag("cached")
+def do_cached(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError("{% cached %} принимает timeout, имя фрагмента и ключи")
+    nodelist = parser.parse(("endcached",))
+    parser.delete_first_token()
+    name = bits[2].strip("'\"")
+    return CachedNode(
+        nodelist, parser.compile_filter(bits[1]), name, [parser.compile_filter(bit) for bit in bits[3:]]
+    )
@@ -0,0 +1,159 @@
+# core/tests/test_caching.py
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core import caching
+
+FAST = {"WAIT": 1.0, "POLL": 0.01, "BETA": 0.0, "STALE": 60}
+
+
+def _expired(value, delta=0.0):
+    return (value, time.time() - 1, delta)
+
+
+def build_answer():
+    return 42
+
+
+@override_settings(CACHING=FAST)
+class GetOrBuildTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.builder = mock.Mock(return_value="fresh")
+
+    def test_miss_builds_once(self):
+        self.assertEqual(caching.get_or_build("k", self.builder, 60), "fresh")
+        self.assertEqual(caching.get_or_build("k", self.builder, 60), "fresh")
+        self.builder.assert_called_once_with()
+        self.assertIsNone(cache.get("k:lock"))
+
+    def test_callable_timeout_gets_value(self):
+        timeout = mock.Mock(return_value=10)
+        caching.get_or_build("k", self.builder, timeout)
+        timeout.assert_called_once_with("fresh")
+
+    def test_waits_for_lock_holder_instead_of_building(self):
+        token = caching.acquire("k:lock", 30)
+
+        def holder():
+            time.sleep(0.05)
+            caching.store("k", "theirs", 60)
+            caching.release("k:lock", token)
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.assertEqual(caching.get_or_build("k", self.builder, 60), "theirs")
+        thread.join()
+        self.builder.assert_not_called()
+
+    def test_builds_after_waiting_too_long(self):
+        caching.acquire("k:lock", 30)
+        with override_settings(CACHING={**FAST, "WAIT": 0.05}):
+            self.assertEqual(caching.get_or_build("k", self.builder, 60), "fresh")
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "shared"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(caching.get_or_build("k", slow, 60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["shared"] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_value_served_while_other_process_rebuilds(self):
+        cache.set("k", _expired("old"), 60)
+        caching.acquire("k:lock", 30)
+        self.assertEqual(caching.get_or_build("k", self.builder, 60), "old")
+        self.builder.assert_not_called()
+
+    def test_stale_value_rebuilt_when_lock_is_free(self):
+        cache.set("k", _expired("old"), 60)
+        self.assertEqual(caching.get_or_build("k", self.builder, 60), "fresh")
+        self.assertEqual(caching.peek("k"), "fresh")
+        self.assertIsNone(cache.get("k:lock"))
+
+    def test_background_refresh_is_queued_and_keeps_lock(self):
+        cache.set("k", _expired("old"), 60)
+        with mock.patch("core.tasks.refresh_cached.apply_async") as apply_async:
+            self.assertEqual(caching.get_or_build("k", build_answer, 60, background=True), "old")
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args[0][0][1], f"{__name__}.build_answer")
+        # Блокировку снимет задача
+        self.assertIsNotNone(cache.get("k:lock"))
+
+    def test_background_refresh_without_broker_serves_stale_and_releases_lock(self):
+        cache.set("k", _expired("old"), 60)
+        with mock.patch("core.tasks.refresh_cached.apply_async", side_effect=ConnectionRefusedError):
+            self.assertEqual(caching.get_or_build("k", build_answer, 60, background=True), "old")
+        self.assertIsNone(cache.get("k:lock"))
+
+    def test_refresh_rebuilds_and_releases_lock(self):
+        token = caching.acquire("k:lock", 30)
+        caching.refresh("k", f"{__name__}.build_answer", [], 60, 60, "ru", token)
+        self.assertEqual(caching.peek("k"), 42)
+        self.assertIsNone(cache.get("k:lock"))
+
+
+class EarlyRefreshTests(SimpleTestCase):
+    def test_fresh_value_without_beta_is_not_refreshed(self):
+        now = time.time()
+        self.assertFalse(caching._needs_refresh(("v", now + 1, 10.0), now, 0.0))
+
+    def test_expired_value_is_refreshed(self):
+        now = time.time()
+        self.assertTrue(caching._needs_refresh(("v", now - 1, 0.0), now, 1.0))
+
+    def test_slow_builds_refresh_earlier(self):
+        now = time.time()
+        envelope_cheap = ("v", now + 5, 0.01)
+        envelope_slow = ("v", now + 5, 2.0)
+        # -ln(1 - 0.95) ≈ 3: дорогой расчёт (2 с) обновляется за 6 с до срока, дешёвый — нет
+        with mock.patch("core.caching.random.random", return_value=0.95):
+            self.assertFalse(caching._needs_refresh(envelope_cheap, now, 1.0))
+            self.assertTrue(caching._needs_refresh(envelope_slow, now, 1.0))
+
+
+@override_settings(CACHING=FAST)
+class GetOrBuildManyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_builds_only_missing_keys_in_one_call(self):
+        caching.store("a", "cached", 60)
+        builder = mock.Mock(side_effect=lambda items: {key: arg * 2 for key, arg in items.items()})
+        result = caching.get_or_build_many({"a": 1, "b": 2, "c": 3}, builder, 60)
+        self.assertEqual(result, {"a": "cached", "b": 4, "c": 6})
+        builder.assert_called_once_with({"b": 2, "c": 3})
+        self.assertEqual(caching.peek("c"), 6)
+        self.assertIsNone(cache.get("b:lock"))
+
+    def test_outdated_key_served_and_rebuilt(self):
+        cache.set("a", _expired("old"), 60)
+        result = caching.get_or_build_many({"a": 1}, lambda items: {"a": "new"}, 60)
+        self.assertEqual(result, {"a": "new"})
+
+
+class VersionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable_until_bumped(self):
+        version = caching.get_version("v")
+        self.assertEqual(caching.get_version("v"), version)
+        caching.bump_version("v")
+        self.assertNotEqual(caching.get_version("v"), version)
@@ -0,0 +1,148 @@
+# core/tests/test_geo.py
+import math
+import random
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+
+from core import geo
+from core.geo import COLUMNS, BBox, cell_for
+from developers.models import Developer
+from properties.models import Property
+
+
+def in_ranges(cell, ranges):
+    return any(low <= cell <= high for low, high in ranges)
+
+
+class CellTests(SimpleTestCase):
+    def test_no_coordinates(self):
+        self.assertIsNone(cell_for(None, 115.2))
+        self.assertIsNone(cell_for(-8.65, None))
+
+    def test_cell_number(self):
+        # row = floor((-8.655 + 90) / 0.01) = 8134, col = floor((115.215 + 180) / 0.01) = 29521
+        self.assertEqual(cell_for(Decimal("-8.655"), Decimal("115.215")), 8134 * COLUMNS + 29521)
+        self.assertEqual(cell_for(-90, -180), 0)
+
+    def test_neighbour_cells_in_row_are_consecutive(self):
+        cell = cell_for(-8.655, 115.215)
+        self.assertEqual(cell_for(-8.655, 115.225), cell + 1)
+        self.assertEqual(cell_for(-8.645, 115.215), cell + COLUMNS)
+
+    def test_east_edge_stays_in_row(self):
+        self.assertEqual(cell_for(0, 180), cell_for(0, 179.995))
+
+
+class BBoxTests(SimpleTestCase):
+    def test_parse_leaflet_order_and_clamp(self):
+        bbox = BBox.parse("115.1,-8.8,115.3,-8.6")
+        self.assertEqual((bbox.south, bbox.west, bbox.north, bbox.east), (-8.8, 115.1, -8.6, 115.3))
+        bbox = BBox.parse("-200,-95,200,95")
+        self.assertEqual((bbox.south, bbox.west, bbox.north, bbox.east), (-90.0, -180.0, 90.0, 180.0))
+
+    def test_parse_rejects_garbage(self):
+        for value in (None, "", "1,2,3", "a,b,c,d", "115.3,-8.8,115.1,-8.6", "nan,0,1,1"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                BBox.parse(value)
+
+    def test_around(self):
+        bbox = BBox.around(-8.65, 115.2, 11.132)
+        self.assertAlmostEqual(bbox.north - bbox.south, 0.2)
+        # Градус долготы короче у экватора на cos(широты)
+        self.assertAlmostEqual(bbox.east - bbox.west, 0.2 / math.cos(math.radians(-8.65)))
+        self.assertAlmostEqual(bbox.center[0], -8.65)
+
+    def test_cell_ranges_per_row(self):
+        bbox = BBox(-8.655, 115.215, -8.635, 115.245)
+        ranges = bbox.cell_ranges()
+        self.assertEqual(len(ranges), 3)
+        row = cell_for(-8.655, 115.215)
+        self.assertEqual(ranges[0], (row, row + 3))
+        self.assertEqual(ranges[1], (row + COLUMNS, row + COLUMNS + 3))
+
+    def test_tall_bbox_uses_one_band(self):
+        bbox = BBox(-10, 114, -7, 116)
+        ranges = bbox.cell_ranges()
+        self.assertEqual(len(ranges), 1)
+        self.assertEqual(ranges, bbox.cell_ranges(per_row=False))
+        self.assertEqual(ranges[0][0] % COLUMNS, 0)
+        self.assertEqual(ranges[0][1] % COLUMNS, COLUMNS - 1)
+
+    def test_points_inside_bbox_are_in_ranges(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            south, west = rng.uniform(-89, 80), rng.uniform(-179, 170)
+            bbox = BBox(south, west, south + rng.uniform(0, 0.5), west + rng.uniform(0, 0.5))
+            for per_row in (True, False):
+                ranges = bbox.cell_ranges(per_row)
+                for lat, lon in [(bbox.south, bbox.west), (bbox.north, bbox.east)] + [
+                    (rng.uniform(bbox.south, bbox.north), rng.uniform(bbox.west, bbox.east)) for _ in range(20)
+                ]:
+                    self.assertTrue(in_ranges(cell_for(lat, lon), ranges), (bbox.__dict__, lat, lon))
+
+    def test_intersection_and_contains(self):
+        first, second = BBox(0, 0, 2, 2), BBox(1, 1, 3, 3)
+        common = geo.intersection(first, second)
+        self.assertEqual((common.south, common.west, common.north, common.east), (1, 1, 2, 2))
+        self.assertIsNone(geo.intersection(first, BBox(5, 5, 6, 6)))
+        self.assertTrue(geo.contains(first, common))
+        self.assertFalse(geo.contains(common, first))
+
+
+class GeoQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        developer = Developer.objects.create(name="Dev", slug="dev")
+        rng = random.Random(3)
+        points = [(round(rng.uniform(-8.9, -8.4), 6), round(rng.uniform(114.9, 115.5), 6)) for _ in range(300)]
+        # Точка ровно на стыке двух тайлов
+        points.append((-8.6, 115.2))
+        # bulk_create в обход save(): geo_cell — через cell_for, как в импорте фидов
+        Property.objects.bulk_create([
+            Property(
+                developer=developer, name=f"P{i}", slug=f"p{i}", main_image="",
+                latitude=Decimal(str(lat)), longitude=Decimal(str(lon)), geo_cell=cell_for(lat, lon),
+            )
+            for i, (lat, lon) in enumerate(points)
+        ])
+        cls.points = dict(enumerate(points))
+
+    def brute_force(self, bbox):
+        return {
+            f"p{i}" for i, (lat, lon) in self.points.items()
+            if bbox.south <= lat <= bbox.north and bbox.west <= lon <= bbox.east
+        }
+
+    def test_filter_matches_brute_force(self):
+        for bbox in (BBox(-8.7, 115.1, -8.55, 115.3), BBox(-9, 114, -8, 116)):
+            for per_row in (True, False):
+                found = set(bbox.filter(Property.objects.all(), per_row=per_row).values_list("slug", flat=True))
+                self.assertEqual(found, self.brute_force(bbox))
+
+    def test_half_open_tiles_share_border_point_once(self):
+        tiles = [
+            BBox(south, west, south + 0.1, west + 0.1)
+            for south in (-8.7, -8.6) for west in (115.1, 115.2)
+        ]
+        border = Property.objects.filter(slug=f"p{len(self.points) - 1}")
+        hits = [tile.filter(border, half_open=True).exists() for tile in tiles]
+        self.assertEqual(hits, [False, False, False, True])
+        self.assertTrue(all(tile.filter(border).exists() for tile in tiles))
+
+    def test_nearest_matches_full_sort(self):
+        center = (-8.65, 115.2)
+        scale = math.cos(math.radians(center[0]))
+        expected = sorted(
+            self.points.items(),
+            key=lambda item: (item[1][0] - center[0]) ** 2 + ((item[1][1] - center[1]) * scale) ** 2,
+        )
+        rows = geo.nearest(Property.objects.all(), ["slug"], 10, bbox=BBox(-8.9, 114.9, -8.4, 115.5))
+        self.assertEqual([row["slug"] for row in rows], [f"p{i}" for i, _ in expected[:10]])
+
+    def test_nearest_respects_radius(self):
+        rows = geo.nearest(Property.objects.all(), ["slug"], 1000, center=(-8.65, 115.2), radius_km=5)
+        self.assertTrue(rows)
+        self.assertTrue(all(geo.distance_km(row["distance_sq"]) <= 5 for row in rows))
+        distances = [row["distance_sq"] for row in rows]
+        self.assertEqual(distances, sorted(distances))
@@ -0,0 +1,157 @@
+# core/tests/test_ratelimit.py
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core import ratelimit
+
+RULES = {
+    "ENABLED": True,
+    "REDIS_URL": None,
+    "PROXY_COUNT": 1,
+    "RULES": {
+        "test": {"rate": "2/m", "keys": ["ip"]},
+        "login": {"rate": "2/m", "keys": ["ip", "post:login"]},
+    },
+    "ROUTES": {},
+}
+
+
+class Clock:
+    """Подменяет time.monotonic в core.ratelimit."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ParseRateTests(SimpleTestCase):
+    def test_rates(self):
+        self.assertEqual(ratelimit.parse_rate("5/m"), (5, 5 / 60))
+        self.assertEqual(ratelimit.parse_rate("5/10m"), (5, 5 / 600))
+        self.assertEqual(ratelimit.parse_rate("10 / h"), (10, 10 / 3600))
+
+    def test_invalid_rate(self):
+        for rate in ("5", "5/10", "m/5", "5/w"):
+            with self.assertRaises(ValueError):
+                ratelimit.parse_rate(rate)
+
+
+class LocalBucketsTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch("core.ratelimit.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.buckets = ratelimit.LocalBuckets()
+
+    def test_capacity_then_wait(self):
+        # 3 токена, по одному в 10 секунд
+        self.assertEqual([self.buckets.take("k", 3, 0.1)[0] for _ in range(3)], [True] * 3)
+        allowed, wait = self.buckets.take("k", 3, 0.1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 10.0)
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.buckets.take("k", 3, 0.1)
+        self.clock.now += 4
+        allowed, wait = self.buckets.take("k", 3, 0.1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 6.0)
+
+        self.clock.now += 6
+        self.assertEqual(self.buckets.take("k", 3, 0.1), (True, 0.0))
+
+    def test_refill_is_capped_by_capacity(self):
+        self.buckets.take("k", 2, 1.0)
+        self.clock.now += 3600
+        self.assertEqual([self.buckets.take("k", 2, 1.0)[0] for _ in range(3)], [True, True, False])
+
+    def test_keys_are_independent(self):
+        self.buckets.take("a", 1, 0.1)
+        self.assertFalse(self.buckets.take("a", 1, 0.1)[0])
+        self.assertTrue(self.buckets.take("b", 1, 0.1)[0])
+
+    def test_old_keys_evicted(self):
+        self.buckets.MAX_KEYS = 2
+        for key in ("a", "b", "c"):
+            self.buckets.take(key, 1, 0.1)
+        self.assertEqual(list(self.buckets._buckets), ["b", "c"])
+        # Вытесненное ведро снова полное
+        self.assertTrue(self.buckets.take("a", 1, 0.1)[0])
+
+
+class TakeTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(ratelimit, _local=ratelimit.LocalBuckets(), _redis=None, _redis_down_until=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(RATELIMIT={**RULES, "REDIS_URL": "redis://localhost:1/0"})
+    def test_redis_error_falls_back_to_local_buckets(self):
+        with mock.patch.object(ratelimit, "RedisBuckets", side_effect=ConnectionError) as redis_buckets:
+            self.assertEqual(ratelimit.take("k", 1, 0.1), (True, 0.0))
+            self.assertFalse(ratelimit.take("k", 1, 0.1)[0])
+        # Пока не прошло REDIS_RETRY, Redis не дёргается
+        redis_buckets.assert_called_once()
+        self.assertGreater(ratelimit._redis_down_until, 0)
+
+
+@override_settings(RATELIMIT=RULES)
+class CheckTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.clock = Clock()
+        for patcher in (
+            mock.patch("core.ratelimit.time.monotonic", self.clock),
+            mock.patch.object(ratelimit, "_local", ratelimit.LocalBuckets()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.view = ratelimit.ratelimit("test")(lambda request: HttpResponse("ok"))
+
+    def post(self, ip="10.0.0.1", forwarded=None, **data):
+        extra = {"REMOTE_ADDR": ip}
+        if forwarded:
+            extra["HTTP_X_FORWARDED_FOR"] = forwarded
+        return self.factory.post("/", data, **extra)
+
+    def test_retry_after_header(self):
+        self.assertEqual(self.view(self.post()).status_code, 200)
+        self.assertEqual(self.view(self.post()).status_code, 200)
+        response = self.view(self.post())
+        self.assertEqual(response.status_code, 429)
+        # 2 токена в минуту — следующий через 30 с
+        self.assertEqual(response["Retry-After"], "30")
+
+        self.clock.now += 29.5
+        self.assertEqual(self.view(self.post())["Retry-After"], "1")
+        self.clock.now += 0.5
+        self.assertEqual(self.view(self.post()).status_code, 200)
+
+    def test_get_is_not_limited(self):
+        for _ in range(5):
+            self.assertEqual(self.view(self.factory.get("/")).status_code, 200)
+
+    @override_settings(RATELIMIT={**RULES, "ENABLED": False})
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.view(self.post()).status_code, 200)
+
+    def test_client_ip_from_forwarded_for(self):
+        # Левые адреса присылает сам клиент — считается адрес от последнего прокси
+        for spoofed in ("1.1.1.1", "2.2.2.2", "3.3.3.3"):
+            response = self.view(self.post(ip="172.16.0.1", forwarded=f"{spoofed}, 10.0.0.9"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.view(self.post(ip="172.16.0.1", forwarded="10.0.0.8")).status_code, 200)
+
+    def test_any_exhausted_key_limits(self):
+        self.assertIsNone(ratelimit.check(self.post(login="A@example.com "), "login"))
+        self.assertIsNone(ratelimit.check(self.post(ip="10.0.0.2", login="a@example.com"), "login"))
+        # Тот же логин с третьего адреса: ведро адреса полное, ведро логина пустое
+        self.assertAlmostEqual(ratelimit.check(self.post(ip="10.0.0.3", login="a@example.com"), "login"), 30.0)
+        self.assertIsNone(ratelimit.check(self.post(ip="10.0.0.3", login="b@example.com"), "login"))
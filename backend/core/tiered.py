@@ -0,0 +1,213 @@
+# core/tiered.py
+"""
+Двухуровневый кэш: LRU в памяти процесса перед общим кэшем (Redis).
+
+Для маленьких данных, которые читаются почти на каждом запросе
+(справочники — core/reference.py): попадание в LRU не стоит даже
+похода в Redis. Второй уровень — core.caching.get_or_build, то есть
+промах в Redis пересчитывает один процесс.
+
+Изменение сбрасывает ключ в Redis и публикует его в канал CHANNEL.
+Каждый процесс (воркеры gunicorn, Celery) слушает канал фоновым потоком
+и выкидывает ключ из своего LRU. Пока слушатель не подключён, LRU не
+используется — иначе процесс мог бы пропустить сброс и отдавать старое;
+LOCAL_TIMEOUT — страховка на случай потерянного сообщения. Без REDIS_URL
+(локально, LocMemCache) оба уровня живут в одном процессе, и сброс
+локальный.
+
+Доли попаданий по уровням: stats() — сумма по всем процессам,
+команда reference_cache_stats.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import caching
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "REDIS_URL": None,
+    "CHANNEL": "tiered-cache:invalidate",
+    "PREFIX": "tiered:",
+    "LRU_SIZE": 256,            # Ключей в памяти процесса
+    "LOCAL_TIMEOUT": 5 * 60,    # Сколько ключ живёт в LRU без сброса
+    "TIMEOUT": 24 * 3600,       # Сколько — в Redis
+    "STATS_FLUSH": 30,          # Раз во сколько секунд процесс сдаёт счётчики в общий кэш
+}
+
+STATS_KEY = "tiered-cache:stats:"
+COUNTERS = ("local_hits", "local_misses", "shared_hits", "shared_misses")
+
+_MISSING = object()
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "TIERED_CACHE", {})}
+
+
+class TwoTierCache:
+    def __init__(self):
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        # Растёт с каждым сбросом: значение, прочитанное из Redis до сброса, в LRU не кладём
+        self._generation = 0
+        self._pid = None
+        self._listening = False
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._flushed_at = time.monotonic()
+
+    # --- LRU ---
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._lru[key]
+                return _MISSING
+            self._lru.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value, generation):
+        config = get_config()
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._lru[key] = (value, time.monotonic() + config["LOCAL_TIMEOUT"])
+            self._lru.move_to_end(key)
+            while len(self._lru) > config["LRU_SIZE"]:
+                self._lru.popitem(last=False)
+
+    def _local_evict(self, keys=None):
+        with self._lock:
+            self._generation += 1
+            if keys is None:
+                self._lru.clear()
+            else:
+                for key in keys:
+                    self._lru.pop(key, None)
+
+    # --- Pub/sub ---
+
+    def _ensure_listener(self, url):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        # Первый вызов или процесс после fork: поток и LRU родителя сюда не переходят
+        self._pid = pid
+        self._listening = False
+        self._local_evict()
+        threading.Thread(target=self._listen, args=(url, pid), name="tiered-cache", daemon=True).start()
+
+    def _listen(self, url, pid):
+        import redis
+
+        channel = get_config()["CHANNEL"]
+        while self._pid == pid:
+            try:
+                client = redis.Redis.from_url(url, health_check_interval=30, socket_connect_timeout=2)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                # Пока не слушали, сбросы могли пройти мимо
+                self._local_evict()
+                self._listening = True
+                for message in pubsub.listen():
+                    keys = json.loads(message["data"])
+                    self._local_evict(None if keys == "*" else keys)
+            except Exception as e:
+                logger.warning(f"Tiered cache listener disconnected: {e}")
+            self._listening = False
+            time.sleep(5)
+
+    def _publish(self, url, keys):
+        import redis
+
+        try:
+            redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1).publish(
+                get_config()["CHANNEL"], json.dumps(keys)
+            )
+        except Exception as e:
+            logger.warning(f"Tiered cache invalidation of {keys} not published: {e}")
+
+    # --- Статистика ---
+
+    def _count(self, name):
+        self._counters[name] += 1
+        if time.monotonic() - self._flushed_at >= get_config()["STATS_FLUSH"]:
+            self.flush_stats()
+
+    def flush_stats(self):
+        counters, self._counters = self._counters, dict.fromkeys(COUNTERS, 0)
+        self._flushed_at = time.monotonic()
+        for name, value in counters.items():
+            if value:
+                key = STATS_KEY + name
+                cache.add(key, 0, None)
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    cache.set(key, value, None)
+
+    # --- API ---
+
+    def get(self, key, builder, timeout=None):
+        """Значение key: из LRU, иначе из Redis, иначе builder() (в одном процессе)."""
+        config = get_config()
+        url = config["REDIS_URL"]
+        if url:
+            self._ensure_listener(url)
+        use_local = self._listening or not url
+
+        if use_local:
+            value = self._local_get(key)
+            if value is not _MISSING:
+                self._count("local_hits")
+                return value
+            self._count("local_misses")
+
+        generation = self._generation
+        built = []
+
+        def build():
+            built.append(True)
+            return builder()
+
+        value = caching.get_or_build(config["PREFIX"] + key, build, timeout or config["TIMEOUT"])
+        self._count("shared_misses" if built else "shared_hits")
+        if use_local:
+            self._local_set(key, value, generation)
+        return value
+
+    def invalidate(self, *keys):
+        """Сбросить ключи в Redis и в LRU всех процессов."""
+        config = get_config()
+        caching.invalidate(*(config["PREFIX"] + key for key in keys))
+        self._local_evict(keys)
+        if config["REDIS_URL"]:
+            self._publish(config["REDIS_URL"], list(keys))
+
+    def stats(self):
+        """Счётчики и доли попаданий по уровням — сумма по процессам, сдавшим статистику."""
+        self.flush_stats()
+        values = cache.get_many([STATS_KEY + name for name in COUNTERS])
+        counters = {name: values.get(STATS_KEY + name, 0) for name in COUNTERS}
+        for tier in ("local", "shared"):
+            total = counters[f"{tier}_hits"] + counters[f"{tier}_misses"]
+            counters[f"{tier}_hit_ratio"] = round(counters[f"{tier}_hits"] / total, 4) if total else None
+        return counters
+
+    def reset_stats(self):
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        cache.delete_many([STATS_KEY + name for name in COUNTERS])
+
+
+tiered_cache = TwoTierCache()
@@ -0,0 +1,102 @@
+# core/translation.py
+"""
+Переводы контента моделей (Developer, Property, BlogPost, NewsPost, Event).
+
+Основной язык (settings.LANGUAGE_CODE, ru) хранится в обычных колонках,
+перевод — в колонках рядом с суффиксом языка: name_en, description_en.
+Модель перечисляет переводимые поля в TRANSLATED_FIELDS.
+
+Для активного языка queryset.translated() добавляет в тот же SELECT
+
+    COALESCE(NULLIF(name_en, ''), name) AS name_i18n
+
+и подставляет значение в obj.name: запасной язык выбирается в SQL,
+отдельных запросов или prefetch на переводы нет, и английская
+страница стоит столько же запросов, сколько русская. Для основного
+языка translated() ничего не меняет.
+
+CardQuerySet.cards() переводит поля карточки сам; детальные страницы
+берут объект через Model.objects.translated(). Объект с подставленным
+переводом сохранять нельзя — перевод записался бы в колонку основного языка.
+
+Кэши, в которых лежит переводимый текст, включают язык в ключ (cache_language()).
+"""
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.query import ModelIterable
+from django.utils import translation
+
+SUFFIX = "_i18n"
+
+
+def languages():
+    """Языки переводов — все из LANGUAGES, кроме основного."""
+    return [code for code, _ in settings.LANGUAGES if code != settings.LANGUAGE_CODE]
+
+
+def active_language():
+    """Активный язык перевода или None для основного языка."""
+    language = (translation.get_language() or settings.LANGUAGE_CODE).split("-")[0]
+    return language if language in languages() else None
+
+
+def cache_language():
+    """Язык для ключей кэша с переводимым текстом."""
+    return active_language() or settings.LANGUAGE_CODE
+
+
+def column(field, language):
+    return f"{field}_{language}"
+
+
+def _fallback(field, language):
+    """COALESCE(NULLIF(<поле>_<язык>, ''), <поле>)."""
+    empty = Value("", output_field=field)
+    return Coalesce(
+        NullIf(F(column(field.name, language)), empty, output_field=field), F(field.name), output_field=field
+    )
+
+
+class TranslatedModelIterable(ModelIterable):
+    """Подставляет аннотации <поле>_i18n в поля объекта."""
+
+    def __iter__(self):
+        names = [name for name in self.queryset.query.annotations if name.endswith(SUFFIX)]
+        for obj in super().__iter__():
+            if names:
+                for name in names:
+                    setattr(obj, name[:-len(SUFFIX)], getattr(obj, name))
+                obj._translated = True
+            yield obj
+
+
+class TranslatedQuerySetMixin:
+    def translated(self, language=None, fields=None):
+        """
+        Поля TRANSLATED_FIELDS (или fields) на языке language (по умолчанию
+        активном) с откатом на основной язык; для основного языка — без изменений.
+        """
+        language = language if language is not None else active_language()
+        if fields is None:
+            fields = getattr(self.model, "TRANSLATED_FIELDS", ())
+        if not language or language == settings.LANGUAGE_CODE or not fields:
+            return self
+        queryset = self.annotate(**{
+            f"{field}{SUFFIX}": _fallback(self.model._meta.get_field(field), language) for field in fields
+        })
+        if not issubclass(queryset._iterable_class, TranslatedModelIterable):
+            queryset._iterable_class = TranslatedModelIterable
+        return queryset
+
+
+class TranslatableMixin:
+    """Запрещает сохранять объект, в поля которого подставлен перевод."""
+
+    def save(self, *args, **kwargs):
+        if getattr(self, "_translated", False):
+            raise ValueError(
+                f"{type(self).__name__} загружен через translated(): "
+                f"для изменения возьмите объект без перевода"
+            )
+        super().save(*args, **kwargs)
@@ -10,4 +10,6 @@ urlpatterns = [
     path('privacy-policy/', views.privacy_policy, name='privacy_policy'),
     path('terms-of-use/', views.terms_of_use, name='terms_of_use'),
     path('contact/', views.contact_request, name='contact_request'),
+    path('map/points/', views.map_points, name='map_points'),
+    path('map/clusters/', views.map_clusters, name='map_clusters'),
 ]
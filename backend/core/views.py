@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.db.models import Count
@@ -8,49 +10,65 @@ from properties.models import Property
 from events.models import Event
 from blog.models import BlogPost
 from news.models import NewsPost
-from .models import Video, FAQ, SiteSettings
+from .models import Video
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
 
-from django.views.decorators.http import require_POST
+from . import reference
+from .currency import attach_prices, rates_version
+from .queries import top_n_per_group
+from .ratelimit import ratelimit
+from .warmup import fragment_cache
+
+# Сколько застройщиков показывать во вкладке категории в блоке рейтинга
+RATING_BLOCK_SIZE = 10
 
 
 def index(request):
     """Главная страница."""
     
     # Настройки сайта
-    settings = SiteSettings.get()
+    settings = reference.site_settings()
     
-    # Застройщики с фильтрацией по категориям
+    # Застройщики с фильтрацией по категориям: только топ-N каждой вкладки
     categories = DeveloperCategory.objects.prefetch_related(
         Prefetch(
             'developers',
-            queryset=Developer.objects.filter(is_active=True).order_by('-rating')
+            queryset=top_n_per_group(
+                Developer.objects.cards().filter(is_active=True),
+                'category',
+                RATING_BLOCK_SIZE,
+                order_by=['category_rank'],
+            ),
+            to_attr='top_developers',
         )
     ).order_by('order')
 
-    featured_developers = Developer.objects.filter(is_active=True).order_by('-rating')[:10]
+    featured_developers = Developer.objects.cards().filter(is_active=True).order_by('-rating')[:10]
     
-    # Объекты недвижимости
-    featured_properties = Property.objects.filter(
+    # Объекты недвижимости: цены в валюте считаются, только когда блок собирается заново
+    featured_properties = partial(attach_prices, Property.objects.cards().filter(
         is_active=True, is_featured=True
-    ).select_related('developer', 'property_type', 'location')[:6]
+    )[:6], request.currency)
     
     # Мероприятия
-    upcoming_events = Event.objects.filter(status='upcoming').order_by('event_date')[:2]
+    upcoming_events = Event.objects.cards().filter(status='upcoming').order_by('event_date')[:2]
     
     # Новости
-    latest_news = NewsPost.objects.filter(status='published').order_by('-published_at')[:3]
+    latest_news = NewsPost.objects.cards().filter(status='published').order_by('-published_at')[:3]
     
     # Статьи
-    latest_posts = BlogPost.objects.filter(status='published').order_by('-published_at')[:3]
+    latest_posts = BlogPost.objects.cards().filter(status='published').order_by('-published_at')[:3]
 
     # Видео
     videos = Video.objects.filter(is_active=True).select_related('developer')[:10]
     
     # Отзывы
-    reviews = DeveloperReview.objects.filter(is_approved=True).select_related('developer').order_by('-created_at')[:6]
+    reviews = DeveloperReview.objects.cards().filter(is_approved=True).order_by('-created_at')[:6]
     
     # FAQ
-    faqs = FAQ.objects.filter(is_active=True)
+    faqs = reference.faqs()
     
     context = {
         'settings': settings,
@@ -63,6 +81,9 @@ def index(request):
         'videos': videos,
         'reviews': reviews,
         'faqs': faqs,
+        # Блоки главной кэшируются в шаблоне до смены контента (core/warmup.py)
+        'fragment_cache': fragment_cache(),
+        'rates_version': rates_version(),
     }
     
     return render(request, "pages/index.html", context)
@@ -80,6 +101,7 @@ def developer_award_2025(request):
     return render(request, 'pages/developer_award_2025.html')
 
 @require_POST
+@ratelimit("contact")
 def contact_request(request):
     """Обработка формы заявки"""
     from .models import ContactRequest
@@ -102,4 +124,71 @@ def contact_request(request):
         )
         messages.success(request, 'Спасибо! Ваша заявка отправлена.')
     
-    return redirect(request.META.get('HTTP_REFERER', '/'))
\ No newline at end of file
+    return redirect(request.META.get('HTTP_REFERER', '/'))
+
+
+@require_GET
+def map_points(request):
+    """
+    Точки карты (объекты и мероприятия) в bbox или радиусе, по расстоянию.
+
+    GET-параметры:
+        bbox=west,south,east,north  — видимая область карты
+        lat, lon, radius            — или центр и радиус в км (до 50)
+        types=properties,events     — что показывать (по умолчанию всё)
+        limit                       — сколько точек вернуть (до MAX_POINTS)
+    """
+    from . import geo
+    from .map import MAX_POINTS, SOURCES, find_points
+
+    types = [t for t in request.GET.get('types', ','.join(SOURCES)).split(',') if t in SOURCES]
+    try:
+        limit = min(max(int(request.GET.get('limit', 200)), 1), MAX_POINTS)
+        if request.GET.get('bbox'):
+            params = {'bbox': geo.BBox.parse(request.GET['bbox'])}
+        else:
+            radius = float(request.GET['radius'])
+            if not 0 < radius <= 50:
+                raise ValueError('radius: от 0 до 50 км')
+            lat, lon = float(request.GET['lat']), float(request.GET['lon'])
+            # Сравнения ложны и для nan, так что он тоже отсекается
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError('lat: от -90 до 90, lon: от -180 до 180')
+            params = {
+                'center': (lat, lon),
+                'radius_km': radius,
+            }
+    except KeyError:
+        return JsonResponse({'error': 'Нужен bbox или lat/lon/radius'}, status=400)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    items = find_points(types, limit=limit, **params)
+    return JsonResponse({'count': len(items), 'items': items})
+
+
+@require_GET
+def map_clusters(request):
+    """
+    Кластеры точек карты для zoom и видимой области.
+
+    GET-параметры:
+        zoom                        — уровень масштаба 0..MAX_CLUSTER_ZOOM
+        bbox=west,south,east,north  — видимая область карты
+        types=properties,events     — что показывать (по умолчанию всё)
+    """
+    from . import geo
+    from .map import MAX_CLUSTER_ZOOM, SOURCES, clusters_for_bbox
+
+    types = [t for t in request.GET.get('types', ','.join(SOURCES)).split(',') if t in SOURCES]
+    try:
+        zoom = int(request.GET['zoom'])
+        if not 0 <= zoom <= MAX_CLUSTER_ZOOM:
+            raise ValueError(f'zoom: от 0 до {MAX_CLUSTER_ZOOM}')
+        clusters = clusters_for_bbox(types, geo.BBox.parse(request.GET['bbox']), zoom)
+    except KeyError:
+        return JsonResponse({'error': 'Нужны zoom и bbox'}, status=400)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'zoom': zoom, 'count': len(clusters), 'clusters': clusters})
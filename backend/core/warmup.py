@@ -0,0 +1,211 @@
+# core/warmup.py
+"""
+Прогрев кэша после деплоя и публикации контента.
+
+Главная, списки и страницы статей, новостей и мероприятий кэшируют свои
+блоки ({% cached %} в шаблонах, core/caching.py) с версией контента в ключе:
+сетки карточек, навигацию, сайдбар, похожие. Целиком страницы
+не кэшируются — в каждой есть форма входа с CSRF-токеном. Версию меняют
+сохранение и удаление моделей из CONTENT_MODELS (сигналы в core/signals.py)
+и команда warm_cache при деплое (там меняются шаблоны). После этого старые
+фрагменты больше не читаются, и первый посетитель собирал бы страницу целиком.
+
+Чтобы этого не случилось, задача core.tasks.warm_cache рендерит страницы
+в процессе, через тестовый клиент со всеми middleware, на каждом языке
+из LANGUAGES. Прогреваются только страницы с {% cached %} (CACHED_PAGES):
+рендер остальных ничего не сохраняет. Порядок — по приоритету: главная
+и списки, топ свежих статей, новостей и ближайших мероприятий, недавно
+изменённые, затем остальное из sitemap.xml, всего не больше MAX_URLS.
+Потоков не больше CONCURRENCY, между страницами пауза PAUSE: прогрев
+не должен отнимать у живых запросов базу и CPU. Публикации подряд
+склеиваются в один прогрев (DEBOUNCE).
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.urls import NoReverseMatch, Resolver404, resolve, reverse, translate_url
+from django.utils import timezone
+
+from . import caching
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "pages:content-version"
+LOCK_KEY = "warmup:running"
+SCHEDULED_KEY = "warmup:scheduled"
+
+# Модели, от которых зависят закэшированные блоки страниц
+CONTENT_MODELS = (
+    "core.Video", "core.FAQ", "core.SiteSettings",
+    "developers.Developer", "developers.DeveloperCategory", "developers.DeveloperReview",
+    "properties.Property", "blog.BlogPost", "news.NewsPost", "events.Event",
+)
+
+DEFAULTS = {
+    "HOST": "localhost",
+    "CONCURRENCY": 2,          # Потоков рендера одновременно
+    "PAUSE": 0.2,              # Секунд между страницами в потоке
+    # Страницы (имена URL), шаблоны которых кэшируют блоки через {% cached %};
+    # рендер остальных ничего не сохраняет, и прогревать их незачем
+    "CACHED_PAGES": (
+        "index", "blog:list", "news:list", "events:list",
+        "blog:detail", "news:detail", "events:detail",
+    ),
+    "MAX_URLS": 300,           # Сколько страниц (на язык) прогревать за раз
+    "TOP_N": 10,               # Свежих статей, новостей и ближайших мероприятий
+    "RECENT_HOURS": 24,        # «Недавно изменённые» статьи и новости
+    "FRAGMENT_TIMEOUT": 15 * 60,
+    "DEBOUNCE": 60,            # Секунд ждать после публикации перед прогревом
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "WARMUP", {})}
+
+
+# --- Версия контента ---
+
+def content_version():
+    return caching.get_version(VERSION_KEY)
+
+
+def bump_version():
+    caching.bump_version(VERSION_KEY)
+
+
+def fragment_cache():
+    """Параметры {% cached %} для шаблона: timeout и версия контента."""
+    return {"timeout": get_config()["FRAGMENT_TIMEOUT"], "version": content_version()}
+
+
+def content_changed():
+    """Сменить версию и поставить прогрев; вызывается после коммита."""
+    bump_version()
+    schedule()
+
+
+def schedule():
+    """Поставить прогрев через DEBOUNCE секунд, если он ещё не стоит в очереди."""
+    from .tasks import dispatch, warm_cache
+
+    if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+        # Без брокера задача выполнилась бы прямо в запросе, сохранившем объект
+        return
+    delay = get_config()["DEBOUNCE"]
+    token = caching.acquire(SCHEDULED_KEY, delay)
+    if token and not dispatch(warm_cache, countdown=delay):
+        # Следующее сохранение попробует снова
+        caching.release(SCHEDULED_KEY, token)
+
+
+# --- Список страниц ---
+
+def _reverse(name, *args):
+    try:
+        return reverse(name, args=args)
+    except NoReverseMatch:
+        logger.warning(f"Warmup page {name} not found")
+        return None
+
+
+def _view_name(path):
+    try:
+        return resolve(path).view_name
+    except Resolver404:
+        return None
+
+
+def priority_paths():
+    """Пути страниц из CACHED_PAGES в порядке важности, без повторов."""
+    from blog.models import BlogPost
+    from events.models import Event
+    from news.models import NewsPost
+
+    config = get_config()
+    pages = config["CACHED_PAGES"]
+    top = config["TOP_N"]
+    since = timezone.now() - timedelta(hours=config["RECENT_HOURS"])
+
+    paths = [_reverse(name) for name in pages if not name.endswith(":detail")]
+    for model, name in ((BlogPost, "blog:detail"), (NewsPost, "news:detail")):
+        if name not in pages:
+            continue
+        published = model.objects.filter(status="published")
+        paths += [_reverse(name, slug) for slug in published.order_by("-published_at").values_list("slug", flat=True)[:top]]
+        paths += [_reverse(name, slug) for slug in published.filter(updated_at__gte=since).values_list("slug", flat=True)[:top]]
+    if "events:detail" in pages:
+        paths += [
+            _reverse("events:detail", slug)
+            for slug in Event.objects.filter(status="upcoming").order_by("event_date").values_list("slug", flat=True)[:top]
+        ]
+    paths += [path for path in sitemap_paths() if _view_name(path) in pages]
+
+    unique = list(dict.fromkeys(path for path in paths if path))
+    return unique[:config["MAX_URLS"]]
+
+
+def sitemap_paths():
+    """Пути из sitemap.xml, по убыванию priority."""
+    from urllib.parse import urlsplit
+
+    from config.urls import sitemaps
+
+    def attribute(sitemap, name, item):
+        value = getattr(sitemap, name, None)
+        return value(item) if callable(value) else value
+
+    entries = []
+    for sitemap_class in sitemaps.values():
+        sitemap = sitemap_class()
+        for item in sitemap.items():
+            priority = attribute(sitemap, "priority", item)
+            location = urlsplit(attribute(sitemap, "location", item)).path
+            entries.append((-float(priority if priority is not None else 0.5), location))
+    return [path for _, path in sorted(entries, key=lambda entry: entry[0])]
+
+
+# --- Рендер ---
+
+def _render(path, language):
+    from django.test import Client
+
+    client = Client(HTTP_HOST=get_config()["HOST"], HTTP_ACCEPT_LANGUAGE=language)
+    client.cookies[settings.LANGUAGE_COOKIE_NAME] = language
+    started = time.monotonic()
+    try:
+        status = client.get(translate_url(path, language), secure=not settings.DEBUG).status_code
+    except Exception as e:
+        logger.warning(f"Warmup {language} {path} failed: {e}")
+        status = None
+    finally:
+        # Соединения потоков пула не живут дольше страницы
+        connections.close_all()
+    return status, time.monotonic() - started
+
+
+def warm(paths=None):
+    """
+    Отрендерить страницы на всех языках.
+
+    Returns:
+        dict: {"pages": отрендерено, "errors": с ошибкой или статусом >= 500, "seconds": ...}
+    """
+    config = get_config()
+    paths = paths if paths is not None else priority_paths()
+    jobs = [(path, language) for path in paths for language, _ in settings.LANGUAGES]
+    started = time.monotonic()
+
+    def run(job):
+        result = _render(*job)
+        time.sleep(config["PAUSE"])
+        return result
+
+    with ThreadPoolExecutor(max_workers=config["CONCURRENCY"], thread_name_prefix="warmup") as pool:
+        results = list(pool.map(run, jobs))
+
+    errors = sum(1 for status, _ in results if status is None or status >= 500)
+    return {"pages": len(results), "errors": errors, "seconds": round(time.monotonic() - started, 1)}
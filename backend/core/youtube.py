@@ -0,0 +1,229 @@
+# core/youtube.py
+"""
+Видео YouTube на главной: метаданные и локальные превью.
+
+Название, длительность и дата публикации берутся по youtube_id из
+клиента settings.YOUTUBE["CLIENT"] (локально — JSON-файл, на проде —
+YouTube Data API) и сохраняются в Video. Ответ клиента кэшируется
+на CACHE_TIMEOUT, так что ежедневная задача core.tasks.sync_video_metadata
+не ходит в API за уже известными роликами.
+
+Превью скачивается один раз, обрезается до 16:9 и хранится у нас
+(Video.cached_thumbnail): страница не тянет maxresdefault.jpg с YouTube.
+Плеер на странице не встраивается — вместо iframe кнопка-фасад
+(js/youtube-facade.js), которая подставляет iframe только по клику.
+"""
+import io
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+
+from .caching import get_or_build_many, invalidate
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "youtube:video:"
+THUMBNAIL_URL = "https://i.ytimg.com/vi/{id}/hqdefault.jpg"
+# Размер сохранённого превью: карточка на главной не шире 480px
+THUMBNAIL_SIZE = (480, 270)
+
+_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+@dataclass(frozen=True)
+class VideoMeta:
+    title: str
+    duration: int | None     # секунды
+    published_at: datetime | None
+
+
+def parse_duration(value):
+    """ISO 8601 из API ("PT1H2M3S") → секунды; None, если не разобрать."""
+    match = _DURATION_RE.match(value or "")
+    if not match:
+        return None
+    parts = {name: int(number or 0) for name, number in match.groupdict().items()}
+    return ((parts["days"] * 24 + parts["hours"]) * 60 + parts["minutes"]) * 60 + parts["seconds"]
+
+
+def format_duration(seconds):
+    """Секунды → "4:05" или "1:02:03"."""
+    if not seconds:
+        return ""
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+# --- Клиенты ---
+
+class VideoClient:
+    """Источник метаданных: fetch(ids) → {youtube_id: VideoMeta}; неизвестные id пропускаются."""
+    name = ""
+
+    def fetch(self, youtube_ids):
+        raise NotImplementedError
+
+    def thumbnail(self, youtube_id):
+        """Картинка превью (bytes) или None."""
+        response = requests.get(THUMBNAIL_URL.format(id=youtube_id), timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    @staticmethod
+    def parse_date(value):
+        published = parse_datetime(value) if value else None
+        if published and timezone.is_naive(published):
+            published = timezone.make_aware(published, dt_timezone.utc)
+        return published
+
+
+class FileVideoClient(VideoClient):
+    """Метаданные из JSON-файла {youtube_id: {title, duration, published_at}} — для разработки и тестов."""
+    name = "file"
+
+    def __init__(self, path, thumbnails=False):
+        self.path = path
+        self.thumbnails = thumbnails
+
+    def fetch(self, youtube_ids):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {
+            youtube_id: VideoMeta(
+                title=data[youtube_id].get("title", ""),
+                duration=parse_duration(data[youtube_id].get("duration")),
+                published_at=self.parse_date(data[youtube_id].get("published_at")),
+            )
+            for youtube_id in youtube_ids
+            if youtube_id in data
+        }
+
+    def thumbnail(self, youtube_id):
+        # Без сети локально превью не качаем — карточка возьмёт картинку с YouTube
+        return super().thumbnail(youtube_id) if self.thumbnails else None
+
+
+class DataApiClient(VideoClient):
+    """YouTube Data API v3: videos.list, до 50 id за запрос."""
+    name = "youtube"
+    URL = "https://www.googleapis.com/youtube/v3/videos"
+    BATCH = 50
+
+    def __init__(self, api_key, timeout=10):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def fetch(self, youtube_ids):
+        youtube_ids = list(youtube_ids)
+        result = {}
+        for start in range(0, len(youtube_ids), self.BATCH):
+            response = requests.get(self.URL, timeout=self.timeout, params={
+                "part": "snippet,contentDetails",
+                "id": ",".join(youtube_ids[start:start + self.BATCH]),
+                "key": self.api_key,
+            })
+            response.raise_for_status()
+            for item in response.json().get("items", []):
+                snippet = item.get("snippet", {})
+                result[item["id"]] = VideoMeta(
+                    title=snippet.get("title", ""),
+                    duration=parse_duration(item.get("contentDetails", {}).get("duration")),
+                    published_at=self.parse_date(snippet.get("publishedAt")),
+                )
+        return result
+
+
+def get_client():
+    config = settings.YOUTUBE
+    return import_string(config["CLIENT"])(**config.get("OPTIONS", {}))
+
+
+# --- Синхронизация ---
+
+def get_metadata(youtube_ids, client=None):
+    """Метаданные из кэша, недостающие — одним вызовом клиента."""
+    client = client or get_client()
+
+    def fetch(missing):
+        fetched = client.fetch(sorted(missing.values()))
+        return {CACHE_PREFIX + youtube_id: meta for youtube_id, meta in fetched.items()}
+
+    cached = get_or_build_many(
+        {CACHE_PREFIX + youtube_id: youtube_id for youtube_id in set(youtube_ids)},
+        fetch, settings.YOUTUBE["CACHE_TIMEOUT"],
+    )
+    return {key[len(CACHE_PREFIX):]: meta for key, meta in cached.items()}
+
+
+def make_thumbnail(data):
+    """Картинка YouTube (4:3 с полосами у hqdefault) → JPEG 16:9 размера THUMBNAIL_SIZE."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.fit(image.convert("RGB"), THUMBNAIL_SIZE, Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=80, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def sync_videos(queryset=None, client=None, force=False):
+    """
+    Записать метаданные и превью в Video (по умолчанию — все активные).
+
+    force — не брать метаданные из кэша.
+
+    Returns:
+        int: число обновлённых видео.
+    """
+    from .models import Video
+
+    client = client or get_client()
+    videos = list(queryset if queryset is not None else Video.objects.filter(is_active=True))
+    if not videos:
+        return 0
+    youtube_ids = {video.youtube_id for video in videos}
+    if force:
+        invalidate(*(CACHE_PREFIX + youtube_id for youtube_id in youtube_ids))
+    metadata = get_metadata(youtube_ids, client)
+
+    now = timezone.now()
+    updated = []
+    for video in videos:
+        meta = metadata.get(video.youtube_id)
+        if meta is None:
+            logger.warning(f"YouTube video {video.youtube_id} not found by {client.name}")
+            continue
+        video.youtube_title = meta.title[:255]
+        video.duration = meta.duration
+        video.published_at = meta.published_at
+        video.synced_at = now
+        if not video.cached_thumbnail:
+            _store_thumbnail(video, client)
+        updated.append(video)
+
+    Video.objects.bulk_update(
+        updated, ["youtube_title", "duration", "published_at", "synced_at", "cached_thumbnail"]
+    )
+    return len(updated)
+
+
+def _store_thumbnail(video, client):
+    try:
+        data = client.thumbnail(video.youtube_id)
+        if data:
+            video.cached_thumbnail.save(f"{video.youtube_id}.jpg", ContentFile(make_thumbnail(data)), save=False)
+    except Exception as e:
+        # Без локального превью карточка покажет картинку с YouTube
+        logger.warning(f"YouTube thumbnail {video.youtube_id} failed: {e}")
@@ -1,4 +1,8 @@
 from django.contrib import admin
+
+from core.exports import ExportMixin
+from core.fastadmin import FastAdminMixin
+from core.previews import ImagePreview
 from .models import Developer, DeveloperCategory, DeveloperReview
 
 
@@ -9,27 +13,50 @@ class DeveloperCategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Developer)
-class DeveloperAdmin(admin.ModelAdmin):
-    list_display = ["name", "category", "rating", "completed_count", "is_verified", "is_active"]
+class DeveloperAdmin(FastAdminMixin, ExportMixin, admin.ModelAdmin):
+    list_display = ["preview", "name", "category", "rating", "completed_count", "is_verified", "is_active"]
+    list_display_links = ["preview", "name"]
     list_filter = ["category", "is_verified", "is_active"]
     search_fields = ["name", "short_description"]
     prepopulated_fields = {"slug": ("name",)}
+    # Рейтинги считаются по одобренным отзывам (developers/rating.py)
+    readonly_fields = [
+        "logo_preview", "cover_preview",
+        "rating", "premium_rating", "support_rating", "quality_rating",
+        "approved_reviews_count", "category_rank",
+    ]
+    export_fields = [
+        "id", "name", "category__name", "rating", "approved_reviews_count", "completed_count", "in_progress_count",
+        "website", "telegram", "whatsapp", "instagram", "is_verified", "is_active",
+    ]
+
+    preview = ImagePreview("logo", description="Логотип")
+    logo_preview = ImagePreview("logo", alias="admin_preview")
+    cover_preview = ImagePreview("cover_image", alias="admin_preview")
     
     fieldsets = (
         (None, {
             "fields": ("name", "slug", "category", "is_verified", "is_active")
         }),
         ("Медиа", {
-            "fields": ("logo", "cover_image")
+            "fields": ("logo", "logo_preview", "cover_image", "cover_preview")
         }),
         ("Описание", {
             "fields": ("short_description", "description")
         }),
+        ("Перевод (EN)", {
+            "fields": ("short_description_en", "description_en"),
+            "classes": ("collapse",),
+            "description": "Пустое поле — на английской версии показывается русский текст.",
+        }),
         ("Статистика", {
             "fields": ("completed_count", "in_progress_count")
         }),
         ("Рейтинги", {
-            "fields": ("rating", "premium_rating", "support_rating", "quality_rating")
+            "fields": (
+                "rating", "premium_rating", "support_rating", "quality_rating",
+                "approved_reviews_count", "category_rank",
+            )
         }),
         ("Контакты", {
             "fields": ("website", "telegram", "whatsapp", "instagram")
@@ -38,7 +65,7 @@ class DeveloperAdmin(admin.ModelAdmin):
 
 
 @admin.register(DeveloperReview)
-class DeveloperReviewAdmin(admin.ModelAdmin):
+class DeveloperReviewAdmin(FastAdminMixin, admin.ModelAdmin):
     list_display = ["user_name", "developer", "rating", "is_approved", "created_at"]
     list_filter = ["is_approved", "rating", "created_at"]
     search_fields = ["user_name", "text", "developer__name"]
@@ -47,6 +74,10 @@ class DeveloperReviewAdmin(admin.ModelAdmin):
         (None, {
             "fields": ("developer", "user_name", "user_avatar", "user_avatar_url", "rating", "text")
         }),
+        ("Оценки по аспектам", {
+            "fields": ("premium_score", "support_score", "quality_score"),
+            "classes": ("collapse",),
+        }),
         ("Модерация", {
             "fields": ("is_approved", "user")
         }),
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class DevelopersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'developers'
-    verbose_name = 'Застройщики'
\ No newline at end of file
+    verbose_name = 'Застройщики'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
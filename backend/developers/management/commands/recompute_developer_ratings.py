@@ -0,0 +1,15 @@
+# developers/management/commands/recompute_developer_ratings.py
+from django.core.management.base import BaseCommand
+
+from developers.rating import recompute_all
+
+
+class Command(BaseCommand):
+    help = "Полный пересчёт рейтингов и мест застройщиков по одобренным отзывам"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = recompute_all(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Обновлено застройщиков: {changed}"))
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("developers", "0002_developerreview_user_avatar_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeveloperRatingStats",
+            fields=[
+                (
+                    "developer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_stats",
+                        serialize=False,
+                        to="developers.developer",
+                    ),
+                ),
+                (
+                    "review_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Отзывов"),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Байесовская оценка"
+                    ),
+                ),
+                ("weight_sum", models.FloatField(default=0)),
+                ("score_sum", models.FloatField(default=0)),
+                ("premium_weight", models.FloatField(default=0)),
+                ("premium_sum", models.FloatField(default=0)),
+                ("support_weight", models.FloatField(default=0)),
+                ("support_sum", models.FloatField(default=0)),
+                ("quality_weight", models.FloatField(default=0)),
+                ("quality_sum", models.FloatField(default=0)),
+            ],
+            options={
+                "verbose_name": "Статистика рейтинга",
+                "verbose_name_plural": "Статистика рейтингов",
+            },
+        ),
+        migrations.AddField(
+            model_name="developer",
+            name="approved_reviews_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Одобренных отзывов"
+            ),
+        ),
+        migrations.AddField(
+            model_name="developer",
+            name="category_rank",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Место в категории"
+            ),
+        ),
+        migrations.AddField(
+            model_name="developerreview",
+            name="premium_score",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[(1, "1"), (2, "2"), (3, "3"), (4, "4"), (5, "5")],
+                null=True,
+                verbose_name="Премиальность",
+            ),
+        ),
+        migrations.AddField(
+            model_name="developerreview",
+            name="quality_score",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[(1, "1"), (2, "2"), (3, "3"), (4, "4"), (5, "5")],
+                null=True,
+                verbose_name="Качество",
+            ),
+        ),
+        migrations.AddField(
+            model_name="developerreview",
+            name="support_score",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[(1, "1"), (2, "2"), (3, "3"), (4, "4"), (5, "5")],
+                null=True,
+                verbose_name="Поддержка",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="developer",
+            index=models.Index(
+                fields=["category", "category_rank"], name="developer_category_rank_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="developer",
+            index=models.Index(
+                fields=["is_active", "-rating"], name="developer_active_rating_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("developers", "0003_rating_engine"),
+    ]
+
+    operations = [
+        # GIN-индекс для полнотекстового поиска в админке; только PostgreSQL
+        search_index_operation("developers", "developerreview", "dev_review_search_idx", ["user_name", "text"]),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("developers", "0004_admin_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="developer",
+            name="description_en",
+            field=models.TextField(
+                blank=True, verbose_name="Полное описание (HTML, EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="developer",
+            name="short_description_en",
+            field=models.TextField(
+                blank=True, max_length=500, verbose_name="Краткое описание (EN)"
+            ),
+        ),
+    ]
@@ -2,6 +2,9 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from core.projections import CardProjectionMixin, CardQuerySet
+from core.translation import TranslatableMixin
+
 
 class DeveloperCategory(models.Model):
     """Категории: Премиум, Бизнес+, Средний"""
@@ -19,8 +22,19 @@ class DeveloperCategory(models.Model):
         return self.name
 
 
-class Developer(models.Model):
+class Developer(TranslatableMixin, CardProjectionMixin, models.Model):
     """Застройщик"""
+    # Колонки для карточек в списках и блоках (без тяжёлого description)
+    CARD_FIELDS = (
+        "name", "slug", "category", "logo", "short_description",
+        "completed_count", "in_progress_count", "rating",
+        "approved_reviews_count", "category_rank", "website",
+        "is_verified", "is_active",
+    )
+    CARD_RELATED = {"category": ("name", "slug")}
+    # Поля с переводом в колонках <поле>_en (core/translation.py)
+    TRANSLATED_FIELDS = ("short_description", "description")
+
     name = models.CharField("Название", max_length=255)
     slug = models.SlugField(unique=True, blank=True)
     
@@ -34,16 +48,22 @@ class Developer(models.Model):
     
     short_description = models.TextField("Краткое описание", max_length=500, blank=True)
     description = models.TextField("Полное описание (HTML)", blank=True)
+
+    # Перевод (пусто — показывается русский текст)
+    short_description_en = models.TextField("Краткое описание (EN)", max_length=500, blank=True)
+    description_en = models.TextField("Полное описание (HTML, EN)", blank=True)
     
     # Статистика
     completed_count = models.PositiveIntegerField("Сдано объектов", default=0)
     in_progress_count = models.PositiveIntegerField("Строится", default=0)
     
-    # Рейтинги (1-5)
+    # Рейтинги (1-5) — считаются по одобренным отзывам, см. developers/rating.py
     rating = models.DecimalField("Общий рейтинг", max_digits=2, decimal_places=1, default=5.0)
     premium_rating = models.PositiveSmallIntegerField("Премиальность", default=5)
     support_rating = models.PositiveSmallIntegerField("Поддержка", default=5)
     quality_rating = models.PositiveSmallIntegerField("Качество", default=5)
+    approved_reviews_count = models.PositiveIntegerField("Одобренных отзывов", default=0, editable=False)
+    category_rank = models.PositiveIntegerField("Место в категории", null=True, blank=True, editable=False)
     
     # Контакты
     website = models.URLField("Сайт", blank=True)
@@ -57,10 +77,16 @@ class Developer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Застройщик"
         verbose_name_plural = "Застройщики"
         ordering = ["-rating", "name"]
+        indexes = [
+            models.Index(fields=["category", "category_rank"], name="developer_category_rank_idx"),
+            models.Index(fields=["is_active", "-rating"], name="developer_active_rating_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -79,11 +105,46 @@ class Developer(models.Model):
 
     @property
     def reviews_count(self):
-        return self.reviews.count()
+        return self.approved_reviews_count
+
 
+class DeveloperRatingStats(models.Model):
+    """Накопленные суммы одобренных отзывов для инкрементального пересчёта рейтинга"""
+    developer = models.OneToOneField(
+        Developer, on_delete=models.CASCADE,
+        primary_key=True, related_name="rating_stats"
+    )
+    review_count = models.PositiveIntegerField("Отзывов", default=0)
+    score = models.FloatField("Байесовская оценка", null=True, blank=True)
+
+    weight_sum = models.FloatField(default=0)
+    score_sum = models.FloatField(default=0)
+    premium_weight = models.FloatField(default=0)
+    premium_sum = models.FloatField(default=0)
+    support_weight = models.FloatField(default=0)
+    support_sum = models.FloatField(default=0)
+    quality_weight = models.FloatField(default=0)
+    quality_sum = models.FloatField(default=0)
 
-class DeveloperReview(models.Model):
+    class Meta:
+        verbose_name = "Статистика рейтинга"
+        verbose_name_plural = "Статистика рейтингов"
+
+    def __str__(self):
+        return f"{self.developer_id}: {self.score}"
+
+
+class DeveloperReview(CardProjectionMixin, models.Model):
     """Отзыв о застройщике"""
+    SCORE_CHOICES = [(i, str(i)) for i in range(1, 6)]
+    CARD_FIELDS = (
+        "developer", "user_name", "user_avatar", "user_avatar_url",
+        "rating", "text", "is_approved", "created_at",
+    )
+    CARD_RELATED = {"developer": ("name", "slug", "logo")}
+    # Полнотекстовый поиск в админке (core/search.py, индекс — миграция 0004)
+    SEARCH_FIELDS = ("user_name", "text")
+
     developer = models.ForeignKey(Developer, on_delete=models.CASCADE, related_name="reviews")
     user = models.ForeignKey("accounts.User", on_delete=models.SET_NULL, null=True, blank=True)
     
@@ -91,12 +152,17 @@ class DeveloperReview(models.Model):
     user_avatar = models.ImageField("Аватар", upload_to="reviews/avatars/", blank=True)
     user_avatar_url = models.URLField("Или ссылка на аватар", max_length=500, blank=True)
     
-    rating = models.PositiveSmallIntegerField("Оценка", choices=[(i, str(i)) for i in range(1, 6)])
+    rating = models.PositiveSmallIntegerField("Оценка", choices=SCORE_CHOICES)
+    premium_score = models.PositiveSmallIntegerField("Премиальность", choices=SCORE_CHOICES, null=True, blank=True)
+    support_score = models.PositiveSmallIntegerField("Поддержка", choices=SCORE_CHOICES, null=True, blank=True)
+    quality_score = models.PositiveSmallIntegerField("Качество", choices=SCORE_CHOICES, null=True, blank=True)
     text = models.TextField("Текст отзыва")
     
     is_approved = models.BooleanField("Одобрен", default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
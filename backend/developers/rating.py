@@ -0,0 +1,250 @@
+# developers/rating.py
+"""
+Рейтинг застройщиков по одобренным отзывам.
+
+Оценка — взвешенное байесовское среднее:
+
+    score = (C * m + Σ w_i * r_i) / (C + Σ w_i)
+
+где m — априорная оценка, C — вес априора, w_i — вес отзыва
+(отзыв зарегистрированного пользователя весит больше анонимного).
+Так у застройщика с одним отзывом «5» рейтинг не обгоняет
+застройщика с сотней отзывов «4.8».
+
+Два режима:
+    * инкрементальный — при одобрении/снятии/удалении отзыва к суммам
+      в DeveloperRatingStats прибавляется (или вычитается) его вклад,
+      без повторной агрегации всех отзывов;
+    * полный пересчёт (recompute_all) — векторизованно через NumPy
+      по всем застройщикам, для ночной сверки.
+
+После пересчёта обновляется Developer.category_rank, поэтому блок
+рейтинга читает готовый порядок по индексу (category, category_rank).
+"""
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+# Поля аспектов: (поле в отзыве, поле суммы весов, поле суммы оценок, поле застройщика)
+ASPECTS = (
+    ("rating", "weight_sum", "score_sum", "rating"),
+    ("premium_score", "premium_weight", "premium_sum", "premium_rating"),
+    ("support_score", "support_weight", "support_sum", "support_rating"),
+    ("quality_score", "quality_weight", "quality_sum", "quality_rating"),
+)
+
+DEFAULTS = {
+    "PRIOR_MEAN": 4.0,
+    "PRIOR_WEIGHT": 5.0,
+    "VERIFIED_WEIGHT": 1.0,
+    "ANONYMOUS_WEIGHT": 0.5,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "DEVELOPER_RATING", {})}
+
+
+def bayesian(score_sum, weight_sum, config=None):
+    """Байесовское среднее; работает и со скалярами, и с массивами NumPy."""
+    config = config or get_config()
+    prior_weight = config["PRIOR_WEIGHT"]
+    return (prior_weight * config["PRIOR_MEAN"] + score_sum) / (prior_weight + weight_sum)
+
+
+def review_weight(user_id, config=None):
+    config = config or get_config()
+    return config["VERIFIED_WEIGHT"] if user_id else config["ANONYMOUS_WEIGHT"]
+
+
+def contribution(review, config=None):
+    """
+    Вклад отзыва в суммы застройщика.
+
+    Returns:
+        dict {поле_статистики: приращение} или None, если отзыв не учитывается.
+    """
+    if not review or not review.is_approved or not review.developer_id:
+        return None
+    weight = review_weight(review.user_id, config)
+    delta = {"review_count": 1}
+    for review_field, weight_field, sum_field, _ in ASPECTS:
+        value = getattr(review, review_field)
+        if value:
+            delta[weight_field] = weight
+            delta[sum_field] = weight * value
+    return delta
+
+
+def _developer_values(stats, config):
+    """Значения полей Developer по строке статистики."""
+    values = {"approved_reviews_count": stats.review_count}
+    for _, weight_field, sum_field, developer_field in ASPECTS:
+        score = bayesian(getattr(stats, sum_field), getattr(stats, weight_field), config)
+        if developer_field == "rating":
+            values[developer_field] = Decimal(str(round(score, 1)))
+        else:
+            values[developer_field] = int(round(score))
+    return values
+
+
+def initial_values():
+    """Рейтинги застройщика без отзывов (априорные)."""
+    from .models import DeveloperRatingStats
+
+    return _developer_values(DeveloperRatingStats(), get_config())
+
+
+def apply_delta(developer_id, delta, sign=1):
+    """Прибавить (sign=1) или вычесть (sign=-1) вклад отзыва и обновить застройщика."""
+    from .models import Developer, DeveloperRatingStats
+
+    if not delta:
+        return
+    with transaction.atomic():
+        updates = {field: F(field) + sign * value for field, value in delta.items()}
+        updated = DeveloperRatingStats.objects.filter(developer_id=developer_id).update(**updates)
+        if not updated:
+            if sign < 0 or not Developer.objects.filter(pk=developer_id).exists():
+                return
+            DeveloperRatingStats.objects.create(developer_id=developer_id, **delta)
+        refresh_developer(developer_id)
+
+
+def refresh_developer(developer_id):
+    """Пересчитать рейтинги одного застройщика по уже накопленным суммам."""
+    from .models import Developer, DeveloperRatingStats
+
+    config = get_config()
+    stats, _ = DeveloperRatingStats.objects.get_or_create(developer_id=developer_id)
+    stats.score = float(bayesian(stats.score_sum, stats.weight_sum, config))
+    stats.save(update_fields=["score"])
+    Developer.objects.filter(pk=developer_id).update(**_developer_values(stats, config))
+
+    category_id = Developer.objects.filter(pk=developer_id).values_list("category_id", flat=True).first()
+    update_category_ranks(category_id)
+
+
+def update_category_ranks(category_id):
+    """
+    Перенумеровать category_rank внутри одной категории.
+
+    Один SELECT по категории и bulk_update только тех строк,
+    чья позиция изменилась (обычно две-три).
+    """
+    from .models import Developer
+
+    rows = (
+        Developer.objects.filter(category_id=category_id, is_active=True)
+        .order_by(F("rating_stats__score").desc(nulls_last=True), "-approved_reviews_count", "pk")
+        .values_list("pk", "category_rank")
+    )
+    changed = [
+        Developer(pk=pk, category_rank=position)
+        for position, (pk, current) in enumerate(rows, start=1)
+        if current != position
+    ]
+    if changed:
+        Developer.objects.bulk_update(changed, ["category_rank"], batch_size=1000)
+    Developer.objects.filter(
+        category_id=category_id, is_active=False, category_rank__isnull=False
+    ).update(category_rank=None)
+
+
+def recompute_all(batch_size=1000):
+    """
+    Полный векторизованный пересчёт рейтингов всех застройщиков.
+
+    Returns:
+        int: число застройщиков, у которых изменились рейтинг или позиция.
+    """
+    from .models import Developer, DeveloperRatingStats, DeveloperReview
+
+    config = get_config()
+    developers = list(
+        Developer.objects.order_by("pk").values_list(
+            "pk", "category_id", "is_active", "rating", "premium_rating",
+            "support_rating", "quality_rating", "approved_reviews_count", "category_rank",
+        )
+    )
+    if not developers:
+        return 0
+    dev_ids = np.array([row[0] for row in developers], dtype=np.int64)
+    n = len(dev_ids)
+
+    reviews = np.array(
+        list(
+            DeveloperReview.objects.filter(is_approved=True).values_list(
+                "developer_id", "rating", "premium_score", "support_score", "quality_score", "user_id",
+            ).iterator(chunk_size=10_000)
+        ),
+        dtype=float,
+    ).reshape(-1, 6)
+
+    index = np.searchsorted(dev_ids, reviews[:, 0].astype(np.int64))
+    weights = np.where(
+        np.isnan(reviews[:, 5]), config["ANONYMOUS_WEIGHT"], config["VERIFIED_WEIGHT"]
+    )
+    counts = np.bincount(index, minlength=n)
+
+    sums = {}
+    scores = {}
+    for column, (_, weight_field, sum_field, developer_field) in enumerate(ASPECTS, start=1):
+        values = reviews[:, column]
+        present = ~np.isnan(values)
+        weight_sum = np.bincount(index[present], weights=weights[present], minlength=n)
+        score_sum = np.bincount(index[present], weights=(weights * np.nan_to_num(values))[present], minlength=n)
+        sums[weight_field] = weight_sum
+        sums[sum_field] = score_sum
+        scores[developer_field] = bayesian(score_sum, weight_sum, config)
+
+    # Позиции внутри категории: сортировка по (категория, -score, -count, pk)
+    category = np.array([row[1] if row[1] is not None else -1 for row in developers], dtype=np.int64)
+    active = np.array([row[2] for row in developers], dtype=bool)
+    overall = scores["rating"]
+    order = np.lexsort((dev_ids, -counts, -overall, category))
+    order = order[active[order]]
+    ranks = np.zeros(n, dtype=np.int64)
+    sorted_categories = category[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(sorted_categories)) + 1]
+    group_sizes = np.diff(np.r_[group_start, len(order)])
+    ranks[order] = np.arange(len(order)) - np.repeat(group_start, group_sizes) + 1
+
+    stats_rows = [
+        DeveloperRatingStats(
+            developer_id=int(dev_ids[i]),
+            review_count=int(counts[i]),
+            score=float(overall[i]),
+            **{field: float(values[i]) for field, values in sums.items()},
+        )
+        for i in range(n)
+    ]
+
+    changed = []
+    for i, row in enumerate(developers):
+        rating = Decimal(str(round(float(overall[i]), 1)))
+        premium, support, quality = (int(round(float(scores[f][i]))) for f in
+                                     ("premium_rating", "support_rating", "quality_rating"))
+        rank = int(ranks[i]) if active[i] else None
+        if (rating, premium, support, quality, int(counts[i]), rank) != tuple(row[3:9]):
+            changed.append(Developer(
+                pk=row[0], rating=rating, premium_rating=premium, support_rating=support,
+                quality_rating=quality, approved_reviews_count=int(counts[i]), category_rank=rank,
+            ))
+
+    stats_fields = ["review_count", "score"] + list(sums)
+    with transaction.atomic():
+        DeveloperRatingStats.objects.bulk_create(
+            stats_rows, batch_size=batch_size,
+            update_conflicts=True, unique_fields=["developer"], update_fields=stats_fields,
+        )
+        Developer.objects.bulk_update(
+            changed,
+            ["rating", "premium_rating", "support_rating", "quality_rating",
+             "approved_reviews_count", "category_rank"],
+            batch_size=batch_size,
+        )
+    return len(changed)
@@ -0,0 +1,71 @@
+# developers/signals.py
+"""Инкрементальное обновление рейтинга при изменении отзывов и застройщиков."""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import rating
+from .models import Developer, DeveloperReview
+
+
+@receiver(pre_save, sender=DeveloperReview)
+def remember_review_contribution(sender, instance, raw=False, **kwargs):
+    """Запомнить вклад отзыва до сохранения, чтобы применить только разницу."""
+    if raw or not instance.pk:
+        instance._rating_before = None
+        return
+    previous = DeveloperReview.objects.filter(pk=instance.pk).only(
+        "developer_id", "user_id", "is_approved", "rating",
+        "premium_score", "support_score", "quality_score",
+    ).first()
+    instance._rating_before = (
+        (previous.developer_id, rating.contribution(previous)) if previous else None
+    )
+
+
+@receiver(post_save, sender=DeveloperReview)
+def apply_review_contribution(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_rating_before", None)
+    after = (instance.developer_id, rating.contribution(instance))
+    if before == after:
+        return
+    if before and before[1]:
+        rating.apply_delta(before[0], before[1], sign=-1)
+    if after[1]:
+        rating.apply_delta(after[0], after[1], sign=1)
+
+
+@receiver(post_delete, sender=DeveloperReview)
+def remove_review_contribution(sender, instance, **kwargs):
+    delta = rating.contribution(instance)
+    if delta:
+        rating.apply_delta(instance.developer_id, delta, sign=-1)
+
+
+@receiver(pre_save, sender=Developer)
+def remember_developer_ranking(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if not instance.pk:
+        instance._ranking_before = None
+        for field, value in rating.initial_values().items():
+            setattr(instance, field, value)
+        return
+    instance._ranking_before = (
+        Developer.objects.filter(pk=instance.pk).values_list("category_id", "is_active").first()
+    )
+
+
+@receiver(post_save, sender=Developer)
+def update_developer_ranking(sender, instance, created, raw=False, **kwargs):
+    """Новый застройщик получает априорный рейтинг; смена категории/активности — пересчёт мест."""
+    if raw:
+        return
+    if created:
+        rating.refresh_developer(instance.pk)
+        return
+    before = getattr(instance, "_ranking_before", None)
+    if before and before != (instance.category_id, instance.is_active):
+        rating.update_category_ranks(before[0])
+        rating.update_category_ranks(instance.category_id)
@@ -0,0 +1,16 @@
+# developers/tasks.py
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def recompute_developer_ratings():
+    """Ночная сверка рейтингов застройщиков (полный векторизованный пересчёт)."""
+    from .rating import recompute_all
+
+    changed = recompute_all()
+    logger.info(f"Developer ratings recomputed, {changed} developers changed")
+    return changed
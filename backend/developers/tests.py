@@ -0,0 +1,110 @@
+# developers/tests.py
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from . import rating
+from .models import Developer, DeveloperCategory, DeveloperRatingStats, DeveloperReview
+
+STATS_FIELDS = (
+    "review_count", "weight_sum", "score_sum", "premium_weight", "premium_sum",
+    "support_weight", "support_sum", "quality_weight", "quality_sum",
+)
+DEVELOPER_FIELDS = (
+    "rating", "premium_rating", "support_rating", "quality_rating",
+    "approved_reviews_count", "category_rank",
+)
+
+
+class RatingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.premium = DeveloperCategory.objects.create(name="Премиум", slug="premium")
+        cls.middle = DeveloperCategory.objects.create(name="Средний", slug="middle")
+        cls.user = get_user_model().objects.create_user(email="user@example.com", password="x", first_name="Имя")
+        cls.alpha = Developer.objects.create(name="Alpha", slug="alpha", category=cls.premium)
+        cls.beta = Developer.objects.create(name="Beta", slug="beta", category=cls.premium)
+        cls.gamma = Developer.objects.create(name="Gamma", slug="gamma", category=cls.middle)
+
+    def review(self, developer, score, user=None, approved=True, **aspects):
+        return DeveloperReview.objects.create(
+            developer=developer, user=user, user_name="Гость", text="Отзыв",
+            rating=score, is_approved=approved, **aspects,
+        )
+
+    def snapshot(self):
+        developers = {
+            pk: values for pk, *values in Developer.objects.values_list("pk", *DEVELOPER_FIELDS)
+        }
+        stats = {
+            row[0]: row[1:] for row in DeveloperRatingStats.objects.values_list("developer_id", *STATS_FIELDS)
+        }
+        return developers, stats
+
+    def test_new_developer_gets_prior(self):
+        self.alpha.refresh_from_db()
+        self.assertEqual(self.alpha.rating, Decimal("4.0"))
+        self.assertEqual(self.alpha.approved_reviews_count, 0)
+
+    def test_bayesian_pulls_single_review_to_prior(self):
+        self.review(self.alpha, 5, user=self.user)
+        self.alpha.refresh_from_db()
+        # (5 * 4.0 + 1.0 * 5) / (5 + 1.0)
+        self.assertEqual(self.alpha.rating, Decimal("4.2"))
+        self.assertEqual(self.alpha.approved_reviews_count, 1)
+
+    def test_anonymous_review_weighs_less(self):
+        self.review(self.alpha, 5, user=self.user)
+        self.review(self.beta, 5)
+        self.assertGreater(
+            DeveloperRatingStats.objects.get(developer=self.alpha).score,
+            DeveloperRatingStats.objects.get(developer=self.beta).score,
+        )
+
+    def test_unapproved_review_is_ignored_until_approved(self):
+        review = self.review(self.alpha, 1, approved=False)
+        self.alpha.refresh_from_db()
+        self.assertEqual(self.alpha.approved_reviews_count, 0)
+
+        review.is_approved = True
+        review.save()
+        self.alpha.refresh_from_db()
+        self.assertEqual(self.alpha.approved_reviews_count, 1)
+        self.assertLess(self.alpha.rating, Decimal("4.0"))
+
+    def test_category_rank_follows_score(self):
+        self.review(self.beta, 5, user=self.user)
+        self.alpha.refresh_from_db()
+        self.beta.refresh_from_db()
+        self.assertEqual((self.beta.category_rank, self.alpha.category_rank), (1, 2))
+
+        self.beta.is_active = False
+        self.beta.save()
+        self.alpha.refresh_from_db()
+        self.beta.refresh_from_db()
+        self.assertEqual((self.alpha.category_rank, self.beta.category_rank), (1, None))
+
+    def test_incremental_matches_full_recompute(self):
+        kept = self.review(self.alpha, 5, user=self.user, premium_score=4, quality_score=5)
+        self.review(self.alpha, 3, support_score=2)
+        edited = self.review(self.beta, 2, user=self.user, premium_score=1)
+        moved = self.review(self.beta, 4)
+        removed = self.review(self.gamma, 1, user=self.user)
+        hidden = self.review(self.gamma, 5, support_score=5)
+        self.review(self.gamma, 4, approved=False)
+
+        edited.rating = 5
+        edited.quality_score = 3
+        edited.save()
+        moved.developer = self.gamma
+        moved.save()
+        hidden.is_approved = False
+        hidden.save()
+        removed.delete()
+        kept.premium_score = None
+        kept.save()
+
+        incremental = self.snapshot()
+        self.assertEqual(rating.recompute_all(), 0)
+        self.assertEqual(self.snapshot(), incremental)
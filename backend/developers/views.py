@@ -1,10 +1,14 @@
 from django.shortcuts import render, get_object_or_404
-from .models import Developer, DeveloperCategory
+from properties.models import Property
+
+from core import reference
+
+from .models import Developer
 
 
 def developer_list(request):
-    developers = Developer.objects.filter(is_active=True).select_related('category')
-    categories = DeveloperCategory.objects.all()
+    developers = Developer.objects.cards().filter(is_active=True)
+    categories = reference.developer_categories()
     
     # Фильтр по категории
     category_slug = request.GET.get('category')
@@ -19,8 +23,8 @@ def developer_list(request):
 
 
 def developer_detail(request, slug):
-    developer = get_object_or_404(Developer, slug=slug, is_active=True)
-    properties = developer.properties.filter(is_active=True)[:6]
+    developer = get_object_or_404(Developer.objects.translated(), slug=slug, is_active=True)
+    properties = Property.objects.cards().filter(developer=developer, is_active=True)[:6]
     reviews = developer.reviews.filter(is_approved=True)
     
     return render(request, 'developers/developer_detail.html', {
@@ -23,4 +23,9 @@ class EventAdmin(admin.ModelAdmin):
         ("Организатор", {
             "fields": ("organizer_name", "organizer", "registration_url")
         }),
+        ("Перевод (EN)", {
+            "fields": ("title_en", "short_description_en", "description_en", "location_name_en"),
+            "classes": ("collapse",),
+            "description": "Пустое поле — на английской версии показывается русский текст.",
+        }),
     )
\ No newline at end of file
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:04
+
+import math
+
+from django.db import migrations, models
+
+
+def fill_geo_cells(apps, schema_editor):
+    """Ячейки сетки для уже заведённых мероприятий (шаг 0.01°, как в core/geo.py)."""
+    Event = apps.get_model("events", "Event")
+    events = list(Event.objects.filter(latitude__isnull=False, longitude__isnull=False))
+    for event in events:
+        row = math.floor((float(event.latitude) + 90) / 0.01)
+        col = math.floor((float(event.longitude) + 180) / 0.01)
+        event.geo_cell = row * 36000 + min(col, 35999)
+    Event.objects.bulk_update(events, ["geo_cell"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="geo_cell",
+            field=models.BigIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Ячейка сетки",
+            ),
+        ),
+        migrations.RunPython(fill_geo_cells, migrations.RunPython.noop),
+    ]
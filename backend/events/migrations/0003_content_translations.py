@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_geo_grid"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="description_en",
+            field=models.TextField(
+                blank=True, verbose_name="Полное описание (HTML, EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="location_name_en",
+            field=models.CharField(
+                blank=True, max_length=100, verbose_name="Место (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="short_description_en",
+            field=models.TextField(
+                blank=True, max_length=300, verbose_name="Краткое описание (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="title_en",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Название (EN)"
+            ),
+        ),
+    ]
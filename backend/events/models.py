@@ -2,9 +2,19 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from core.geo import GeoPointMixin
+from core.projections import CardProjectionMixin, CardQuerySet
+from core.translation import TranslatableMixin
 
-class Event(models.Model):
+
+class Event(TranslatableMixin, CardProjectionMixin, GeoPointMixin):
     """Мероприятие"""
+    CARD_FIELDS = (
+        "title", "slug", "image", "short_description", "event_date", "end_date",
+        "location_name", "latitude", "longitude", "status", "is_featured",
+    )
+    # Поля с переводом в колонках <поле>_en (core/translation.py)
+    TRANSLATED_FIELDS = ("title", "short_description", "description", "location_name")
     
     class Status(models.TextChoices):
         UPCOMING = "upcoming", "Предстоящее"
@@ -19,6 +29,12 @@ class Event(models.Model):
     # Контент
     short_description = models.TextField("Краткое описание", max_length=300, blank=True)
     description = models.TextField("Полное описание (HTML)")
+
+    # Перевод (пусто — показывается русский текст)
+    title_en = models.CharField("Название (EN)", max_length=255, blank=True)
+    short_description_en = models.TextField("Краткое описание (EN)", max_length=300, blank=True)
+    description_en = models.TextField("Полное описание (HTML, EN)", blank=True)
+    location_name_en = models.CharField("Место (EN)", max_length=100, blank=True)
     
     # Время и место
     event_date = models.DateTimeField("Дата и время")
@@ -27,9 +43,7 @@ class Event(models.Model):
     location_name = models.CharField("Место", max_length=100)  # "Букит, Бали"
     address = models.CharField("Полный адрес", max_length=255, blank=True)
     
-    # Координаты для карты
-    latitude = models.DecimalField("Широта", max_digits=9, decimal_places=6, null=True, blank=True)
-    longitude = models.DecimalField("Долгота", max_digits=9, decimal_places=6, null=True, blank=True)
+    # Координаты для карты: latitude/longitude/geo_cell из GeoPointMixin
     
     # Организатор
     organizer_name = models.CharField("Организатор", max_length=255, blank=True)
@@ -47,6 +61,8 @@ class Event(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Мероприятие"
         verbose_name_plural = "Мероприятия"
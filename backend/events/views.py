@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
 from django.utils import timezone
+from core.warmup import fragment_cache
 from .models import Event
 
 
@@ -12,11 +13,11 @@ def event_list(request):
     
     if sort == 'past':
         # Прошедшие
-        events = Event.objects.filter(event_date__lt=now).order_by('-event_date')
+        events = Event.objects.cards().filter(event_date__lt=now).order_by('-event_date')
         active_tab = 'past'
     else:
         # Предстоящие
-        events = Event.objects.filter(event_date__gte=now).order_by('event_date')
+        events = Event.objects.cards().filter(event_date__gte=now).order_by('event_date')
         active_tab = 'upcoming'
     
     paginator = Paginator(events, 9)
@@ -26,15 +27,18 @@ def event_list(request):
         'events': page_obj,
         'page_obj': page_obj,
         'active_tab': active_tab,
+        # Сетка кэшируется в шаблоне до смены контента (core/warmup.py)
+        'fragment_cache': fragment_cache(),
     })
 
 
 def event_detail(request, slug):
     """Детальная страница мероприятия"""
-    event = get_object_or_404(Event, slug=slug)
-    related = Event.objects.filter(status='upcoming').exclude(pk=event.pk)[:3]
+    event = get_object_or_404(Event.objects.translated(), slug=slug)
+    related = Event.objects.cards().filter(status='upcoming').exclude(pk=event.pk)[:3]
     
     return render(request, 'events/event_detail.html', {
         'event': event,
         'related_events': related,
+        'fragment_cache': fragment_cache(),
     })
\ No newline at end of file
@@ -1,14 +1,17 @@
 from django.contrib import admin
 from django.utils import timezone
-from django.utils.html import format_html
 from tinymce.widgets import TinyMCE
 from django import forms
 
+from core.fastadmin import FastAdminMixin
+from core.previews import ImagePreview
+
 from .models import NewsCategory, NewsPost
 
 
 class NewsPostAdminForm(forms.ModelForm):
     content = forms.CharField(widget=TinyMCE(attrs={'cols': 80, 'rows': 30}))
+    content_en = forms.CharField(label="Контент (EN)", required=False, widget=TinyMCE(attrs={'cols': 80, 'rows': 30}))
     
     class Meta:
         model = NewsPost
@@ -16,18 +19,19 @@ class NewsPostAdminForm(forms.ModelForm):
 
 
 @admin.register(NewsCategory)
-class NewsCategoryAdmin(admin.ModelAdmin):
+class NewsCategoryAdmin(FastAdminMixin, admin.ModelAdmin):
     list_display = ["name", "slug", "posts_count"]
     search_fields = ["name"]
     prepopulated_fields = {"slug": ("name",)}
+    list_counts = {"posts_count": "posts"}
     
+    @admin.display(description="Новостей", ordering="posts_count")
     def posts_count(self, obj):
-        return obj.posts.count()
-    posts_count.short_description = "Новостей"
+        return obj.posts_count
 
 
 @admin.register(NewsPost)
-class NewsPostAdmin(admin.ModelAdmin):
+class NewsPostAdmin(FastAdminMixin, admin.ModelAdmin):
     form = NewsPostAdminForm
     
     list_display = ["title", "category", "status", "published_at", "image_preview"]
@@ -53,6 +57,11 @@ class NewsPostAdmin(admin.ModelAdmin):
             "fields": ("meta_title", "meta_description"),
             "classes": ("collapse",),
         }),
+        ("Перевод (EN)", {
+            "fields": ("title_en", "excerpt_en", "content_en", "meta_title_en", "meta_description_en"),
+            "classes": ("collapse",),
+            "description": "Пустое поле — на английской версии показывается русский текст.",
+        }),
         ("Публикация", {
             "fields": ("published_at", "created_at", "updated_at"),
         }),
@@ -60,19 +69,8 @@ class NewsPostAdmin(admin.ModelAdmin):
     
     actions = ["publish_posts", "unpublish_posts"]
     
-    def image_preview(self, obj):
-        url = obj.get_featured_image()
-        if url:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 80px; object-fit: cover;"/>', url)
-        return "-"
-    image_preview.short_description = "Изображение"
-    
-    def image_preview_large(self, obj):
-        url = obj.get_featured_image()
-        if url:
-            return format_html('<img src="{}" style="max-height: 200px;"/>', url)
-        return "-"
-    image_preview_large.short_description = "Превью"
+    image_preview = ImagePreview("featured_image", "featured_image_url", description="Изображение")
+    image_preview_large = ImagePreview("featured_image", "featured_image_url", alias="admin_preview")
     
     @admin.action(description="Опубликовать выбранные")
     def publish_posts(self, request, queryset):
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
-    verbose_name = 'Новости'
\ No newline at end of file
+    verbose_name = 'Новости'
+
+    def ready(self):
+        from . import related  # noqa: F401
\ No newline at end of file
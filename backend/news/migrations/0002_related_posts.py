@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedNewsPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Позиция")),
+                ("score", models.FloatField(verbose_name="Близость")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="news.newspost",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_of",
+                        to="news.newspost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожая новость",
+                "verbose_name_plural": "Похожие новости",
+                "ordering": ["post", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatednewspost",
+            constraint=models.UniqueConstraint(
+                fields=("post", "rank"), name="relatednewspost_rank_unique"
+            ),
+        ),
+    ]
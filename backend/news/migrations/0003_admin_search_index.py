@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0002_related_posts"),
+    ]
+
+    operations = [
+        # GIN-индекс для полнотекстового поиска в админке; только PostgreSQL
+        search_index_operation("news", "newspost", "news_post_search_idx", ["title", "excerpt", "content"]),
+    ]
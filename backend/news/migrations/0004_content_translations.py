@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_admin_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspost",
+            name="content_en",
+            field=models.TextField(blank=True, verbose_name="Контент (EN)"),
+        ),
+        migrations.AddField(
+            model_name="newspost",
+            name="excerpt_en",
+            field=models.TextField(
+                blank=True, max_length=500, verbose_name="Краткое описание (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspost",
+            name="meta_description_en",
+            field=models.CharField(
+                blank=True, max_length=160, verbose_name="Meta Description (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspost",
+            name="meta_title_en",
+            field=models.CharField(
+                blank=True, max_length=70, verbose_name="Meta Title (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspost",
+            name="title_en",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Заголовок (EN)"
+            ),
+        ),
+    ]
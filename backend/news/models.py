@@ -2,6 +2,9 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from core.projections import CardProjectionMixin, CardQuerySet
+from core.translation import TranslatableMixin
+
 
 class NewsCategory(models.Model):
     """Категории новостей."""
@@ -24,8 +27,17 @@ class NewsCategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class NewsPost(models.Model):
+class NewsPost(TranslatableMixin, CardProjectionMixin, models.Model):
     """Новость."""
+    CARD_FIELDS = (
+        "title", "slug", "category", "excerpt", "featured_image",
+        "featured_image_url", "status", "tags", "published_at",
+    )
+    CARD_RELATED = {"category": ("name", "slug")}
+    # Полнотекстовый поиск в админке (core/search.py, индекс — миграция 0003)
+    SEARCH_FIELDS = ("title", "excerpt", "content")
+    # Поля с переводом в колонках <поле>_en (core/translation.py)
+    TRANSLATED_FIELDS = ("title", "excerpt", "content", "meta_title", "meta_description")
     
     class Status(models.TextChoices):
         DRAFT = "draft", "Черновик"
@@ -81,11 +93,20 @@ class NewsPost(models.Model):
     
     meta_title = models.CharField("Meta Title", max_length=70, blank=True)
     meta_description = models.CharField("Meta Description", max_length=160, blank=True)
+
+    # Перевод (пусто — показывается русский текст)
+    title_en = models.CharField("Заголовок (EN)", max_length=255, blank=True)
+    excerpt_en = models.TextField("Краткое описание (EN)", max_length=500, blank=True)
+    content_en = models.TextField("Контент (EN)", blank=True)
+    meta_title_en = models.CharField("Meta Title (EN)", max_length=70, blank=True)
+    meta_description_en = models.CharField("Meta Description (EN)", max_length=160, blank=True)
     
     published_at = models.DateTimeField("Дата публикации", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CardQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Новость"
         verbose_name_plural = "Новости"
@@ -112,4 +133,20 @@ class NewsPost(models.Model):
     def tags_list(self):
         if self.tags:
             return [tag.strip() for tag in self.tags.split(",") if tag.strip()]
-        return []
\ No newline at end of file
+        return []
+
+
+class RelatedNewsPost(models.Model):
+    """Похожие новости по TF-IDF (core/related.py)"""
+    post = models.ForeignKey(NewsPost, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(NewsPost, on_delete=models.CASCADE, related_name="related_of")
+    rank = models.PositiveSmallIntegerField("Позиция")
+    score = models.FloatField("Близость")
+
+    class Meta:
+        verbose_name = "Похожая новость"
+        verbose_name_plural = "Похожие новости"
+        ordering = ["post", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["post", "rank"], name="relatednewspost_rank_unique"),
+        ]
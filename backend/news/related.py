@@ -0,0 +1,10 @@
+# news/related.py
+from core.related import RelatedIndex, register
+
+from .models import NewsPost, RelatedNewsPost
+
+index = register(RelatedIndex(
+    NewsPost, RelatedNewsPost,
+    text_fields=("excerpt",),
+    tag_fields=("tags",),
+))
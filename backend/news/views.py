@@ -1,10 +1,15 @@
 from django.shortcuts import render, get_object_or_404
-from .models import NewsPost, NewsCategory
+from django.utils.functional import SimpleLazyObject
+from core import reference
+from core.warmup import fragment_cache
+
+from .models import NewsPost
+from .related import index as related_index
 
 
 def news_list(request):
-    posts = NewsPost.objects.filter(status='published').order_by('-published_at')
-    categories = NewsCategory.objects.all()
+    posts = NewsPost.objects.cards().filter(status='published').order_by('-published_at')
+    categories = reference.news_categories()
     
     category_slug = request.GET.get('category')
     if category_slug:
@@ -13,22 +18,33 @@ def news_list(request):
     context = {
         'posts': posts,
         'categories': categories,
+        'category_slug': category_slug or '',
+        # Список кэшируется в шаблоне до смены контента (core/warmup.py)
+        'fragment_cache': fragment_cache(),
     }
     return render(request, 'news/news_list.html', context)
 
 
+def _related_posts(post):
+    related_posts = list(related_index.related(post, 3))
+    if not related_posts and post.category:
+        related_posts = list(NewsPost.objects.cards().filter(status='published', category=post.category).exclude(id=post.id)[:3])
+    return related_posts
+
+
 def news_detail(request, slug):
-    post = get_object_or_404(NewsPost, slug=slug, status='published')
-    categories = NewsCategory.objects.all()
-    recent_posts = NewsPost.objects.filter(status='published').exclude(id=post.id)[:5]
-    related_posts = NewsPost.objects.filter(status='published', category=post.category).exclude(id=post.id)[:3] if post.category else []
+    post = get_object_or_404(NewsPost.objects.translated(), slug=slug, status='published')
+    categories = reference.news_categories()
+    recent_posts = NewsPost.objects.cards().filter(status='published').exclude(id=post.id)[:5]
+    # Похожие и навигация считаются, только когда блок собирается заново
+    related_posts = SimpleLazyObject(lambda: _related_posts(post))
     
     # Навигация - с проверкой на None
     prev_post = None
     next_post = None
     if post.published_at:
-        prev_post = NewsPost.objects.filter(status='published', published_at__lt=post.published_at).order_by('-published_at').first()
-        next_post = NewsPost.objects.filter(status='published', published_at__gt=post.published_at).order_by('published_at').first()
+        prev_post = SimpleLazyObject(lambda: NewsPost.objects.cards().filter(status='published', published_at__lt=post.published_at).order_by('-published_at').first())
+        next_post = SimpleLazyObject(lambda: NewsPost.objects.cards().filter(status='published', published_at__gt=post.published_at).order_by('published_at').first())
     
     context = {
         'post': post,
@@ -37,5 +53,6 @@ def news_detail(request, slug):
         'related_posts': related_posts,
         'prev_post': prev_post,
         'next_post': next_post,
+        'fragment_cache': fragment_cache(),
     }
     return render(request, 'news/news_detail.html', context)
\ No newline at end of file
@@ -1,5 +1,13 @@
 from django.contrib import admin
-from .models import Property, PropertyType, Location, PropertyImage
+from django.db import transaction
+from mptt.admin import DraggableMPTTAdmin
+
+from core.exports import ExportMixin
+from core.fastadmin import FastAdminMixin
+from core.previews import ImagePreview
+
+from . import units
+from .models import Property, PropertyType, Location, PropertyImage, Unit, FeedImport
 
 
 @admin.register(PropertyType)
@@ -9,39 +17,128 @@ class PropertyTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
-    list_display = ["name", "slug"]
+class LocationAdmin(DraggableMPTTAdmin):
+    list_display = ["tree_actions", "indented_title", "kind", "slug", "properties_count"]
+    list_display_links = ["indented_title"]
+    list_filter = ["kind"]
     prepopulated_fields = {"slug": ("name",)}
 
 
 class PropertyImageInline(admin.TabularInline):
     model = PropertyImage
     extra = 3
+    fields = ["preview", "image", "order"]
+    readonly_fields = ["preview"]
+
+    preview = ImagePreview("image")
 
 
 @admin.register(Property)
-class PropertyAdmin(admin.ModelAdmin):
-    list_display = ["name", "developer", "property_type", "location", "price_from", "status", "is_featured"]
+class PropertyAdmin(FastAdminMixin, ExportMixin, admin.ModelAdmin):
+    list_display = [
+        "preview", "name", "developer", "property_type", "location", "price_from", "units_available", "status",
+        "is_featured",
+    ]
+    list_display_links = ["preview", "name"]
     list_filter = ["status", "construction_status", "property_type", "location", "is_featured"]
     search_fields = ["name", "short_description"]
     prepopulated_fields = {"slug": ("name",)}
     raw_id_fields = ["developer"]
     inlines = [PropertyImageInline]
+    readonly_fields = ["main_image_preview", "units_total", "units_available", "unit_price_min", "unit_price_max"]
+    export_fields = [
+        "id", "name", "slug", "developer__name", "property_type__name", "location__name",
+        "price_from", "price_per_m2", "area", "rooms", "roi_percent", "units_total", "units_available",
+        "status", "construction_status", "completion_date", "is_active",
+    ]
+
+    preview = ImagePreview("main_image")
+    main_image_preview = ImagePreview("main_image", alias="admin_preview")
     
     fieldsets = (
         (None, {
             "fields": ("name", "slug", "developer", "property_type", "location")
         }),
+        ("Координаты", {
+            "fields": ("latitude", "longitude")
+        }),
         ("Медиа", {
-            "fields": ("main_image",)
+            "fields": ("main_image", "main_image_preview")
         }),
         ("Характеристики", {
             "fields": ("price_from", "area", "rooms", "roi_percent")
         }),
+        ("Юниты", {
+            "fields": ("units_total", "units_available", "unit_price_min", "unit_price_max"),
+            "description": "Сводка по юнитам, обновляется автоматически."
+        }),
         ("Статусы", {
             "fields": ("status", "construction_status", "completion_date", "is_featured", "is_active")
         }),
         ("Описание", {
             "fields": ("short_description", "description")
         }),
-    )
\ No newline at end of file
+        ("Перевод (EN)", {
+            "fields": ("name_en", "short_description_en", "description_en"),
+            "classes": ("collapse",),
+            "description": "Пустое поле — на английской версии показывается русский текст.",
+        }),
+    )
+
+
+@admin.register(Unit)
+class UnitAdmin(FastAdminMixin, ExportMixin, admin.ModelAdmin):
+    list_display = ["number", "property", "floor", "rooms", "area", "price", "status", "updated_at"]
+    list_filter = ["status"]
+    search_fields = ["number", "property__name"]
+    raw_id_fields = ["property"]
+    list_select_related = ["property"]
+    actions = ["mark_available", "mark_reserved", "mark_sold"]
+    export_fields = ["property__slug", "property__name", "number", "floor", "rooms", "area", "price", "status", "updated_at"]
+
+    def _set_status(self, request, queryset, status):
+        updated = units.set_status(queryset, status)
+        self.message_user(request, f"Статус изменён у {updated} юнитов")
+
+    @admin.action(description="Отметить свободными")
+    def mark_available(self, request, queryset):
+        self._set_status(request, queryset, Unit.Status.AVAILABLE)
+
+    @admin.action(description="Отметить забронированными")
+    def mark_reserved(self, request, queryset):
+        self._set_status(request, queryset, Unit.Status.RESERVED)
+
+    @admin.action(description="Отметить проданными")
+    def mark_sold(self, request, queryset):
+        self._set_status(request, queryset, Unit.Status.SOLD)
+
+
+@admin.register(FeedImport)
+class FeedImportAdmin(admin.ModelAdmin):
+    list_display = ["developer", "status", "rows", "created", "updated", "failed", "images", "rows_per_second", "created_at"]
+    list_filter = ["status"]
+    raw_id_fields = ["developer"]
+    list_select_related = ["developer"]
+    readonly_fields = [
+        "status", "rows", "created", "updated", "failed", "images", "rows_per_second",
+        "errors", "created_at", "finished_at",
+    ]
+
+    def get_fields(self, request, obj=None):
+        if obj is None:
+            return ["developer", "file", "download_images"]
+        return ["developer", "file", "download_images", *self.readonly_fields]
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return []
+        return ["developer", "file", "download_images", *self.readonly_fields]
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            from .tasks import run_feed_import
+
+            pk = obj.pk
+            transaction.on_commit(lambda: run_feed_import.delay(pk))
+            self.message_user(request, "Импорт поставлен в очередь — статус и ошибки обновятся на этой странице")
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class PropertiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'properties'
-    verbose_name = 'Объекты'
\ No newline at end of file
+    verbose_name = 'Объекты'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
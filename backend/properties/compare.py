@@ -0,0 +1,87 @@
+# properties/compare.py
+"""
+Сравнение объектов.
+
+Выбор объектов хранится в браузере (static/js/compare.js, localStorage),
+сервер только отдаёт данные по списку id: два запроса при любом числе
+объектов — карточки с застройщиком, типом и локацией (select_related)
+и первое фото галереи каждого (ROW_NUMBER() по property).
+
+Ответ кэшируется по отсортированному набору id, валюте и языку: «1,2,3»
+и «3,1,2» — один ключ, порядок колонок восстанавливается из запроса.
+Несвежий ответ отдаётся, пока его пересчитывает задача (core/caching.py).
+"""
+from django.db.models import Prefetch
+
+from core.caching import get_or_build
+from core.currency import attach_prices
+from core.queries import top_n_per_group
+from core.translation import cache_language
+
+from .models import Property, PropertyImage
+
+MAX_COMPARE = 6
+CACHE_TIMEOUT = 5 * 60
+
+
+def cache_key(ids, currency):
+    return f"properties:compare:{cache_language()}:{currency}:{','.join(map(str, sorted(ids)))}"
+
+
+def load(ids, currency):
+    """Данные для сравнения в порядке ids (неактивные и несуществующие пропускаются)."""
+    items = get_or_build(
+        cache_key(ids, currency), _build, CACHE_TIMEOUT, args=(sorted(ids), currency), background=True
+    )
+    by_id = {item["id"]: item for item in items}
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def _build(ids, currency):
+    properties = attach_prices(
+        Property.objects.cards().filter(pk__in=ids, is_active=True).prefetch_related(
+            Prefetch(
+                "images",
+                queryset=top_n_per_group(PropertyImage.objects.all(), "property", 1, ["order", "pk"]),
+                to_attr="first_images",
+            )
+        ),
+        currency,
+    )
+    return [_item(obj) for obj in sorted(properties, key=lambda obj: obj.pk)]
+
+
+def _url(field):
+    return field.url if field else None
+
+
+def _item(obj):
+    developer = obj.developer
+    return {
+        "id": obj.pk,
+        "name": obj.name,
+        "url": obj.get_absolute_url(),
+        "currency": obj.currency,
+        "price": _number(obj.price_from_local),
+        "price_per_m2": _number(obj.price_per_m2_local),
+        "area": obj.area,
+        "rooms": obj.rooms,
+        "roi_percent": _number(obj.roi_percent),
+        "status": obj.get_status_display(),
+        "construction_status": obj.construction_status,
+        "construction_status_display": obj.get_construction_status_display(),
+        "completion_date": obj.completion_date or None,
+        "developer": {
+            "name": developer.name,
+            "slug": developer.slug,
+            "rating": _number(developer.rating),
+        },
+        "type": obj.property_type.name if obj.property_type else None,
+        "location": obj.location.name if obj.location else None,
+        "main_image": _url(obj.main_image),
+        "image": _url(obj.first_images[0].image) if obj.first_images else None,
+    }
+
+
+def _number(value):
+    return None if value is None else float(value)
@@ -0,0 +1,471 @@
+# properties/feeds.py
+"""
+Импорт фидов застройщиков (CSV и XML прайс-листы).
+
+Файл читается потоком: csv.DictReader по строкам, XML — iterparse
+с очисткой разобранных элементов, поэтому память не зависит от размера
+фида. Строки копятся пачками по batch_size, каждая пачка — в своей
+транзакции:
+
+    1. строки → поля Property (ошибка строки попадает в отчёт, пачка идёт дальше);
+    2. один SELECT — какие external_id уже есть (их slug не меняется);
+    3. slug-и новых объектов выделяются разом (allocate_slugs);
+    4. bulk_create(update_conflicts=True) по (developer, external_id);
+    5. фото галереи — bulk_create(update_conflicts=True) по (property, source_url);
+    6. новые фото скачиваются пулом потоков (не больше workers соединений),
+       пути записываются одним bulk_update.
+
+bulk_create не вызывает save() и сигналы, поэтому geo_cell и price_per_m2
+считаются здесь, а после импорта пересчитываются счётчики локаций
+и в очередь ставится полный пересчёт похожих объектов; меняется версия
+блоков главной (core/warmup.py) и тайлов кластеров карты объектов.
+
+Формат колонок (CSV) и тегов (XML, элемент <property> на объект):
+    id, name, type, location, price, area, rooms, roi, status,
+    construction_status, completion_date, latitude, longitude,
+    short_description, description, images, active
+images в CSV — URL через «|» или пробел, в XML — вложенные <image>.
+"""
+import csv
+import io
+import logging
+import os
+import posixpath
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from hashlib import md5
+from urllib.parse import urlsplit
+
+import requests
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from core.geo import cell_for
+from core.previews import download_image
+
+from . import locations
+from .models import Location, Property, PropertyImage, PropertyType, price_per_m2
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+WORKERS = 8
+MAX_ERRORS = 1000
+
+# SlugField(max_length=50): место под суффикс «-12345»
+SLUG_BASE_LENGTH = 43
+
+ROW_TAGS = {"property", "object", "item"}
+
+UPDATE_FIELDS = [
+    "name", "property_type", "location", "price_from", "price_per_m2", "area", "rooms", "roi_percent",
+    "status", "construction_status", "completion_date", "latitude", "longitude", "geo_cell",
+    "short_description", "description", "is_active", "updated_at",
+]
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    images: int = 0
+    errors: list = field(default_factory=list)  # (строка, сообщение)
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        return (
+            f"строк {self.rows}, создано {self.created}, обновлено {self.updated}, "
+            f"ошибок {self.failed}, фото {self.images}, "
+            f"{self.elapsed:.1f} с ({self.rows_per_second:.0f} строк/с)"
+        )
+
+
+# --- Чтение фидов ---
+
+def iter_csv(f, delimiter=","):
+    """(номер строки, dict) из текстового файла CSV."""
+    reader = csv.DictReader(f, delimiter=delimiter)
+    for row in reader:
+        yield reader.line_num, {(key or "").strip().lower(): value for key, value in row.items()}
+
+
+def iter_xml(f):
+    """(номер элемента, dict) из XML; <images><image>url</image></images> → список."""
+    number = 0
+    context = ET.iterparse(f, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag.lower() not in ROW_TAGS:
+            continue
+        number += 1
+        row = {}
+        for child in elem:
+            tag = child.tag.lower()
+            if tag == "images":
+                row["images"] = [(image.text or "").strip() for image in child]
+            else:
+                row[tag] = (child.text or "").strip()
+        # Разобранное больше не нужно: без этого дерево растёт до размера файла
+        elem.clear()
+        root.clear()
+        yield number, row
+
+
+def open_feed(f, name):
+    """Итератор строк фида по расширению имени; f — бинарный файл."""
+    if name.lower().endswith(".xml"):
+        return iter_xml(f)
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    sample = text.readline()
+    delimiter = ";" if sample.count(";") > sample.count(",") else ","
+    return iter_csv(_chain_line(sample, text), delimiter)
+
+
+def _chain_line(first, rest):
+    yield first
+    yield from rest
+
+
+# --- Slug-и ---
+
+def allocate_slugs(names, fallbacks):
+    """
+    Уникальные slug-и для новых объектов двумя-тремя запросами на пачку.
+
+    Основа — slugify(name) (или fallback, если название не латиницей);
+    занятые основы получают суффикс -2, -3, … больше уже существующих.
+    """
+    bases = [
+        (slugify(name)[:SLUG_BASE_LENGTH].strip("-") or slugify(fallback)[:SLUG_BASE_LENGTH].strip("-") or "property")
+        for name, fallback in zip(names, fallbacks)
+    ]
+    unique_bases = sorted(set(bases))
+    used = set(Property.objects.filter(slug__in=unique_bases).values_list("slug", flat=True))
+    taken = sorted(base for base in unique_bases if base in used)
+    for start in range(0, len(taken), 100):
+        query = Q()
+        for base in taken[start:start + 100]:
+            query |= _prefix(base + "-")
+        used.update(Property.objects.filter(query).values_list("slug", flat=True))
+
+    slugs, suffix = [], {}
+    for base in bases:
+        slug, n = base, suffix.get(base, 1)
+        while slug in used:
+            n += 1
+            slug = f"{base}-{n}"
+        suffix[base] = n
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _prefix(prefix):
+    """
+    slug LIKE 'prefix%' по индексу slug.
+
+    В PostgreSQL LIKE с префиксом читает индекс varchar_pattern_ops, который
+    Django создаёт для SlugField. В SQLite LIKE регистронезависим и индекс
+    не использует, а сравнение строк бинарное — там префикс задаётся диапазоном.
+    """
+    if connection.vendor == "sqlite":
+        return Q(slug__gte=prefix, slug__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return Q(slug__startswith=prefix)
+
+
+# --- Разбор строки ---
+
+# Группы тысяч: «1,250,000», «350,000.50» и «1.250.000,50»
+THOUSANDS_COMMA = re.compile(r"-?[1-9]\d{0,2}(,\d{3})+(\.\d+)?")
+THOUSANDS_DOT = re.compile(r"-?[1-9]\d{0,2}(\.\d{3})+(,\d+)?")
+
+
+def _text(row, *keys):
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def _decimal(row, key, low=None, high=None):
+    value = _text(row, key).replace(" ", "").replace("\xa0", "").replace("$", "")
+    if "," in value:
+        if THOUSANDS_COMMA.fullmatch(value):
+            value = value.replace(",", "")
+        elif THOUSANDS_DOT.fullmatch(value):
+            value = value.replace(".", "").replace(",", ".")
+        elif value.count(",") == 1 and "." not in value:
+            # «12,5», «0,125» — десятичная запятая (три цифры после неё — тысячи, см. выше)
+            value = value.replace(",", ".")
+        else:
+            raise ValueError(f"{key}: «{value}» — неясно, где разделитель тысяч, а где десятичный")
+    if not value:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{key}: «{value}» — не число")
+    if not number.is_finite() or (low is not None and number < low) or (high is not None and number > high):
+        raise ValueError(f"{key}: значение {number} вне допустимого диапазона")
+    return number
+
+
+def _integer(row, key, high=None):
+    number = _decimal(row, key, low=0, high=high)
+    return None if number is None else int(number)
+
+
+def _choice(row, key, choices, default):
+    value = _text(row, key).lower()
+    if not value:
+        return default
+    for choice_value, label in choices:
+        if value in (choice_value, str(label).lower()):
+            return choice_value
+    raise ValueError(f"{key}: неизвестное значение «{value}»")
+
+
+def _images(row):
+    value = row.get("images") or []
+    if isinstance(value, str):
+        value = value.replace("|", " ").split()
+    urls = []
+    for url in value:
+        if url.startswith(("http://", "https://")) and url not in urls:
+            urls.append(url[:500])
+    return urls
+
+
+class FeedImporter:
+    """Импорт фида одного застройщика."""
+
+    def __init__(self, developer, batch_size=BATCH_SIZE, workers=WORKERS, download_images=True):
+        self.developer = developer
+        self.batch_size = batch_size
+        self.workers = workers
+        self.download_images = download_images
+        self.report = ImportReport()
+        # Справочники маленькие — загружаются один раз: slug и название → id
+        self.types = self._lookup(PropertyType)
+        self.locations = self._lookup(Location)
+
+    @staticmethod
+    def _lookup(model):
+        table = {}
+        for pk, slug, name in model.objects.values_list("pk", "slug", "name"):
+            table[slug.lower()] = pk
+            table.setdefault(name.lower(), pk)
+        return table
+
+    def run(self, rows, progress=None):
+        """
+        rows — итератор (номер строки, dict), см. open_feed.
+
+        progress(report) вызывается после каждой пачки.
+        """
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            self.pool = pool
+            for line, row in rows:
+                self.report.rows += 1
+                batch.append((line, row))
+                if len(batch) >= self.batch_size:
+                    self._batch(batch)
+                    batch = []
+                    if progress:
+                        progress(self.report)
+            if batch:
+                self._batch(batch)
+        self._after_import()
+        self.report.elapsed = time.monotonic() - self.report.started
+        return self.report
+
+    # --- Пачка ---
+
+    def _batch(self, batch):
+        parsed = {}
+        for line, row in batch:
+            try:
+                external_id, values, images = self._parse(row)
+            except ValueError as e:
+                self.report.error(line, str(e))
+                continue
+            parsed[external_id] = (line, values, images)  # повтор id в фиде — берётся последняя строка
+        if not parsed:
+            return
+
+        with transaction.atomic():
+            existing = {
+                external_id: slug
+                for external_id, slug in Property.objects.filter(
+                    developer=self.developer, external_id__in=list(parsed)
+                ).values_list("external_id", "slug")
+            }
+            new_ids = [external_id for external_id in parsed if external_id not in existing]
+            slugs = dict(zip(new_ids, allocate_slugs(
+                [parsed[external_id][1]["name"] for external_id in new_ids],
+                [f"{self.developer.slug}-{external_id}" for external_id in new_ids],
+            )))
+
+            objs = [
+                Property(
+                    developer=self.developer, external_id=external_id,
+                    slug=existing.get(external_id) or slugs[external_id],
+                    main_image="", **values,
+                )
+                for external_id, (_, values, _) in parsed.items()
+            ]
+            Property.objects.bulk_create(
+                objs, update_conflicts=True,
+                unique_fields=["developer", "external_id"], update_fields=UPDATE_FIELDS,
+            )
+            # update_conflicts в Django 4.2 не возвращает pk — один SELECT по ключам
+            property_ids = dict(
+                Property.objects.filter(developer=self.developer, external_id__in=list(parsed))
+                .values_list("external_id", "pk")
+            )
+            self._upsert_images(parsed, property_ids)
+
+        self.report.created += len(new_ids)
+        self.report.updated += len(parsed) - len(new_ids)
+        if self.download_images:
+            self._download(list(property_ids.values()))
+
+    def _parse(self, row):
+        external_id = _text(row, "id", "external_id")[:100]
+        if not external_id:
+            raise ValueError("нет id объекта")
+        name = _text(row, "name", "title")[:255]
+        if not name:
+            raise ValueError("нет названия")
+
+        price = _decimal(row, "price", low=0, high=Decimal("1e12") - 1)
+        area = _integer(row, "area", high=1_000_000)
+        latitude = _decimal(row, "latitude", -90, 90)
+        longitude = _decimal(row, "longitude", -180, 180)
+        if latitude is not None:
+            latitude = latitude.quantize(Decimal("0.000001"))
+        if longitude is not None:
+            longitude = longitude.quantize(Decimal("0.000001"))
+        active = _text(row, "active").lower()
+
+        values = {
+            "name": name,
+            "property_type_id": self.types.get(_text(row, "type").lower()),
+            "location_id": self.locations.get(_text(row, "location").lower()),
+            "price_from": price.quantize(Decimal(1)) if price is not None else None,
+            "area": area,
+            "price_per_m2": price_per_m2(price, area),
+            "rooms": _integer(row, "rooms", high=1000),
+            "roi_percent": _decimal(row, "roi", 0, 99),
+            "status": _choice(row, "status", Property.Status.choices, Property.Status.SALE),
+            "construction_status": _choice(
+                row, "construction_status", Property.ConstructionStatus.choices,
+                Property.ConstructionStatus.IN_PROGRESS,
+            ),
+            "completion_date": _text(row, "completion_date")[:50],
+            "latitude": latitude,
+            "longitude": longitude,
+            "geo_cell": cell_for(latitude, longitude),
+            "short_description": _text(row, "short_description")[:500],
+            "description": _text(row, "description"),
+            "is_active": active not in ("0", "false", "no", "нет"),
+        }
+        return external_id, values, _images(row)
+
+    def _upsert_images(self, parsed, property_ids):
+        objs = [
+            PropertyImage(property_id=property_ids[external_id], source_url=url, order=order, image="")
+            for external_id, (_, _, images) in parsed.items()
+            for order, url in enumerate(images)
+        ]
+        if objs:
+            PropertyImage.objects.bulk_create(
+                objs, update_conflicts=True,
+                unique_fields=["property", "source_url"], update_fields=["order"],
+            )
+
+    # --- Фото ---
+
+    def _download(self, property_ids):
+        """Скачать фото пачки, которых ещё нет в хранилище; главное фото — первое из галереи."""
+        pending = list(
+            PropertyImage.objects.filter(property_id__in=property_ids, image="", source_url__isnull=False)
+            .values_list("pk", "property_id", "source_url", "order")
+        )
+        if not pending:
+            return
+        results = self.pool.map(lambda item: (item, _fetch(item[2])), pending)
+
+        images, main = [], {}
+        for (pk, property_id, url, order), (path, error) in results:
+            if error:
+                self.report.error(f"фото {url}", error)
+                continue
+            images.append(PropertyImage(pk=pk, image=path))
+            if property_id not in main or order < main[property_id][0]:
+                main[property_id] = (order, path)
+        self.report.images += len(images)
+
+        with transaction.atomic():
+            PropertyImage.objects.bulk_update(images, ["image"], batch_size=500)
+            without_main = set(
+                Property.objects.filter(pk__in=list(main), main_image="").values_list("pk", flat=True)
+            )
+            Property.objects.bulk_update(
+                [Property(pk=pk, main_image=main[pk][1]) for pk in without_main], ["main_image"], batch_size=500
+            )
+
+    def _after_import(self):
+        from core.map import invalidate_all_tiles
+        from core.warmup import content_changed
+
+        from .tasks import rebuild_similar_properties
+
+        locations.recount_all()
+        transaction.on_commit(rebuild_similar_properties.delay)
+        # Сигналы bulk_create не шлёт: блоки главной и кластеры карты сбрасываются здесь
+        transaction.on_commit(content_changed)
+        transaction.on_commit(lambda: invalidate_all_tiles("properties"))
+
+
+def _fetch(url):
+    """Скачать картинку в хранилище. Returns: (путь, None) или (None, ошибка)."""
+    try:
+        data, content_type = download_image(url)
+    except (requests.RequestException, ValueError) as e:
+        return None, str(e)
+
+    extension = os.path.splitext(posixpath.basename(urlsplit(url).path))[1].lower()
+    if extension not in (".jpg", ".jpeg", ".png", ".webp", ".gif"):
+        extension = "." + content_type.split("/")[-1].split(";")[0].strip().replace("jpeg", "jpg")
+    name = f"properties/gallery/feed/{md5(url.encode()).hexdigest()}{extension}"
+    return default_storage.save(name, ContentFile(data)), None
+
+
+def import_feed(f, name, developer, **options):
+    """Импорт из бинарного файла f; формат — по расширению name."""
+    importer = FeedImporter(developer, **options)
+    report = importer.run(open_feed(f, name))
+    logger.info(f"Feed import for {developer.slug}: {report.summary()}")
+    return report
@@ -0,0 +1,267 @@
+# properties/investment.py
+"""
+Прогноз доходности вложений в объекты.
+
+Сценарий — заполняемость (occupancy, доля ночей), цена ночи (множитель
+rate_factor к оценке объекта или абсолютная nightly в валюте), рост
+стоимости в год (appreciation) и срок владения в годах (years).
+
+Считается сразу матрица «объекты × сценарии» массивами NumPy, без
+циклов Python: сетка чувствительности из сотен сценариев по шести
+объектам — доли миллисекунды, поэтому её можно отдавать прямо из вьюхи.
+
+Цена ночи по умолчанию выводится из roi_percent объекта: это чистая
+годовая доходность при BASE_OCCUPANCY и доле расходов EXPENSE_RATIO
+(управляющая компания, налоги, обслуживание).
+
+Пресеты из settings.INVESTMENT["PRESETS"] считаются для объекта один раз
+и лежат в кэше (preset_projections); ключ включает цену, roi и хэш
+пресетов, так что правка объекта или настроек сама даёт новый ключ.
+Всё считается в USD, в валюту переводится только выдача.
+"""
+import hashlib
+import itertools
+import json
+import math
+
+import numpy as np
+from django.conf import settings
+
+from core.caching import get_or_build_many
+from core.currency import rate_for
+
+DEFAULTS = {
+    "EXPENSE_RATIO": 0.3,
+    "BASE_OCCUPANCY": 0.7,
+    "DEFAULT_ROI": 8.0,
+    "MAX_SCENARIOS": 1000,
+    "MAX_PROPERTIES": 6,
+    "CACHE_TIMEOUT": 24 * 60 * 60,
+    "PRESETS": {
+        "conservative": {"occupancy": 0.55, "rate_factor": 0.85, "appreciation": 0.03, "years": 5},
+        "base": {"occupancy": 0.7, "rate_factor": 1.0, "appreciation": 0.05, "years": 5},
+        "optimistic": {"occupancy": 0.85, "rate_factor": 1.15, "appreciation": 0.08, "years": 5},
+    },
+}
+
+# Параметры сценария и допустимые значения
+AXES = {
+    "occupancy": (0.0, 1.0),
+    "rate_factor": (0.0, 5.0),
+    "nightly": (0.0, 1e9),         # в валюте посетителя, с запасом на IDR
+    "appreciation": (-0.5, 0.5),
+    "years": (1, 30),
+}
+
+RESULT_FIELDS = ("nightly_rate", "net_rent", "rental_yield", "value_end", "profit", "total_roi", "annual_return")
+MONEY_FIELDS = ("nightly_rate", "net_rent", "value_end", "profit")
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "INVESTMENT", {})}
+
+
+class Scenarios:
+    """Набор сценариев: по массиву длины S на каждый параметр."""
+
+    def __init__(self, occupancy, appreciation, years, rate_factor=None, nightly=None, names=None):
+        self.occupancy = np.asarray(occupancy, dtype=np.float64)
+        self.appreciation = np.asarray(appreciation, dtype=np.float64)
+        self.years = np.asarray(years, dtype=np.float64)
+        self.rate_factor = None if rate_factor is None else np.asarray(rate_factor, dtype=np.float64)
+        self.nightly = None if nightly is None else np.asarray(nightly, dtype=np.float64)
+        self.names = names
+
+    def __len__(self):
+        return len(self.occupancy)
+
+    @classmethod
+    def grid(cls, axes, currency="USD"):
+        """
+        Декартово произведение значений параметров.
+
+        axes: {"occupancy": [...], "appreciation": [...], ...}; nightly —
+        в валюте currency, переводится в USD.
+        """
+        config = get_config()
+        base = config["PRESETS"]["base"]
+        axes = dict(axes)
+        values = {
+            "occupancy": axes.get("occupancy") or [base["occupancy"]],
+            "appreciation": axes.get("appreciation") or [base["appreciation"]],
+            "years": axes.get("years") or [base["years"]],
+        }
+        if axes.get("nightly"):
+            rate = float(rate_for(currency) or 1)
+            values["nightly"] = [value / rate for value in axes["nightly"]]
+        else:
+            values["rate_factor"] = axes.get("rate_factor") or [base["rate_factor"]]
+
+        size = int(np.prod([len(v) for v in values.values()]))
+        if size > config["MAX_SCENARIOS"]:
+            raise ValueError(f"Слишком много сценариев: {size}, максимум {config['MAX_SCENARIOS']}")
+        columns = np.array(list(itertools.product(*values.values())), dtype=np.float64).T
+        return cls(**dict(zip(values, columns)))
+
+    @classmethod
+    def presets(cls):
+        presets = get_config()["PRESETS"]
+        columns = {key: [preset[key] for preset in presets.values()]
+                   for key in ("occupancy", "rate_factor", "appreciation", "years")}
+        return cls(**columns, names=list(presets))
+
+    def as_dict(self, currency="USD"):
+        data = {
+            "occupancy": self.occupancy,
+            "appreciation": self.appreciation,
+            "years": self.years.astype(int),
+        }
+        if self.nightly is not None:
+            data["nightly"] = self.nightly * float(rate_for(currency) or 1)
+        else:
+            data["rate_factor"] = self.rate_factor
+        data = {key: np.round(value, 4).tolist() for key, value in data.items()}
+        if self.names:
+            data["name"] = self.names
+        return data
+
+
+def base_nightly(prices, roi_percent):
+    """Оценка цены ночи в USD из чистой доходности объекта (массивы длины P)."""
+    config = get_config()
+    roi = np.where(np.isnan(roi_percent), config["DEFAULT_ROI"], roi_percent) / 100
+    gross_rent = prices * roi / (1 - config["EXPENSE_RATIO"])
+    return gross_rent / (365 * config["BASE_OCCUPANCY"])
+
+
+def project(prices, roi_percent, scenarios):
+    """
+    Матрица прогноза: P объектов × S сценариев, суммы в USD.
+
+    Args:
+        prices: цены объектов (P,)
+        roi_percent: заявленная доходность, NaN — нет данных (P,)
+        scenarios: Scenarios
+
+    Returns:
+        dict поле → ndarray (P, S); поля — RESULT_FIELDS.
+    """
+    config = get_config()
+    price = np.asarray(prices, dtype=np.float64)[:, None]
+    roi = np.asarray(roi_percent, dtype=np.float64)
+    if scenarios.nightly is not None:
+        nightly = np.broadcast_to(scenarios.nightly[None, :], (len(price), len(scenarios)))
+    else:
+        nightly = base_nightly(price[:, 0], roi)[:, None] * scenarios.rate_factor[None, :]
+    years = scenarios.years[None, :]
+
+    net_rent = nightly * 365 * scenarios.occupancy[None, :] * (1 - config["EXPENSE_RATIO"])
+    value_end = price * (1 + scenarios.appreciation[None, :]) ** years
+    profit = net_rent * years + value_end - price
+    total_roi = profit / price
+    annual_return = np.power(np.maximum(1 + total_roi, 0.0), 1 / years) - 1
+    return {
+        "nightly_rate": nightly,
+        "net_rent": net_rent,
+        "rental_yield": net_rent / price,
+        "value_end": value_end,
+        "profit": profit,
+        "total_roi": total_roi,
+        "annual_return": annual_return,
+    }
+
+
+def _rows(properties):
+    """Цена и roi объектов; объекты без цены пропускаются."""
+    rows = [p for p in properties if p.price_from]
+    prices = np.array([float(p.price_from) for p in rows], dtype=np.float64)
+    roi = np.array([np.nan if p.roi_percent is None else float(p.roi_percent) for p in rows], dtype=np.float64)
+    return rows, prices, roi
+
+
+def _serialize(rows, results, currency):
+    rate = float(rate_for(currency) or 1)
+    items = []
+    for i, obj in enumerate(rows):
+        item_results = {}
+        for field in RESULT_FIELDS:
+            values = results[field][i] * rate if field in MONEY_FIELDS else results[field][i]
+            item_results[field] = np.round(values, 0 if field in MONEY_FIELDS else 4).tolist()
+        items.append({
+            "id": obj.pk,
+            "name": obj.name,
+            "slug": obj.slug,
+            "price": round(float(obj.price_from) * rate),
+            "results": item_results,
+        })
+    return items
+
+
+def projections(properties, scenarios, currency="USD"):
+    """Прогноз объектов по произвольным сценариям (сетка чувствительности)."""
+    rows, prices, roi = _rows(properties)
+    results = project(prices, roi, scenarios) if rows else {}
+    return _serialize(rows, results, currency)
+
+
+def _presets_hash():
+    """Отпечаток настроек пресетов — считается на каждый вызов, чтобы ключи следовали за settings."""
+    config = get_config()
+    payload = json.dumps([config["PRESETS"], config["EXPENSE_RATIO"], config["BASE_OCCUPANCY"],
+                          config["DEFAULT_ROI"]], sort_keys=True)
+    return hashlib.md5(payload.encode()).hexdigest()[:8]
+
+
+def _preset_key(obj, presets_hash):
+    return f"investment:presets:{presets_hash}:{obj.pk}:{obj.price_from}:{obj.roi_percent}"
+
+
+def preset_projections(properties, currency="USD"):
+    """
+    Прогноз по стандартным пресетам: из кэша, недостающие объекты — одним проходом.
+
+    Returns:
+        (scenarios dict, list объектов с results) — как projections().
+    """
+    scenarios = Scenarios.presets()
+    rows, prices, roi = _rows(properties)
+    presets_hash = _presets_hash()
+    keys = [_preset_key(obj, presets_hash) for obj in rows]
+
+    def build(missing):
+        positions = list(missing.values())
+        computed = project(prices[positions], roi[positions], scenarios)
+        return {key: {field: computed[field][j] for field in RESULT_FIELDS} for j, key in enumerate(missing)}
+
+    cached = get_or_build_many(dict(zip(keys, range(len(keys)))), build, get_config()["CACHE_TIMEOUT"])
+
+    results = {
+        field: np.array([cached[key][field] for key in keys]).reshape(len(keys), len(scenarios))
+        for field in RESULT_FIELDS
+    }
+    return scenarios.as_dict(currency), _serialize(rows, results, currency)
+
+
+def parse_axis(name, value):
+    """
+    Значения параметра из GET: "0.5,0.6,0.7" или диапазон "0.4:0.95:0.05" (конец включительно).
+    """
+    low, high = AXES[name]
+    try:
+        if ":" in value:
+            start, stop, step = (float(part) for part in value.split(":"))
+            if not all(map(math.isfinite, (start, stop, step))) or step <= 0 or stop < start:
+                raise ValueError
+            # Размер до arange: диапазон с крошечным шагом не должен выделять память
+            if math.floor((stop - start) / step) + 1 > get_config()["MAX_SCENARIOS"]:
+                raise ValueError
+            values = np.arange(start, stop + step / 2, step).tolist()
+        else:
+            values = [float(part) for part in value.split(",") if part.strip()]
+    except (ValueError, OverflowError):
+        raise ValueError(f"{name}: ожидается список через запятую или start:stop:step")
+    if not all(math.isfinite(v) and low <= v <= high for v in values):
+        raise ValueError(f"{name}: значения от {low} до {high}")
+    if name == "years":
+        values = sorted({int(round(v)) for v in values})
+    return values
@@ -0,0 +1,72 @@
+# properties/locations.py
+"""
+Счётчики активных объектов по дереву локаций.
+
+Location.properties_count — число активных объектов в узле и во всех
+вложенных. Объект в Чангу учитывается у Чангу, Бадунга и Бали, поэтому
+выпадающий список локаций с числами строится одним SELECT по дереву.
+
+Два режима:
+    * adjust — объект появился/исчез в узле: один UPDATE по предкам
+      (диапазон lft/rght внутри tree_id);
+    * recount_all — полный пересчёт (после массового импорта, переноса
+      узлов в админке и ночью для сверки).
+"""
+from django.db import transaction
+from django.db.models import Count, F
+
+
+def adjust(location_id, delta):
+    """Прибавить delta к счётчикам узла и всех его предков."""
+    from .models import Location
+
+    if not location_id or not delta:
+        return
+    node = Location.objects.filter(pk=location_id).values("tree_id", "lft", "rght").first()
+    if node is None:
+        return
+    Location.objects.filter(
+        tree_id=node["tree_id"], lft__lte=node["lft"], rght__gte=node["rght"]
+    ).update(properties_count=F("properties_count") + delta)
+    _invalidate_reference()
+
+
+def recount_all():
+    """
+    Пересчитать счётчики всех узлов.
+
+    Returns:
+        int: число узлов, у которых счётчик изменился.
+    """
+    from .models import Location, Property
+
+    direct = dict(
+        Property.objects.filter(is_active=True, location__isnull=False)
+        .values_list("location_id")
+        .annotate(Count("pk"))
+        .order_by()
+    )
+    nodes = list(Location.objects.order_by("tree_id", "lft").values_list("pk", "parent_id", "properties_count"))
+    totals = {pk: direct.get(pk, 0) for pk, _, _ in nodes}
+    # В порядке обхода дерева потомки идут после предков — суммируем снизу вверх
+    for pk, parent_id, _ in reversed(nodes):
+        if parent_id:
+            totals[parent_id] += totals[pk]
+
+    changed = [
+        Location(pk=pk, properties_count=totals[pk])
+        for pk, _, current in nodes
+        if current != totals[pk]
+    ]
+    with transaction.atomic():
+        Location.objects.bulk_update(changed, ["properties_count"], batch_size=500)
+    if changed:
+        _invalidate_reference()
+    return len(changed)
+
+
+def _invalidate_reference():
+    """Счётчики входят в закэшированный список локаций (core/reference.py)."""
+    from core import reference
+
+    transaction.on_commit(lambda: reference.invalidate("locations"))
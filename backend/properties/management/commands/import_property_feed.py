@@ -0,0 +1,46 @@
+# properties/management/commands/import_property_feed.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from developers.models import Developer
+from properties.feeds import BATCH_SIZE, WORKERS, FeedImporter, open_feed
+
+
+class Command(BaseCommand):
+    help = "Импорт фида застройщика (CSV или XML): создание и обновление объектов по id из фида"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу .csv или .xml")
+        parser.add_argument("--developer", required=True, help="slug застройщика")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Строк в одной пачке")
+        parser.add_argument("--workers", type=int, default=WORKERS, help="Потоков скачивания фото")
+        parser.add_argument("--no-images", action="store_true", help="Не скачивать фото")
+
+    def handle(self, *args, **options):
+        developer = Developer.objects.filter(slug=options["developer"]).first()
+        if developer is None:
+            raise CommandError(f"Застройщик «{options['developer']}» не найден")
+        try:
+            f = open(options["path"], "rb")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        importer = FeedImporter(
+            developer,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            download_images=not options["no_images"],
+        )
+        with f:
+            report = importer.run(open_feed(f, options["path"]), progress=self._progress)
+
+        for line, message in report.errors[:50]:
+            self.stderr.write(f"Строка {line}: {message}")
+        if report.failed > 50:
+            self.stderr.write(f"... и ещё {report.failed - 50} ошибок")
+        self.stdout.write(self.style.SUCCESS(f"Импорт завершён: {report.summary()}"))
+
+    def _progress(self, report):
+        elapsed = time.monotonic() - report.started
+        self.stdout.write(f"  {report.rows} строк, {report.rows / elapsed:.0f} строк/с")
@@ -0,0 +1,89 @@
+# properties/management/commands/import_units.py
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.models import Property, Unit
+from properties.units import import_units
+
+CHUNK_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Загрузка юнитов из CSV с колонками property (slug объекта), number, floor, rooms, area, price, status. "
+        "Существующие юниты (тот же объект и номер) обновляются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к CSV-файлу")
+        parser.add_argument("--delimiter", default=",", help="Разделитель колонок")
+
+    def handle(self, *args, **options):
+        try:
+            f = open(options["path"], encoding="utf-8-sig", newline="")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        with f:
+            reader = csv.DictReader(f, delimiter=options["delimiter"])
+            missing = {"property", "number"} - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f"Нет колонок: {', '.join(sorted(missing))}")
+
+            loaded, errors, chunk = 0, [], []
+            for line, row in enumerate(reader, start=2):
+                chunk.append((line, row))
+                if len(chunk) >= CHUNK_SIZE:
+                    loaded += self._load(chunk, errors)
+                    chunk = []
+            loaded += self._load(chunk, errors)
+
+        for line, message in errors[:50]:
+            self.stderr.write(f"Строка {line}: {message}")
+        if len(errors) > 50:
+            self.stderr.write(f"... и ещё {len(errors) - 50} ошибок")
+        self.stdout.write(self.style.SUCCESS(f"Загружено юнитов: {loaded}, ошибок: {len(errors)}"))
+
+    def _load(self, chunk, errors):
+        """Один запрос на slug-и пачки, затем одна пачка INSERT ... ON CONFLICT."""
+        slugs = {row["property"].strip() for _, row in chunk}
+        property_ids = dict(Property.objects.filter(slug__in=slugs).values_list("slug", "pk"))
+        objs = []
+        for line, row in chunk:
+            try:
+                objs.append(self._unit(row, property_ids))
+            except ValueError as e:
+                errors.append((line, str(e)))
+        return import_units(objs) if objs else 0
+
+    def _unit(self, row, property_ids):
+        slug = row["property"].strip()
+        if slug not in property_ids:
+            raise ValueError(f"объект «{slug}» не найден")
+        number = (row.get("number") or "").strip()
+        if not number:
+            raise ValueError("пустой номер юнита")
+        status = (row.get("status") or Unit.Status.AVAILABLE).strip().lower()
+        if status not in Unit.Status.values:
+            raise ValueError(f"неизвестный статус «{status}»")
+        return Unit(
+            property_id=property_ids[slug],
+            number=number,
+            floor=_number(row, "floor", int),
+            rooms=_number(row, "rooms", int),
+            area=_number(row, "area", Decimal),
+            price=_number(row, "price", Decimal),
+            status=status,
+        )
+
+
+def _number(row, column, cast):
+    value = (row.get(column) or "").strip().replace(" ", "")
+    if not value:
+        return None
+    try:
+        return cast(value)
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"{column}: «{value}» — не число")
@@ -0,0 +1,12 @@
+# properties/management/commands/rebuild_similar_properties.py
+from django.core.management.base import BaseCommand
+
+from properties.similarity import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Полный пересчёт похожих объектов по вектору признаков"
+
+    def handle(self, *args, **options):
+        links = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Сохранено связей: {links}"))
@@ -0,0 +1,12 @@
+# properties/management/commands/recount_location_properties.py
+from django.core.management.base import BaseCommand
+
+from properties.locations import recount_all
+
+
+class Command(BaseCommand):
+    help = "Пересчёт числа активных объектов по дереву локаций"
+
+    def handle(self, *args, **options):
+        changed = recount_all()
+        self.stdout.write(self.style.SUCCESS(f"Обновлено локаций: {changed}"))
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarProperty",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Позиция")),
+                ("distance", models.FloatField(verbose_name="Расстояние")),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_links",
+                        to="properties.property",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_of",
+                        to="properties.property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожий объект",
+                "verbose_name_plural": "Похожие объекты",
+                "ordering": ["property", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="similarproperty",
+            constraint=models.UniqueConstraint(
+                fields=("property", "rank"), name="similar_property_rank_unique"
+            ),
+        ),
+    ]
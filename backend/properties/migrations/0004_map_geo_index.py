@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0003_geo_grid"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["geo_cell", "latitude", "longitude"],
+                name="property_active_geo_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:20
+
+import django.db.models.deletion
+import mptt.fields
+from django.db import migrations, models
+
+
+def build_tree(apps, schema_editor):
+    """Существующие плоские локации становятся корнями; дерево собирается в админке."""
+    Location = apps.get_model("properties", "Location")
+    Property = apps.get_model("properties", "Property")
+    counts = dict(
+        Property.objects.filter(is_active=True, location__isnull=False)
+        .values_list("location_id")
+        .annotate(models.Count("pk"))
+    )
+    for tree_id, location in enumerate(Location.objects.order_by("name"), start=1):
+        location.tree_id = tree_id
+        location.lft, location.rght, location.level = 1, 2, 0
+        location.properties_count = counts.get(location.pk, 0)
+        location.save(update_fields=["tree_id", "lft", "rght", "level", "properties_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0004_map_geo_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="location",
+            options={
+                "ordering": ["tree_id", "lft"],
+                "verbose_name": "Локация",
+                "verbose_name_plural": "Локации",
+            },
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="kind",
+            field=models.CharField(
+                choices=[("region", "Регион"), ("regency", "Округ"), ("area", "Район")],
+                default="area",
+                max_length=20,
+                verbose_name="Уровень",
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="parent",
+            field=mptt.fields.TreeForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="children",
+                to="properties.location",
+                verbose_name="Входит в",
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="properties_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Объектов"
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="level",
+            field=models.PositiveIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="lft",
+            field=models.PositiveIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="rght",
+            field=models.PositiveIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="tree_id",
+            field=models.PositiveIntegerField(
+                db_index=True, default=0, editable=False
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(build_tree, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["tree_id", "lft"], name="location_tree_lft_idx"
+            ),
+        ),
+    ]
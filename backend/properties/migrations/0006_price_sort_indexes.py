@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:19
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+
+
+def fill_price_per_m2(apps, schema_editor):
+    """Цена за м² для существующих объектов (как properties.models.price_per_m2)."""
+    Property = apps.get_model("properties", "Property")
+    batch = []
+    rows = (
+        Property.objects.filter(price_from__isnull=False, area__gt=0)
+        .values_list("pk", "price_from", "area")
+        .iterator(chunk_size=5000)
+    )
+    for pk, price, area in rows:
+        value = (Decimal(price) / area).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        batch.append(Property(pk=pk, price_per_m2=value))
+        if len(batch) >= 5000:
+            Property.objects.bulk_update(batch, ["price_per_m2"])
+            batch = []
+    Property.objects.bulk_update(batch, ["price_per_m2"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0005_location_tree"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="price_per_m2",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                max_digits=12,
+                null=True,
+                verbose_name="Цена за м² ($)",
+            ),
+        ),
+        migrations.RunPython(fill_price_per_m2, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("price_from__isnull", False)),
+                fields=["price_from", "id"],
+                name="property_active_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("price_per_m2__isnull", False)),
+                fields=["price_per_m2", "id"],
+                name="property_active_price_m2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("roi_percent__isnull", False)),
+                fields=["roi_percent", "id"],
+                name="property_active_roi_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0006_price_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="unit_price_max",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                max_digits=12,
+                null=True,
+                verbose_name="Свободные юниты: цена до ($)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="unit_price_min",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                max_digits=12,
+                null=True,
+                verbose_name="Свободные юниты: цена от ($)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="units_available",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Свободных юнитов"
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="units_total",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Юнитов всего"
+            ),
+        ),
+        migrations.CreateModel(
+            name="Unit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.CharField(max_length=20, verbose_name="Номер")),
+                (
+                    "floor",
+                    models.SmallIntegerField(
+                        blank=True, null=True, verbose_name="Этаж"
+                    ),
+                ),
+                (
+                    "rooms",
+                    models.PositiveSmallIntegerField(
+                        blank=True, null=True, verbose_name="Комнат"
+                    ),
+                ),
+                (
+                    "area",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Площадь (м²)",
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=0,
+                        max_digits=12,
+                        null=True,
+                        verbose_name="Цена ($)",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("available", "Свободен"),
+                            ("reserved", "Забронирован"),
+                            ("sold", "Продан"),
+                        ],
+                        default="available",
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="units",
+                        to="properties.property",
+                        verbose_name="Объект",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Юнит",
+                "verbose_name_plural": "Юниты",
+                "ordering": ["property", "floor", "number"],
+                "indexes": [
+                    models.Index(
+                        fields=["property", "status", "price"],
+                        name="unit_property_status_price_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="unit",
+            constraint=models.UniqueConstraint(
+                fields=("property", "number"), name="unit_property_number_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,161 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:34
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("developers", "0003_rating_engine"),
+        ("properties", "0007_units"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedImport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to="imports/",
+                        validators=[
+                            django.core.validators.FileExtensionValidator(
+                                ["csv", "xml"]
+                            )
+                        ],
+                        verbose_name="Файл (CSV или XML)",
+                    ),
+                ),
+                (
+                    "download_images",
+                    models.BooleanField(default=True, verbose_name="Скачивать фото"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("done", "Готово"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        editable=False,
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "rows",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Строк"
+                    ),
+                ),
+                (
+                    "created",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Создано"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Обновлено"
+                    ),
+                ),
+                (
+                    "failed",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Ошибок"
+                    ),
+                ),
+                (
+                    "images",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Скачано фото"
+                    ),
+                ),
+                (
+                    "rows_per_second",
+                    models.FloatField(
+                        default=0, editable=False, verbose_name="Строк в секунду"
+                    ),
+                ),
+                (
+                    "errors",
+                    models.TextField(blank=True, editable=False, verbose_name="Ошибки"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Загружен"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, editable=False, null=True, verbose_name="Завершён"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Импорт фида",
+                "verbose_name_plural": "Импорт фидов",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="external_id",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=100,
+                null=True,
+                verbose_name="ID в фиде",
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="source_url",
+            field=models.URLField(
+                blank=True,
+                editable=False,
+                max_length=500,
+                null=True,
+                verbose_name="Источник",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="property",
+            constraint=models.UniqueConstraint(
+                fields=("developer", "external_id"),
+                name="property_developer_external_id_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="propertyimage",
+            constraint=models.UniqueConstraint(
+                fields=("property", "source_url"), name="property_image_source_unique"
+            ),
+        ),
+        migrations.AddField(
+            model_name="feedimport",
+            name="developer",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="feed_imports",
+                to="developers.developer",
+                verbose_name="Застройщик",
+            ),
+        ),
+    ]
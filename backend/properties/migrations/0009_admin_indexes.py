@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+from core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0008_feed_import"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["is_featured", "created_at", "id"],
+                name="property_admin_order_idx",
+            ),
+        ),
+        # GIN-индекс для полнотекстового поиска в админке; только PostgreSQL
+        search_index_operation(
+            "properties", "property", "property_search_idx", ["name", "short_description", "description"]
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0009_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="description_en",
+            field=models.TextField(
+                blank=True, verbose_name="Полное описание (HTML, EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="name_en",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Название (EN)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="short_description_en",
+            field=models.TextField(
+                blank=True, max_length=500, verbose_name="Краткое описание (EN)"
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:28
+
+from django.db import migrations, models
+
+
+class AddDescIndex(migrations.AddIndex):
+    """
+    Индекс с DESC NULLS LAST. NULLS LAST в индексе понимает PostgreSQL;
+    в SQLite NULL меньше любого значения, и при DESC он и так в конце.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = self.index.clone()
+            index.expressions = tuple(
+                models.OrderBy(expression.expression, descending=expression.descending)
+                for expression in index.expressions
+            )
+            schema_editor.add_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0010_content_translations"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_active_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_active_price_m2_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_active_roi_idx",
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["price_from", "id"],
+                name="property_active_price_idx",
+            ),
+        ),
+        AddDescIndex(
+            model_name="property",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("price_from"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("is_active", True)),
+                name="property_price_desc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["price_per_m2", "id"],
+                name="property_active_price_m2_idx",
+            ),
+        ),
+        AddDescIndex(
+            model_name="property",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("price_per_m2"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("is_active", True)),
+                name="property_price_m2_desc_idx",
+            ),
+        ),
+        AddDescIndex(
+            model_name="property",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("roi_percent"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("is_active", True)),
+                name="property_active_roi_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,15 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.validators import FileExtensionValidator
 from django.db import models
+from django.db.models import F, Q
 from django.urls import reverse
 from django.utils.text import slugify
+from mptt.models import MPTTModel, TreeForeignKey
+
+from core.geo import GeoPointMixin
+from core.projections import CardProjectionMixin, CardQuerySet
+from core.translation import TranslatableMixin
 
 
 class PropertyType(models.Model):
@@ -16,23 +25,74 @@ class PropertyType(models.Model):
         return self.name
 
 
-class Location(models.Model):
-    """Локации: Чангу, Убуд, Семиньяк"""
+class Location(MPTTModel):
+    """Локации деревом: регион > округ > район (Бали > Бадунг > Чангу)"""
+
+    class Kind(models.TextChoices):
+        REGION = "region", "Регион"
+        REGENCY = "regency", "Округ"
+        AREA = "area", "Район"
+
     name = models.CharField("Название", max_length=100)
     slug = models.SlugField(unique=True)
     description = models.TextField("Описание", blank=True)
+    parent = TreeForeignKey(
+        "self", on_delete=models.CASCADE,
+        null=True, blank=True, related_name="children", verbose_name="Входит в"
+    )
+    kind = models.CharField("Уровень", max_length=20, choices=Kind.choices, default=Kind.AREA)
+
+    # Активные объекты в узле и всех вложенных (properties/locations.py)
+    properties_count = models.PositiveIntegerField("Объектов", default=0, editable=False)
+
+    class MPTTMeta:
+        order_insertion_by = ["name"]
 
     class Meta:
         verbose_name = "Локация"
         verbose_name_plural = "Локации"
-        ordering = ["name"]
+        ordering = ["tree_id", "lft"]
+        indexes = [
+            # Поддерево узла — диапазон lft внутри tree_id
+            models.Index(fields=["tree_id", "lft"], name="location_tree_lft_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def subtree_q(self, prefix="location"):
+        """Условие «в этом узле или вложенных»: один диапазон по индексу (tree_id, lft)."""
+        return models.Q(**{
+            f"{prefix}__tree_id": self.tree_id,
+            f"{prefix}__lft__gte": self.lft,
+            f"{prefix}__lft__lte": self.rght,
+        })
 
-class Property(models.Model):
+
+def price_per_m2(price, area):
+    """Цена за м², округлённая до доллара (None, если цены или площади нет)."""
+    if price is None or not area:
+        return None
+    return (Decimal(price) / area).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+
+
+class Property(TranslatableMixin, CardProjectionMixin, GeoPointMixin):
     """Объект недвижимости"""
+    CARD_FIELDS = (
+        "name", "slug", "developer", "property_type", "location", "main_image",
+        "price_from", "area", "price_per_m2", "rooms", "status", "construction_status",
+        "completion_date", "roi_percent", "is_featured", "is_active",
+        "units_total", "units_available", "unit_price_min", "unit_price_max",
+    )
+    CARD_RELATED = {
+        "developer": ("name", "slug", "rating", "is_verified"),
+        "property_type": ("name", "slug"),
+        "location": ("name", "slug"),
+    }
+    # Полнотекстовый поиск в админке (core/search.py, индекс — миграция 0009)
+    SEARCH_FIELDS = ("name", "short_description", "description")
+    # Поля с переводом в колонках <поле>_en (core/translation.py)
+    TRANSLATED_FIELDS = ("name", "short_description", "description")
     
     class Status(models.TextChoices):
         SALE = "sale", "Продажа"
@@ -59,7 +119,11 @@ class Property(models.Model):
         Location, on_delete=models.SET_NULL,
         null=True, related_name="properties", verbose_name="Локация"
     )
+    # Идентификатор объекта в фиде застройщика (properties/feeds.py); у заведённых вручную — NULL
+    external_id = models.CharField("ID в фиде", max_length=100, null=True, blank=True, editable=False)
     
+    # Координаты для карты: latitude/longitude/geo_cell из GeoPointMixin
+
     # Медиа
     main_image = models.ImageField("Главное фото", upload_to="properties/")
     
@@ -67,6 +131,10 @@ class Property(models.Model):
     price_from = models.DecimalField("Цена от ($)", max_digits=12, decimal_places=0, null=True, blank=True)
     area = models.PositiveIntegerField("Площадь (м²)", null=True, blank=True)
     rooms = models.PositiveSmallIntegerField("Комнат", null=True, blank=True)
+    # price_from / area, пересчитывается в save() — для сортировки по индексу
+    price_per_m2 = models.DecimalField(
+        "Цена за м² ($)", max_digits=12, decimal_places=0, null=True, blank=True, editable=False
+    )
     
     # Статусы
     status = models.CharField("Статус продажи", max_length=20, choices=Status.choices, default=Status.SALE)
@@ -79,20 +147,79 @@ class Property(models.Model):
     # Контент
     short_description = models.TextField("Краткое описание", max_length=500, blank=True)
     description = models.TextField("Полное описание (HTML)", blank=True)
+
+    # Перевод (пусто — показывается русский текст)
+    name_en = models.CharField("Название (EN)", max_length=255, blank=True)
+    short_description_en = models.TextField("Краткое описание (EN)", max_length=500, blank=True)
+    description_en = models.TextField("Полное описание (HTML, EN)", blank=True)
     
     # ROI
     roi_percent = models.DecimalField("ROI %", max_digits=4, decimal_places=1, null=True, blank=True)
     
+    # Сводка по юнитам (Unit) — пересчитывается в properties/units.py, списки читают только её
+    units_total = models.PositiveIntegerField("Юнитов всего", default=0, editable=False)
+    units_available = models.PositiveIntegerField("Свободных юнитов", default=0, editable=False)
+    unit_price_min = models.DecimalField(
+        "Свободные юниты: цена от ($)", max_digits=12, decimal_places=0, null=True, blank=True, editable=False
+    )
+    unit_price_max = models.DecimalField(
+        "Свободные юниты: цена до ($)", max_digits=12, decimal_places=0, null=True, blank=True, editable=False
+    )
+    
     is_featured = models.BooleanField("Рекомендуемый", default=False)
     is_active = models.BooleanField("Активен", default=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Объект"
         verbose_name_plural = "Объекты"
         ordering = ["-is_featured", "-created_at"]
+        indexes = [
+            # Карта: диапазоны geo_cell по активным объектам без обращения к таблице
+            models.Index(
+                fields=["geo_cell", "latitude", "longitude"],
+                condition=Q(is_active=True),
+                name="property_active_geo_idx",
+            ),
+            # Сортировки каталога (properties/views.py SORTS): ключ + pk по активным
+            # объектам. Объекты без ключа идут в конце (NULLS LAST), поэтому
+            # по убыванию — отдельный индекс: обратный проход дал бы NULLS FIRST
+            models.Index(
+                fields=["price_from", "id"],
+                condition=Q(is_active=True),
+                name="property_active_price_idx",
+            ),
+            models.Index(
+                F("price_from").desc(nulls_last=True), F("id").desc(),
+                condition=Q(is_active=True),
+                name="property_price_desc_idx",
+            ),
+            models.Index(
+                fields=["price_per_m2", "id"],
+                condition=Q(is_active=True),
+                name="property_active_price_m2_idx",
+            ),
+            models.Index(
+                F("price_per_m2").desc(nulls_last=True), F("id").desc(),
+                condition=Q(is_active=True),
+                name="property_price_m2_desc_idx",
+            ),
+            models.Index(
+                F("roi_percent").desc(nulls_last=True), F("id").desc(),
+                condition=Q(is_active=True),
+                name="property_active_roi_idx",
+            ),
+            # Список в админке: порядок Meta.ordering + pk без сортировки всей таблицы
+            models.Index(fields=["is_featured", "created_at", "id"], name="property_admin_order_idx"),
+        ]
+        constraints = [
+            # Ключ upsert при импорте фида: ON CONFLICT (developer_id, external_id)
+            models.UniqueConstraint(fields=["developer", "external_id"], name="property_developer_external_id_unique"),
+        ]
 
     def __str__(self):
         return self.name
@@ -100,19 +227,124 @@ class Property(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        self.price_per_m2 = price_per_m2(self.price_from, self.area)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"price_from", "area"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "price_per_m2"}
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("properties:detail", kwargs={"slug": self.slug})
 
+    def get_similar(self, limit=4):
+        """Похожие объекты: чтение предрасчитанных соседей по индексу (property, rank)."""
+        return (
+            Property.objects.cards()
+            .filter(similar_of__property=self, is_active=True)
+            .order_by("similar_of__rank")[:limit]
+        )
+
 
 class PropertyImage(models.Model):
     """Дополнительные фото объекта"""
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField("Фото", upload_to="properties/gallery/")
     order = models.PositiveIntegerField("Порядок", default=0)
+    # Откуда фото скачано при импорте фида; у загруженных вручную — NULL
+    source_url = models.URLField("Источник", max_length=500, null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = "Фото объекта"
         verbose_name_plural = "Фото объектов"
-        ordering = ["order"]
\ No newline at end of file
+        ordering = ["order"]
+        constraints = [
+            models.UniqueConstraint(fields=["property", "source_url"], name="property_image_source_unique"),
+        ]
+
+
+class Unit(models.Model):
+    """Юнит объекта: квартира, вилла, апартамент (сводка — Property.units_*)"""
+
+    class Status(models.TextChoices):
+        AVAILABLE = "available", "Свободен"
+        RESERVED = "reserved", "Забронирован"
+        SOLD = "sold", "Продан"
+
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="units", verbose_name="Объект")
+    number = models.CharField("Номер", max_length=20)
+    floor = models.SmallIntegerField("Этаж", null=True, blank=True)
+    rooms = models.PositiveSmallIntegerField("Комнат", null=True, blank=True)
+    area = models.DecimalField("Площадь (м²)", max_digits=8, decimal_places=2, null=True, blank=True)
+    price = models.DecimalField("Цена ($)", max_digits=12, decimal_places=0, null=True, blank=True)
+    status = models.CharField("Статус", max_length=20, choices=Status.choices, default=Status.AVAILABLE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Юнит"
+        verbose_name_plural = "Юниты"
+        ordering = ["property", "floor", "number"]
+        constraints = [
+            models.UniqueConstraint(fields=["property", "number"], name="unit_property_number_unique"),
+        ]
+        indexes = [
+            # Сводка объекта: COUNT/MIN/MAX по свободным юнитам — диапазон индекса
+            models.Index(fields=["property", "status", "price"], name="unit_property_status_price_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.property} — {self.number}"
+
+
+class SimilarProperty(models.Model):
+    """Похожие объекты, предрасчитанные по вектору признаков (properties/similarity.py)"""
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="similar_links")
+    similar = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="similar_of")
+    rank = models.PositiveSmallIntegerField("Позиция")
+    distance = models.FloatField("Расстояние")
+
+    class Meta:
+        verbose_name = "Похожий объект"
+        verbose_name_plural = "Похожие объекты"
+        ordering = ["property", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["property", "rank"], name="similar_property_rank_unique"),
+        ]
+
+
+class FeedImport(models.Model):
+    """Загрузка фида застройщика через админку (обработка — properties/feeds.py в Celery)"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Готово"
+        FAILED = "failed", "Ошибка"
+
+    developer = models.ForeignKey(
+        "developers.Developer", on_delete=models.CASCADE,
+        related_name="feed_imports", verbose_name="Застройщик"
+    )
+    file = models.FileField(
+        "Файл (CSV или XML)", upload_to="imports/", validators=[FileExtensionValidator(["csv", "xml"])]
+    )
+    download_images = models.BooleanField("Скачивать фото", default=True)
+    status = models.CharField("Статус", max_length=20, choices=Status.choices, default=Status.PENDING, editable=False)
+
+    rows = models.PositiveIntegerField("Строк", default=0, editable=False)
+    created = models.PositiveIntegerField("Создано", default=0, editable=False)
+    updated = models.PositiveIntegerField("Обновлено", default=0, editable=False)
+    failed = models.PositiveIntegerField("Ошибок", default=0, editable=False)
+    images = models.PositiveIntegerField("Скачано фото", default=0, editable=False)
+    rows_per_second = models.FloatField("Строк в секунду", default=0, editable=False)
+    errors = models.TextField("Ошибки", blank=True, editable=False)
+
+    created_at = models.DateTimeField("Загружен", auto_now_add=True)
+    finished_at = models.DateTimeField("Завершён", null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = "Импорт фида"
+        verbose_name_plural = "Импорт фидов"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.developer} — {self.created_at:%d.%m.%Y %H:%M}"
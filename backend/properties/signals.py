@@ -0,0 +1,122 @@
+# properties/signals.py
+"""Пересчёт похожих объектов, счётчиков локаций и сводки юнитов при изменениях."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.tasks import dispatch
+
+from . import locations, units
+from .models import Location, Property, SimilarProperty, Unit
+from .similarity import FEATURE_FIELDS
+from .tasks import refresh_similar_properties
+
+
+def _features(instance):
+    return tuple(getattr(instance, field) for field in FEATURE_FIELDS)
+
+
+def _counted_location(features):
+    """Локация, в счётчике которой учитывается объект (None — не учитывается)."""
+    values = dict(zip(FEATURE_FIELDS, features))
+    return values["location_id"] if values["is_active"] else None
+
+
+@receiver(pre_save, sender=Property)
+def remember_features(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        instance._features_before = None
+        return
+    instance._features_before = (
+        Property.objects.filter(pk=instance.pk).values_list(*FEATURE_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Property)
+def schedule_similar_refresh(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if not created and getattr(instance, "_features_before", None) == _features(instance):
+        return
+    if created and not instance.is_active:
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: dispatch(refresh_similar_properties, pk))
+
+
+@receiver(post_save, sender=Property)
+def update_location_counts(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_features_before", None)
+    old = _counted_location(before) if before else None
+    new = _counted_location(_features(instance))
+    if old != new:
+        locations.adjust(old, -1)
+        locations.adjust(new, 1)
+
+
+@receiver(pre_delete, sender=Property)
+def remember_similar_of(sender, instance, **kwargs):
+    """Чьи списки ссылались на объект — их строки удалятся каскадом."""
+    instance._similar_of = list(
+        SimilarProperty.objects.filter(similar_id=instance.pk).values_list("property_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Property)
+def decrement_location_count(sender, instance, **kwargs):
+    if instance.is_active:
+        locations.adjust(instance.location_id, -1)
+
+
+@receiver(pre_save, sender=Location)
+def remember_location_parent(sender, instance, raw=False, **kwargs):
+    instance._parent_before = (
+        Location.objects.filter(pk=instance.pk).values_list("parent_id", flat=True).first()
+        if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Location)
+def recount_on_move(sender, instance, created, raw=False, **kwargs):
+    """Перенос узла меняет суммы у старых и новых предков — пересчитываем целиком (узлов немного)."""
+    if raw or created or instance._parent_before == instance.parent_id:
+        return
+    transaction.on_commit(locations.recount_all)
+
+
+@receiver(post_delete, sender=Location)
+def recount_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(locations.recount_all)
+
+
+@receiver(post_delete, sender=Property)
+def schedule_similar_refresh_on_delete(sender, instance, **kwargs):
+    affected = getattr(instance, "_similar_of", [])
+    if affected:
+        pk = instance.pk
+        transaction.on_commit(lambda: dispatch(refresh_similar_properties, pk, affected))
+
+
+@receiver(pre_save, sender=Unit)
+def remember_unit_property(sender, instance, raw=False, **kwargs):
+    instance._property_before = (
+        Unit.objects.filter(pk=instance.pk).values_list("property_id", flat=True).first()
+        if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Unit)
+def refresh_unit_rollup(sender, instance, raw=False, **kwargs):
+    """Правка одного юнита (админка): сводка его объекта, а при переносе — и прежнего."""
+    if raw:
+        return
+    property_ids = {instance.property_id, getattr(instance, "_property_before", None)}
+    transaction.on_commit(lambda: units.refresh_rollups(property_ids))
+
+
+@receiver(post_delete, sender=Unit)
+def refresh_unit_rollup_on_delete(sender, instance, **kwargs):
+    property_id = instance.property_id
+    transaction.on_commit(lambda: units.refresh_rollups([property_id]))
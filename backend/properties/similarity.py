@@ -0,0 +1,321 @@
+# properties/similarity.py
+"""
+Похожие объекты по вектору признаков.
+
+Каждый активный объект превращается в вектор:
+    * log(цена), log(площадь), комнаты, ROI — стандартизованы по каталогу
+      (пропуски = среднее, т.е. 0 после стандартизации);
+    * локация и статус строительства — one-hot.
+Веса признаков (SIMILAR_PROPERTIES["WEIGHTS"]) вшиты в масштаб координат,
+поэтому расстояние — обычная евклидова метрика.
+
+Тип недвижимости используется как блок: соседи ищутся только среди
+объектов того же типа (вилла не бывает «похожа» на апартаменты).
+Внутри блока top-k считается матричными операциями NumPy по кускам
+из CHUNK_SIZE строк, так что память ограничена CHUNK_SIZE × размер блока.
+
+Результат хранится в SimilarProperty (property, rank) — страница объекта
+читает k соседей по первичным ключам без расчётов.
+
+Два режима:
+    * rebuild_all — полный пересчёт (ночная задача);
+    * refresh_for — после изменения одного объекта пересчитываются его
+      соседи и списки тех объектов, куда он входил или теперь должен войти;
+      читаются только блоки затронутых объектов.
+"""
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from core.caching import get_or_build, store
+
+DEFAULTS = {
+    "K": 8,
+    "CHUNK_SIZE": 256,
+    "WEIGHTS": {
+        "price": 2.0,
+        "area": 1.0,
+        "rooms": 1.0,
+        "roi": 0.5,
+        "location": 1.5,
+        "construction_status": 0.5,
+    },
+}
+
+# Кодирование признаков по всему каталогу: пишет rebuild_all, читает refresh_for
+SCALER_KEY = "similar-properties:scaler"
+SCALER_TIMEOUT = 2 * 24 * 60 * 60
+
+# Поля, от которых зависит вектор; их изменение требует пересчёта
+FEATURE_FIELDS = (
+    "is_active", "property_type_id", "location_id", "construction_status",
+    "price_from", "area", "rooms", "roi_percent",
+)
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, "SIMILAR_PROPERTIES", {})}
+    config["WEIGHTS"] = {**DEFAULTS["WEIGHTS"], **config["WEIGHTS"]}
+    return config
+
+
+@dataclass
+class Catalog:
+    """Матрица признаков активного каталога."""
+    ids: np.ndarray      # pk объектов, по возрастанию
+    blocks: np.ndarray   # property_type_id (-1 — без типа)
+    matrix: np.ndarray   # признаки, float32
+    norms: np.ndarray    # квадраты норм строк
+
+    def position(self, property_id):
+        pos = int(np.searchsorted(self.ids, property_id))
+        if pos < len(self.ids) and self.ids[pos] == property_id:
+            return pos
+        return None
+
+    def block(self, block_id):
+        return np.flatnonzero(self.blocks == block_id)
+
+
+@dataclass
+class Scaler:
+    """
+    Параметры кодирования признаков, посчитанные по всему каталогу:
+    среднее и отклонение числовых признаков, словари one-hot.
+    """
+    means: np.ndarray      # log(цена), log(площадь), комнаты, ROI
+    stds: np.ndarray
+    locations: np.ndarray  # location_id (-1 — без локации), по возрастанию
+    statuses: np.ndarray   # construction_status, по возрастанию
+
+    @classmethod
+    def fit(cls, rows):
+        numeric = _numeric(rows)
+        finite = np.isfinite(numeric).any(axis=0)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            means = np.where(finite, np.nanmean(numeric, axis=0), 0.0)
+            stds = np.where(finite, np.nanstd(numeric, axis=0), 0.0)
+        return cls(
+            means=means,
+            stds=np.where(stds > 0, stds, 1.0),
+            locations=np.unique(np.array([row[2] or -1 for row in rows], dtype=np.int64)),
+            statuses=np.unique(np.array([row[3] for row in rows], dtype=str)),
+        )
+
+    def transform(self, rows, weights):
+        """Строки → матрица признаков с весами, вшитыми в масштаб."""
+        scaled = np.nan_to_num((_numeric(rows) - self.means) / self.stds, nan=0.0)
+        columns = [
+            scaled[:, 0:1] * np.sqrt(weights["price"]),
+            scaled[:, 1:2] * np.sqrt(weights["area"]),
+            scaled[:, 2:3] * np.sqrt(weights["rooms"]),
+            scaled[:, 3:4] * np.sqrt(weights["roi"]),
+            # Несовпадение one-hot даёт 2 в квадрате расстояния, отсюда w / 2
+            _one_hot(np.array([row[2] or -1 for row in rows], dtype=np.int64), self.locations)
+            * np.sqrt(weights["location"] / 2),
+            _one_hot(np.array([row[3] for row in rows], dtype=str), self.statuses)
+            * np.sqrt(weights["construction_status"] / 2),
+        ]
+        return np.hstack(columns).astype(np.float32)
+
+
+def _numeric(rows):
+    numeric = np.array([row[4:] for row in rows], dtype=float).reshape(-1, 4)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        numeric[:, 0] = np.log1p(numeric[:, 0])
+        numeric[:, 1] = np.log1p(numeric[:, 1])
+    return numeric
+
+
+def _one_hot(values, vocabulary):
+    """Значения, которых нет в словаре (появились после fit), дают нулевую строку."""
+    encoded = np.zeros((len(values), len(vocabulary)), dtype=np.float32)
+    if len(values) and len(vocabulary):
+        slots = np.searchsorted(vocabulary, values).clip(max=len(vocabulary) - 1)
+        known = vocabulary[slots] == values
+        encoded[np.flatnonzero(known), slots[known]] = 1.0
+    return encoded
+
+
+def _rows(blocks=None):
+    """Лёгкие колонки активных объектов (всех или типов blocks; -1 — без типа) по pk."""
+    from .models import Property
+
+    queryset = Property.objects.filter(is_active=True)
+    if blocks is not None:
+        types = [block for block in blocks if block >= 0]
+        condition = Q(property_type_id__in=types)
+        if -1 in blocks:
+            condition |= Q(property_type__isnull=True)
+        queryset = queryset.filter(condition)
+    return list(
+        queryset.order_by("pk").values_list(
+            "pk", "property_type_id", "location_id", "construction_status",
+            "price_from", "area", "rooms", "roi_percent",
+        ).iterator(chunk_size=10_000)
+    )
+
+
+def fit_scaler():
+    """Scaler по всему каталогу; его же кладёт в кэш rebuild_all."""
+    return Scaler.fit(_rows())
+
+
+def load_catalog(config=None, blocks=None, scaler=None):
+    """
+    Один SELECT по лёгким колонкам активных объектов → Catalog.
+
+    blocks — только объекты этих типов (соседи ищутся внутри типа, так что
+    блоки независимы); scaler — кодирование, посчитанное по всему каталогу.
+    Без scaler он считается по загруженным строкам.
+    """
+    config = config or get_config()
+    rows = _rows(blocks)
+    scaler = scaler or Scaler.fit(rows)
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    block_ids = np.array([row[1] if row[1] is not None else -1 for row in rows], dtype=np.int64)
+    matrix = scaler.transform(rows, config["WEIGHTS"]) if rows else np.zeros((0, 0), dtype=np.float32)
+    return Catalog(ids=ids, blocks=block_ids, matrix=matrix, norms=(matrix ** 2).sum(axis=1))
+
+
+def _distances(catalog, query, members):
+    """Квадраты расстояний от строк query до строк members."""
+    block = catalog.matrix[members]
+    d = catalog.norms[query, None] + catalog.norms[None, members] - 2.0 * (catalog.matrix[query] @ block.T)
+    return np.maximum(d, 0.0)
+
+
+def nearest(catalog, positions, config=None):
+    """
+    Top-k соседей для строк каталога positions.
+
+    Returns:
+        list[(property_id, similar_id, rank, distance)]
+    """
+    config = config or get_config()
+    k, chunk_size = config["K"], config["CHUNK_SIZE"]
+    positions = np.asarray(positions, dtype=np.int64)
+    links = []
+    for block_id in np.unique(catalog.blocks[positions]):
+        members = catalog.block(block_id)
+        k_eff = min(k, len(members) - 1)
+        if k_eff <= 0:
+            continue
+        query_all = positions[catalog.blocks[positions] == block_id]
+        for start in range(0, len(query_all), chunk_size):
+            query = query_all[start:start + chunk_size]
+            d = _distances(catalog, query, members)
+            d[np.arange(len(query)), np.searchsorted(members, query)] = np.inf
+            top = np.argpartition(d, k_eff - 1, axis=1)[:, :k_eff]
+            top_d = np.take_along_axis(d, top, axis=1)
+            order = np.argsort(top_d, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_d = np.sqrt(np.take_along_axis(top_d, order, axis=1))
+            for row, pos in enumerate(query):
+                property_id = int(catalog.ids[pos])
+                links.extend(
+                    (property_id, int(catalog.ids[members[col]]), rank, float(dist))
+                    for rank, (col, dist) in enumerate(zip(top[row], top_d[row]), start=1)
+                )
+    return links
+
+
+def _write(links, property_ids=None, batch_size=5000):
+    """Заменить списки соседей: всех (property_ids=None) или только указанных объектов."""
+    from .models import SimilarProperty
+
+    objs = (
+        SimilarProperty(property_id=p, similar_id=s, rank=r, distance=d) for p, s, r, d in links
+    )
+    with transaction.atomic():
+        if property_ids is None:
+            SimilarProperty.objects.all().delete()
+        else:
+            SimilarProperty.objects.filter(property_id__in=property_ids).delete()
+        SimilarProperty.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def rebuild_all():
+    """
+    Полный пересчёт соседей всего каталога.
+
+    Returns:
+        int: число сохранённых связей.
+    """
+    config = get_config()
+    rows = _rows()
+    scaler = Scaler.fit(rows)
+    catalog = load_catalog(config, scaler=scaler)
+    links = nearest(catalog, np.arange(len(catalog.ids)), config)
+    _write(links)
+    store(SCALER_KEY, scaler, SCALER_TIMEOUT)
+    return len(links)
+
+
+def refresh_for(property_id, affected_ids=()):
+    """
+    Инкрементальный пересчёт после изменения (или удаления) объекта.
+
+    Пересчитываются:
+        * соседи самого объекта;
+        * списки, где он уже есть (его признаки могли «уехать»);
+        * списки объектов его блока, для которых он теперь ближе k-го соседа.
+    Загружаются только блоки (типы) затронутых объектов, а кодирование
+    признаков берётся из кэша (Scaler последнего rebuild_all): средние
+    для стандартизации не пересчитываются, это выравнивает ночной rebuild_all.
+
+    Args:
+        affected_ids: дополнительные объекты для пересчёта (например,
+            ссылавшиеся на удалённый объект — их строки уже удалены каскадом).
+
+    Returns:
+        int: число пересчитанных объектов.
+    """
+    from .models import Property, SimilarProperty
+
+    config = get_config()
+    affected = set(affected_ids)
+    affected.update(
+        SimilarProperty.objects.filter(similar_id=property_id).values_list("property_id", flat=True)
+    )
+    affected.add(property_id)
+    blocks = {
+        -1 if type_id is None else type_id
+        for type_id in Property.objects.filter(pk__in=affected, is_active=True).values_list(
+            "property_type_id", flat=True
+        )
+    }
+    scaler = get_or_build(SCALER_KEY, fit_scaler, SCALER_TIMEOUT)
+    catalog = load_catalog(config, blocks=blocks, scaler=scaler)
+
+    pos = catalog.position(property_id)
+    if pos is not None:
+        block_id = int(catalog.blocks[pos])
+        members = catalog.block(block_id)
+        d = np.sqrt(_distances(catalog, np.array([pos]), members)[0])
+        # Дистанция до k-го соседа; у кого соседей меньше k — порога нет
+        threshold = np.full(len(members), np.inf)
+        block_filter = (
+            {"property__property_type_id": block_id} if block_id >= 0
+            else {"property__property_type__isnull": True}
+        )
+        kth = dict(
+            SimilarProperty.objects.filter(rank=config["K"], **block_filter)
+            .values_list("property_id", "distance")
+        )
+        if kth:
+            known = np.array(list(kth), dtype=np.int64)
+            slots = np.searchsorted(catalog.ids[members], known).clip(max=len(members) - 1)
+            hit = catalog.ids[members][slots] == known
+            threshold[slots[hit]] = np.array(list(kth.values()))[hit]
+        affected.update(int(i) for i in catalog.ids[members[d < threshold]])
+
+    positions = [p for p in (catalog.position(i) for i in affected) if p is not None]
+    links = nearest(catalog, positions, config) if positions else []
+    _write(links, property_ids=affected)
+    return len(affected)
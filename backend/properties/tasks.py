@@ -0,0 +1,84 @@
+# properties/tasks.py
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def refresh_similar_properties(property_id, affected_ids=()):
+    """Пересчёт похожих объектов после изменения одного объекта."""
+    from .similarity import refresh_for
+
+    refreshed = refresh_for(property_id, affected_ids)
+    logger.info(f"Similar properties refreshed for {property_id}, {refreshed} lists updated")
+    return refreshed
+
+
+@shared_task(ignore_result=True)
+def rebuild_similar_properties():
+    """Ночной полный пересчёт похожих объектов."""
+    from .similarity import rebuild_all
+
+    links = rebuild_all()
+    logger.info(f"Similar properties rebuilt, {links} links stored")
+    return links
+
+
+@shared_task(ignore_result=True)
+def recount_location_properties():
+    """Ночная сверка счётчиков объектов по дереву локаций."""
+    from .locations import recount_all
+
+    changed = recount_all()
+    logger.info(f"Location counters recounted, {changed} nodes changed")
+    return changed
+
+
+@shared_task(ignore_result=True)
+def refresh_unit_rollups():
+    """Ночная сверка сводки юнитов по всем объектам."""
+    from .units import refresh_rollups
+
+    updated = refresh_rollups()
+    logger.info(f"Unit rollups refreshed for {updated} properties")
+    return updated
+
+
+@shared_task(ignore_result=True)
+def run_feed_import(feed_import_id):
+    """Импорт фида, загруженного через админку (FeedImport); отчёт пишется в запись."""
+    from django.utils import timezone
+
+    from .feeds import FeedImporter, open_feed
+    from .models import FeedImport
+
+    feed = FeedImport.objects.select_related("developer").get(pk=feed_import_id)
+    feed.status = FeedImport.Status.RUNNING
+    feed.save(update_fields=["status"])
+
+    importer = FeedImporter(feed.developer, download_images=feed.download_images)
+
+    def progress(report):
+        FeedImport.objects.filter(pk=feed.pk).update(rows=report.rows, failed=report.failed)
+
+    try:
+        with feed.file.open("rb") as f:
+            report = importer.run(open_feed(f, feed.file.name), progress=progress)
+    except Exception as e:
+        logger.error(f"Feed import {feed.pk} failed: {e}")
+        feed.status = FeedImport.Status.FAILED
+        feed.errors = str(e)
+        feed.finished_at = timezone.now()
+        feed.save(update_fields=["status", "errors", "finished_at"])
+        return
+
+    feed.status = FeedImport.Status.DONE
+    feed.rows, feed.created, feed.updated = report.rows, report.created, report.updated
+    feed.failed, feed.images = report.failed, report.images
+    feed.rows_per_second = round(report.rows_per_second, 1)
+    feed.errors = "\n".join(f"{line}: {message}" for line, message in report.errors)
+    feed.finished_at = timezone.now()
+    feed.save()
+    logger.info(f"Feed import {feed.pk} done: {report.summary()}")
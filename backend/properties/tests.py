@@ -0,0 +1,107 @@
+# properties/tests.py
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+
+from developers.models import Developer
+
+from .feeds import SLUG_BASE_LENGTH, _decimal, allocate_slugs
+from .models import Property
+
+
+class DecimalTests(SimpleTestCase):
+    def parse(self, value, **bounds):
+        return _decimal({"price": value}, "price", **bounds)
+
+    def test_thousands_and_decimal_separators(self):
+        cases = {
+            "350000": Decimal("350000"),
+            "350,000": Decimal("350000"),
+            "1,250,000": Decimal("1250000"),
+            "1,250.50": Decimal("1250.50"),
+            "1.250.000,50": Decimal("1250000.50"),
+            "12,5": Decimal("12.5"),
+            "0,125": Decimal("0.125"),
+            "$ 1 250 000": Decimal("1250000"),
+            "1\xa0250": Decimal("1250"),
+            "-8,5": Decimal("-8.5"),
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(self.parse(value), expected)
+
+    def test_empty_is_none(self):
+        self.assertIsNone(self.parse(""))
+        self.assertIsNone(self.parse("  "))
+
+    def test_ambiguous_separators_rejected(self):
+        for value in ("1,25,000", "1,2,3", "1.250,000.5"):
+            with self.subTest(value=value), self.assertRaisesMessage(ValueError, "неясно"):
+                self.parse(value)
+
+    def test_not_a_number(self):
+        for value in ("цена по запросу", "1.250.000", "NaN", "Infinity"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                self.parse(value)
+
+    def test_bounds(self):
+        self.assertEqual(self.parse("90", low=-90, high=90), Decimal("90"))
+        with self.assertRaisesMessage(ValueError, "вне допустимого диапазона"):
+            self.parse("90,5", low=-90, high=90)
+        with self.assertRaises(ValueError):
+            self.parse("-1", low=0)
+
+
+class AllocateSlugsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.developer = Developer.objects.create(name="Dev", slug="dev")
+
+    def existing(self, *slugs):
+        # bulk_create — без сигналов save()
+        Property.objects.bulk_create(
+            [Property(developer=self.developer, name=slug, slug=slug, main_image="") for slug in slugs]
+        )
+
+    def test_free_bases_used_as_is(self):
+        self.assertEqual(
+            allocate_slugs(["Villa Sunset", "Ocean View Apartments"], ["dev-1", "dev-2"]),
+            ["villa-sunset", "ocean-view-apartments"],
+        )
+
+    def test_taken_base_gets_suffix(self):
+        self.existing("villa-sunset")
+        self.assertEqual(allocate_slugs(["Villa Sunset"], ["dev-1"]), ["villa-sunset-2"])
+
+    def test_suffix_skips_existing_ones(self):
+        self.existing("villa-sunset", "villa-sunset-2", "villa-sunset-3", "villa-sunset-bay")
+        self.assertEqual(allocate_slugs(["Villa Sunset"], ["dev-1"]), ["villa-sunset-4"])
+
+    def test_duplicates_within_batch(self):
+        self.existing("villa")
+        self.assertEqual(
+            allocate_slugs(["Villa", "Loft", "villa", "Loft", "VILLA"], ["dev-1", "dev-2", "dev-3", "dev-4", "dev-5"]),
+            ["villa-2", "loft", "villa-3", "loft-2", "villa-4"],
+        )
+
+    def test_fallback_for_non_latin_and_empty_names(self):
+        self.existing("dev-7")
+        self.assertEqual(
+            allocate_slugs(["Вилла у моря", "Вилла у моря", "!!!"], ["dev-7", "dev-8", ""]),
+            ["dev-7-2", "dev-8", "property"],
+        )
+
+    def test_long_name_leaves_room_for_suffix(self):
+        name = "Very long residential complex name with many words in it"
+        self.existing(allocate_slugs([name], ["dev-1"])[0])
+        slug = allocate_slugs([name], ["dev-1"])[0]
+        base = slug.rsplit("-", 1)[0]
+        self.assertEqual(slug, f"{base}-2")
+        self.assertLessEqual(len(base), SLUG_BASE_LENGTH)
+        self.assertLessEqual(len(slug), Property._meta.get_field("slug").max_length)
+
+    def test_queries_per_batch(self):
+        self.existing("villa", "loft")
+        # Занятые основы, затем их суффиксы одним запросом
+        with self.assertNumQueries(2):
+            allocate_slugs(["Villa", "Loft", "House"] * 50, ["dev"] * 150)
@@ -0,0 +1,108 @@
+# properties/units.py
+"""
+Юниты объектов и их сводка.
+
+Property.units_total / units_available / unit_price_min / unit_price_max —
+сводка по юнитам объекта: списки и карточки читают только её и никогда
+не агрегируют юниты на запрос.
+
+Все изменения — пачками по множеству строк:
+    * import_units — bulk INSERT ... ON CONFLICT (property, number) DO UPDATE;
+    * set_status — один UPDATE по queryset юнитов;
+    * refresh_rollups — один UPDATE сводки затронутых объектов
+      с подзапросами COUNT/MIN/MAX; подзапросы читают индекс
+      (property, status, price), так что цена не зависит от размера таблицы.
+
+Правка одного юнита в админке пересчитывает сводку его объекта
+сигналом (properties/signals.py), ночная задача сверяет всё.
+"""
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+UPDATE_FIELDS = ("floor", "rooms", "area", "price", "status", "updated_at")
+
+# Объектов в одном UPDATE сводки (лимит параметров запроса в SQLite)
+ROLLUP_BATCH = 500
+
+
+def _aggregate(queryset, expression, output_field=None):
+    """Подзапрос с одним агрегатом по юнитам объекта OuterRef("pk")."""
+    return Subquery(
+        queryset.filter(property=OuterRef("pk"))
+        .order_by()
+        .values("property")
+        .annotate(value=expression)
+        .values("value"),
+        output_field=output_field,
+    )
+
+
+def refresh_rollups(property_ids=None):
+    """
+    Пересчитать сводку объектов property_ids (None — всех) одним UPDATE.
+
+    Returns:
+        int: число обновлённых объектов.
+    """
+    from .models import Property, Unit
+
+    units = Unit.objects.all()
+    available = Unit.objects.filter(status=Unit.Status.AVAILABLE)
+    rollup = {
+        "units_total": Coalesce(_aggregate(units, Count("pk")), Value(0), output_field=IntegerField()),
+        "units_available": Coalesce(_aggregate(available, Count("pk")), Value(0), output_field=IntegerField()),
+        "unit_price_min": _aggregate(available, Min("price")),
+        "unit_price_max": _aggregate(available, Max("price")),
+    }
+    if property_ids is None:
+        return Property.objects.update(**rollup)
+
+    property_ids = sorted({pk for pk in property_ids if pk})
+    updated = 0
+    for start in range(0, len(property_ids), ROLLUP_BATCH):
+        batch = property_ids[start:start + ROLLUP_BATCH]
+        updated += Property.objects.filter(pk__in=batch).update(**rollup)
+    return updated
+
+
+def import_units(units, batch_size=1000):
+    """
+    Загрузить юниты пачками: новые вставляются, существующие (тот же
+    объект и номер) обновляются, затем пересчитывается сводка их объектов.
+
+    Args:
+        units: итерируемое несохранённых Unit с property_id и number
+
+    Returns:
+        int: число загруженных строк.
+    """
+    from .models import Unit
+
+    units = list(units)
+    with transaction.atomic():
+        Unit.objects.bulk_create(
+            units,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["property", "number"],
+            update_fields=list(UPDATE_FIELDS),
+        )
+        refresh_rollups({unit.property_id for unit in units})
+    return len(units)
+
+
+def set_status(queryset, status):
+    """
+    Сменить статус юнитов queryset одним UPDATE.
+
+    Returns:
+        int: число юнитов, у которых статус изменился.
+    """
+    changed = queryset.exclude(status=status)
+    with transaction.atomic():
+        property_ids = set(changed.order_by().values_list("property_id", flat=True).distinct())
+        updated = changed.update(status=status, updated_at=timezone.now())
+        refresh_rollups(property_ids)
+    return updated
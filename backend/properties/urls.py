@@ -5,5 +5,8 @@ app_name = 'properties'
 
 urlpatterns = [
     path('', views.property_list, name='list'),
+    path('compare/', views.compare_page, name='compare'),
+    path('compare/data/', views.compare_data, name='compare_data'),
+    path('projection/', views.projection, name='projection'),
     path('<slug:slug>/', views.property_detail, name='detail'),
 ]
\ No newline at end of file
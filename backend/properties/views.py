@@ -1,10 +1,35 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
-from .models import Property, PropertyType, Location
+from django.db.models import F
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from core import reference
+from core.currency import attach_prices, usd_bounds
+
+from . import compare
+from .investment import AXES, Scenarios, get_config, parse_axis, preset_projections, projections
+from .models import Property
+
+# Сортировки каталога: ?sort=<ключ> → порядок. Объекты без цены или доходности
+# не выпадают из выдачи, а идут в конце.
+# Под каждую есть частичный индекс по активным объектам — см. Property.Meta.indexes
+SORTS = {
+    'price': (F('price_from').asc(nulls_last=True), 'pk'),
+    '-price': (F('price_from').desc(nulls_last=True), '-pk'),
+    'price_m2': (F('price_per_m2').asc(nulls_last=True), 'pk'),
+    '-price_m2': (F('price_per_m2').desc(nulls_last=True), '-pk'),
+    'roi': (F('roi_percent').desc(nulls_last=True), '-pk'),
+}
 
 
 def property_list(request):
-    properties = Property.objects.filter(is_active=True).select_related('developer', 'property_type', 'location')
+    properties = Property.objects.cards().filter(is_active=True)
+    
+    sort = request.GET.get('sort', '')
+    if sort in SORTS:
+        properties = properties.order_by(*SORTS[sort])
+    else:
+        sort = ''
     
     # Фильтры
     developer_slug = request.GET.get('developer')
@@ -15,27 +40,119 @@ def property_list(request):
         properties = properties.filter(developer__slug=developer_slug)
     if property_type:
         properties = properties.filter(property_type__slug=property_type)
+    
+    # Цена «от/до» в валюте пользователя → границы в USD, фильтр по индексу price_from
+    price_min, price_max = usd_bounds(request.GET.get('price_min'), request.GET.get('price_max'), request.currency)
+    if price_min is not None:
+        properties = properties.filter(price_from__gte=price_min)
+    if price_max is not None:
+        properties = properties.filter(price_from__lte=price_max)
+    
+    # Дерево локаций для фильтра: один запрос, узлы в порядке обхода (отступ по level)
+    locations = reference.locations()
     if location:
-        properties = properties.filter(location__slug=location)
+        # Узел со всеми вложенными: «Бадунг» — это и Чангу, и Семиньяк
+        node = next((loc for loc in locations if loc.slug == location), None)
+        properties = properties.filter(node.subtree_q()) if node else properties.none()
     
     paginator = Paginator(properties, 12)
     page_obj = paginator.get_page(request.GET.get('page'))
+    attach_prices(page_obj, request.currency)
     
-    return render(request, 'properties/property_list.html', {
+    return render(request, 'property/property_list.html', {
         'properties': page_obj,
         'page_obj': page_obj,
-        'types': PropertyType.objects.all(),
-        'locations': Location.objects.all(),
+        'types': reference.property_types(),
+        'locations': locations,
+        'sort': sort,
     })
 
 
 def property_detail(request, slug):
-    property = get_object_or_404(Property, slug=slug, is_active=True)
-    similar = Property.objects.filter(
-        location=property.location, is_active=True
-    ).exclude(pk=property.pk)[:4]
+    property = get_object_or_404(Property.objects.translated(), slug=slug, is_active=True)
+    similar = list(property.get_similar(4))
+    if not similar:
+        # Соседи ещё не посчитаны (новый объект до прогона задачи)
+        similar = Property.objects.cards().filter(
+            location=property.location, is_active=True
+        ).exclude(pk=property.pk)[:4]
+    similar = attach_prices([property, *similar], request.currency)[1:]
+    
+    # Пресеты доходности (из кэша); сетку чувствительности страница грузит с projection/
+    presets, investment = preset_projections([property], request.currency)
     
     return render(request, 'properties/property_detail.html', {
         'property': property,
         'similar_properties': similar,
-    })
\ No newline at end of file
+        'investment_presets': presets,
+        'investment': investment[0] if investment else None,
+    })
+
+
+def _parse_ids(value, limit):
+    """id объектов из строки "1,2,3": без повторов, от 1 до limit штук."""
+    try:
+        ids = list(dict.fromkeys(int(pk) for pk in value.split(',') if pk.strip()))
+        # Больше bigint база не примет
+        if not all(0 < pk < 2 ** 63 for pk in ids):
+            raise ValueError
+    except ValueError:
+        raise ValueError('ids: ожидаются id объектов через запятую')
+    if not 0 < len(ids) <= limit:
+        raise ValueError(f'ids: от 1 до {limit} объектов')
+    return ids
+
+
+@require_GET
+def projection(request):
+    """
+    Прогноз доходности одного или нескольких объектов.
+
+    GET-параметры:
+        ids=1,2,3                       — объекты (до MAX_PROPERTIES)
+        occupancy, rate_factor | nightly, appreciation, years
+                                        — значения через запятую или start:stop:step;
+                                          без них — стандартные пресеты
+        currency                        — валюта сумм (nightly тоже в ней)
+    """
+    config = get_config()
+    try:
+        ids = _parse_ids(request.GET.get('ids', ''), config['MAX_PROPERTIES'])
+        axes = {name: parse_axis(name, request.GET[name]) for name in AXES if request.GET.get(name)}
+        scenarios = Scenarios.grid(axes, request.currency) if axes else None
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    properties = Property.objects.filter(pk__in=ids, is_active=True).only(
+        'name', 'slug', 'price_from', 'roi_percent'
+    )
+    if scenarios is None:
+        presets, items = preset_projections(properties, request.currency)
+    else:
+        presets, items = scenarios.as_dict(request.currency), projections(properties, scenarios, request.currency)
+    return JsonResponse({'currency': request.currency, 'scenarios': presets, 'properties': items})
+
+
+@require_GET
+def compare_page(request):
+    """Страница сравнения: таблицу по выбранным в браузере объектам строит js/compare.js."""
+    return render(request, 'property/property_compare.html', {
+        'max_compare': compare.MAX_COMPARE,
+    })
+
+
+@require_GET
+def compare_data(request):
+    """
+    Данные для сравнения объектов; список выбранных хранит браузер (js/compare.js).
+
+    GET-параметры:
+        ids=1,2,3   — объекты в порядке колонок (до compare.MAX_COMPARE)
+        currency    — валюта цен
+    """
+    try:
+        ids = _parse_ids(request.GET.get('ids', ''), compare.MAX_COMPARE)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    items = compare.load(ids, request.currency)
+    return JsonResponse({'currency': request.currency, 'count': len(items), 'items': items})